@@ -0,0 +1,11 @@
+"""
+Paket analisis berisi komponen pengolahan data yang dipakai oleh dashboard data_analisis_deployment.py.
+Engine analisis dapat dipakai tanpa Streamlit melalui analisis.run, analisis.get_engine atau analisis.AnalisisEngine;
+ketiganya diimpor secara lazy sehingga pandas belum dimuat saat paket ini diimpor.
+"""
+
+def __getattr__(nama: str):
+    if nama in ('run', 'get_engine', 'AnalisisEngine'):
+        from analisis import engine
+        return getattr(engine, nama)
+    raise AttributeError(f"module 'analisis' has no attribute {nama!r}")
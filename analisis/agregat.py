@@ -0,0 +1,164 @@
+"""
+Modul ini berisi registri agregat bersama: setiap total (sumber, kolom kunci, kolom ukuran), misalnya pengeluaran
+customer per customer_city dari kubus rentang waktu tertentu, dijumlahkan dan diurutkan menurun satu kali untuk
+setiap versi data. Grafik Pertanyaan 1-4 dan pemanggil lain mengambil potongan (head) dari hasil urut yang sama,
+sehingga perbedaan top_cities atau top_categories tidak memicu groupby dan pengurutan ulang.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analisis.cache import LRUCache, get_ukuran_objek
+from analisis.loader import sisip_urut, ubah_kategori
+
+# Dimensi ringkasan (lihat analisis.kubus.query_ringkasan_kubus) dan kolom ukurannya
+DAFTAR_AGREGAT = {'customer_state': 'payment_value_sum',
+                  'customer_city': 'payment_value_sum',
+                  'customer_id': 'payment_value_sum',
+                  'seller_state': 'price_sum',
+                  'seller_city': 'price_sum',
+                  'seller_id': 'price_sum'}
+
+class RegistriAgregat:
+
+    """
+    Registri total berurut yang dibagikan antar sesi. Setiap entri dikenali dari sumber (misalnya
+    ('kubus', start_date, end_date, versi_data)), kolom kunci dan kolom ukuran, sehingga entri versi data lama
+    tidak pernah dipakai lagi dan akhirnya dibuang oleh LRU.
+
+    Parameters:
+        maxsize (int): Jumlah maksimum total berurut yang disimpan
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.cache = LRUCache(maxsize=maxsize, fungsi_ukuran=get_ukuran_objek)
+        self.diminta = {}
+        self.dihitung = {}
+        self._lock = threading.Lock()
+
+    def get_agregat(self, sumber: tuple, kolom_kunci: str, kolom_ukuran: str, fungsi_total, n: int = None):
+
+        """
+        Fungsi ini mengembalikan total kolom_ukuran per kolom_kunci yang urut menurun. Total dihitung dengan
+        fungsi_total() dan diurutkan hanya saat pertama kali diminta untuk sumber yang sama.
+
+        Parameters:
+            sumber (tuple): Identitas Data Frame sumber, termasuk rentang waktu dan versi data
+            kolom_kunci (str): Kolom pengelompokan, misalnya 'customer_city'
+            kolom_ukuran (str): Nama kolom total, misalnya 'payment_value_sum'
+            fungsi_total (callable): Fungsi tanpa argumen yang mengembalikan Series total (belum urut)
+            n (int): Jumlah baris teratas yang dikembalikan, None berarti seluruh baris
+
+        Returns:
+            agregat (pandas DataFrame): Data Frame satu kolom (kolom_ukuran) dengan index kolom_kunci, urut menurun.
+                                        Data Frame ini dibagikan sehingga tidak boleh diubah.
+        """
+
+        nama = (kolom_kunci, kolom_ukuran)
+
+        def hitung():
+            with self._lock:
+                self.dihitung[nama] = self.dihitung.get(nama, 0) + 1
+            return fungsi_total().to_frame(name=kolom_ukuran).sort_values(by=kolom_ukuran, ascending=False)
+
+        with self._lock:
+            self.diminta[nama] = self.diminta.get(nama, 0) + 1
+        agregat = self.cache.get_or_compute(sumber + nama, hitung)
+
+        return agregat if n is None else agregat.head(n)
+
+    def append(self, versi_lama: tuple, versi_baru: tuple, fungsi_delta):
+
+        """
+        Fungsi ini bertujuan untuk memindahkan total berurut versi_lama ke versi_baru setelah data baru ditambahkan
+        (lihat analisis.ingesti). Total delta dijumlahkan ke total lama dan hanya key yang berubah yang disisipkan
+        ulang (gabung_agregat). Total versi lain dan total yang tidak dapat diperbarui dibuang.
+
+        Parameters:
+            versi_lama (tuple): Versi data sebelum data baru ditambahkan
+            versi_baru (tuple): Versi data setelah data baru ditambahkan
+            fungsi_delta (callable): Fungsi (sumber tanpa versi data, kolom_kunci) yang mengembalikan Series total
+                                     data baru saja, atau None jika sumber tersebut tidak dapat diperbarui
+        """
+
+        agregat_baru = {}
+        for key, agregat in self.cache.items():
+            sumber, (kolom_kunci, kolom_ukuran) = key[:-2], key[-2:]
+            if sumber[-1] != versi_lama:
+                continue
+
+            total_delta = fungsi_delta(sumber[:-1], kolom_kunci)
+            if total_delta is not None:
+                agregat_baru[sumber[:-1] + (versi_baru, kolom_kunci, kolom_ukuran)] = gabung_agregat(agregat,
+                                                                                                  total_delta)
+
+        self.cache.clear()
+        for key, agregat in agregat_baru.items():
+            self.cache.put(key, agregat)
+
+    def clear(self):
+
+        """
+        Fungsi ini menghapus seluruh total berurut (penghitung tidak direset)
+        """
+
+        self.cache.clear()
+
+    def stats(self) -> dict:
+
+        """
+        Fungsi ini mengembalikan jumlah permintaan, jumlah perhitungan dan jumlah perhitungan yang dihemat
+        (permintaan yang dilayani dari total berurut yang sudah ada), total dan per (kolom_kunci, kolom_ukuran)
+        """
+
+        with self._lock:
+            per_agregat = {f'{kunci}.{ukuran}': {'diminta': diminta,
+                                                 'dihitung': self.dihitung.get((kunci, ukuran), 0),
+                                                 'dihemat': diminta - self.dihitung.get((kunci, ukuran), 0)}
+                           for (kunci, ukuran), diminta in self.diminta.items()}
+
+        diminta = sum(nilai['diminta'] for nilai in per_agregat.values())
+        dihitung = sum(nilai['dihitung'] for nilai in per_agregat.values())
+
+        return {'diminta': diminta, 'dihitung': dihitung, 'dihemat': diminta - dihitung, 'per_agregat': per_agregat}
+
+def gabung_agregat(agregat: pd.DataFrame, total_delta: pd.Series) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menambahkan total dari data baru ke total berurut hasil RegistriAgregat.get_agregat.
+    Key di total_delta dijumlahkan lalu disisipkan kembali dengan binary search (analisis.loader.sisip_urut),
+    sehingga key lain tidak diurutkan ulang.
+
+    Parameters:
+        agregat (pandas DataFrame): Total berurut menurun dengan satu kolom ukuran
+        total_delta (pandas Series): Total data baru per key (kamus key sama atau lebih panjang)
+
+    Returns:
+        agregat (pandas DataFrame): Total berurut gabungan
+    """
+
+    kolom_ukuran = agregat.columns[0]
+    if isinstance(agregat.index.dtype, pd.CategoricalDtype) and isinstance(total_delta.index.dtype,
+                                                                            pd.CategoricalDtype):
+        agregat = agregat.set_axis(ubah_kategori(agregat.index, total_delta.index.dtype))
+
+    posisi = agregat.index.get_indexer(total_delta.index)
+    ada = posisi >= 0
+    nilai = total_delta.to_numpy(np.float64, copy=True)
+    nilai[ada] += agregat[kolom_ukuran].to_numpy(np.float64)[posisi[ada]]
+
+    tetap = np.ones(len(agregat), dtype=bool)
+    tetap[posisi[ada]] = False
+
+    return sisip_urut(agregat[tetap], pd.DataFrame({kolom_ukuran: nilai}, index=total_delta.index), kolom_ukuran)
+
+def get_total_frame(df: pd.DataFrame, kolom_kunci: str, kolom_ukuran: str) -> pd.Series:
+
+    """
+    Fungsi ini mengembalikan jumlah kolom_ukuran per kolom_kunci dari Data Frame baris (misalnya df_customer_merged),
+    dipakai sebagai fungsi_total untuk sumber hasil pipeline
+    """
+
+    return df.groupby(by=kolom_kunci, observed=True)[kolom_ukuran].sum()
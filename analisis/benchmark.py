@@ -0,0 +1,282 @@
+"""
+Perintah untuk mengukur waktu setiap tahap dashboard: pembacaan data, filter rentang waktu, setiap fungsi create_*,
+kubus agregat dan render halaman Streamlit. Hasilnya ditulis ke file JSON agar dapat dibandingkan antar versi.
+
+Penggunaan:
+    python -m analisis.sintetis --n-barang 1000000 --data-dir data_benchmark
+    python -m analisis.benchmark --data-dir data_benchmark --output benchmark.json [--ulang 3] [--tanpa-render]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis import pipeline
+from analisis.engine import get_engine
+from analisis.kubus import create_kubus, query_ringkasan_kubus
+from analisis.loader import DATA_DIR, DATA_FILES, encode_kolom_id, get_path_tabel, read_tabel, sort_tabel
+from analisis.sketsa import create_sketsa_kubus, query_ringkasan_sketsa
+
+# Lokasi halaman dashboard, relatif terhadap folder paket analisis
+PATH_HALAMAN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'data_analisis_deployment.py')
+
+# Label tab halaman (st.tabs dengan key 'tab_bagian'), tab pertama adalah tab yang terbuka saat halaman dimuat
+DAFTAR_TAB = ['Pertanyaan 1-3', 'Pertanyaan 4', 'Klaster Customer', 'Klaster Seller']
+
+## Pengukuran waktu
+def ukur(durasi: dict, nama: str, fungsi, *args):
+
+    """
+    Fungsi ini menjalankan fungsi(*args), mencatat lama eksekusinya (detik) di durasi[nama], lalu mengembalikan hasilnya
+    """
+
+    waktu_mulai = time.perf_counter()
+    hasil = fungsi(*args)
+    durasi.setdefault(nama, []).append(time.perf_counter() - waktu_mulai)
+
+    return hasil
+
+def ringkas_durasi(durasi: dict) -> dict:
+
+    """
+    Fungsi ini meringkas daftar durasi setiap tahap menjadi min, median, rata-rata dan maksimum (detik)
+    """
+
+    return {nama: {'min': min(daftar),
+                   'median': statistics.median(daftar),
+                   'mean': statistics.fmean(daftar),
+                   'max': max(daftar),
+                   'n': len(daftar)}
+            for nama, daftar in durasi.items()}
+
+def get_lingkungan() -> dict:
+
+    """
+    Fungsi ini mengembalikan informasi lingkungan eksekusi (versi Python, pustaka dan commit git jika tersedia)
+    """
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(PATH_HALAMAN), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {'python': sys.version.split()[0],
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'commit': commit}
+
+## Tahap-tahap pipeline
+def ukur_pipeline(durasi: dict, data_dir: str, start_date, end_date, n_worker: int = 1) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menjalankan seluruh tahap pipeline sekali dengan urutan yang sama seperti
+    analisis.loader.load_tabel dan analisis.pipeline.create_hasil_pipeline, sambil mencatat waktu setiap tahap
+
+    Parameters:
+        durasi (dict): Dictionary nama tahap -> list durasi, ditambah oleh fungsi ini
+        data_dir (str): Folder data
+        start_date (datetime.date): Tanggal awal rentang waktu, None berarti tanggal order pertama
+        end_date (datetime.date): Tanggal akhir rentang waktu, None berarti tanggal order terakhir
+        n_worker (int): Jumlah worker untuk pengukuran pipeline.paralel dan kubus.query_ringkasan_kubus
+
+    Returns:
+        tabel (dict): Dictionary tabel yang telah dibaca
+        rentang_waktu (tuple): (start_date, end_date) yang dipakai
+    """
+
+    waktu_mulai = time.perf_counter()
+
+    tabel = {nama: ukur(durasi, f'load.{nama}', read_tabel, nama, data_dir) for nama in DATA_FILES}
+    tabel = ukur(durasi, 'load.encode_kolom_id', encode_kolom_id, tabel)
+    tabel = ukur(durasi, 'load.sort_tabel', sort_tabel, tabel)
+
+    waktu_order = tabel['df_order']['order_purchase_timestamp']
+    start_date = pd.Timestamp(waktu_order.min() if start_date is None else start_date).date()
+    end_date = pd.Timestamp(waktu_order.max() if end_date is None else end_date).date()
+
+    df_order_update = ukur(durasi, 'filter.df_order', pipeline.filter_rentang_waktu,
+                           tabel['df_order'], 'order_purchase_timestamp', start_date, end_date)
+    df_order_items_update = ukur(durasi, 'filter.df_order_items', pipeline.filter_rentang_waktu,
+                                 tabel['df_order_items'], 'shipping_limit_date', start_date, end_date)
+
+    kelompok_order = ukur(durasi, 'create_kelompok_order', pipeline.create_kelompok_order, df_order_update)
+
+    pivot_seller, pivot_order = ukur(durasi, 'create_pivot_seller_and_order',
+                                     pipeline.create_pivot_seller_and_order, df_order_items_update,
+                                     tabel['df_product'], tabel['df_order_payments'], df_order_update, kelompok_order)
+
+    df_sellers_merged, df_customer_merged = ukur(durasi, 'create_df_sellers_and_customer_merged',
+                                                 pipeline.create_df_sellers_and_customer_merged, pivot_seller,
+                                                 tabel['df_sellers'], pivot_order, df_order_update,
+                                                 tabel['df_customer'])
+
+    kategori_seller, kategori_order = ukur(durasi, 'create_kategori_seller_and_order',
+                                           pipeline.create_kategori_seller_and_order, df_order_items_update,
+                                           tabel['df_product'], df_order_update, kelompok_order)
+
+    df_sellers_city_merged = ukur(durasi, 'create_df_sellers_city_merged',
+                                  pipeline.create_df_sellers_city_merged, df_sellers_merged)
+    df_customer_city_merged = ukur(durasi, 'create_df_customer_city_merged',
+                                   pipeline.create_df_customer_city_merged, df_customer_merged)
+
+    kategori_di_kota_jual = ukur(durasi, 'create_kategori_di_kota.jual', pipeline.create_kategori_di_kota,
+                                 kategori_seller, df_sellers_merged, 'seller_id', 'seller_city')
+    kategori_di_kota_beli = ukur(durasi, 'create_kategori_di_kota.beli', pipeline.create_kategori_di_kota,
+                                 kategori_order, df_customer_merged, 'order_id', 'customer_city')
+
+    ukur(durasi, 'return_kategori_di_kota_jual', pipeline.return_kategori_di_kota_jual,
+         df_sellers_city_merged, kategori_di_kota_jual)
+    ukur(durasi, 'return_kategori_di_kota_beli', pipeline.return_kategori_di_kota_beli,
+         df_customer_city_merged, kategori_di_kota_beli)
+
+    ukur(durasi, 'create_klaster_customer', pipeline.create_klaster_customer, df_customer_merged)
+    ukur(durasi, 'create_klaster_sellers', pipeline.create_klaster_sellers, df_sellers_merged)
+
+    kubus = ukur(durasi, 'kubus.create_kubus', create_kubus, tabel['df_order'], tabel['df_order_items'],
+                 tabel['df_order_payments'], tabel['df_product'], tabel['df_sellers'], tabel['df_customer'])
+    ukur(durasi, 'kubus.query_ringkasan_kubus', query_ringkasan_kubus, kubus, start_date, end_date, n_worker)
+
+    durasi.setdefault('total.pipeline', []).append(time.perf_counter() - waktu_mulai)
+
+    # Pipeline lengkap dengan cabang seller dan customer di worker pool
+    ukur(durasi, 'pipeline.paralel', pipeline.create_hasil_pipeline, tabel, start_date, end_date, n_worker)
+
+    # Mode top-K perkiraan: sketsa per bulan dibuat sekali, query hanya menggabungkan sketsa
+    sketsa_kubus = ukur(durasi, 'sketsa.create_sketsa_kubus', create_sketsa_kubus, kubus)
+    ukur(durasi, 'sketsa.query_ringkasan_sketsa', query_ringkasan_sketsa, kubus, sketsa_kubus, start_date, end_date)
+
+    return tabel, (start_date, end_date)
+
+def ukur_render(durasi: dict, data_dir: str, ulang: int, path_halaman: str = PATH_HALAMAN) -> list:
+
+    """
+    Fungsi ini bertujuan untuk mengukur waktu render halaman dashboard dengan streamlit.testing (tanpa browser).
+    Engine bersama dipanaskan lebih dulu sehingga yang terukur hanya pembuatan grafik dan elemen halaman.
+    Hanya tab yang terbuka yang digambar, sehingga setiap tab di DAFTAR_TAB dibuka bergantian: render.tab.<tab>
+    mengukur render tab dengan cache gambar kosong, render.tab.<tab>_cache rerun tab tersebut dengan cache gambar
+    terisi, dan render.halaman jumlah render seluruh tab dengan cache gambar kosong.
+
+    Parameters:
+        durasi (dict): Dictionary nama tahap -> list durasi, ditambah oleh fungsi ini
+        data_dir (str): Folder data yang dipakai halaman
+        ulang (int): Jumlah pengulangan render
+        path_halaman (str): Lokasi file halaman Streamlit
+
+    Returns:
+        error (list): Daftar pesan exception yang muncul saat render
+    """
+
+    from streamlit.testing.v1 import AppTest
+
+    from analisis.grafik import cache_grafik
+
+    # Halaman memakai get_engine() sehingga engine yang dibuat di sini (dengan data_dir benchmark) ikut dipakai
+    ukur(durasi, 'engine.run_dingin', get_engine(data_dir).run)
+
+    error = []
+    for i in range(ulang + 1):
+        cache_grafik.clear()
+        halaman = AppTest.from_file(path_halaman, default_timeout=600)
+        total = 0.0
+        for j, tab in enumerate(DAFTAR_TAB):
+            # Tab pertama terbuka saat halaman dimuat, tab lain dibuka lewat state widget st.tabs
+            if j > 0:
+                halaman.session_state['tab_bagian'] = tab
+            waktu_mulai = time.perf_counter()
+            halaman.run()
+            waktu = time.perf_counter() - waktu_mulai
+            # Render pertama hanya pemanasan (import matplotlib, seaborn dan Streamlit)
+            if i > 0:
+                durasi.setdefault(f'render.tab.{tab}', []).append(waktu)
+                ukur(durasi, f'render.tab.{tab}_cache', halaman.run)
+                total += waktu
+            error.extend(f'{tab}: {e.value}' for e in halaman.exception)
+        if i > 0:
+            durasi.setdefault('render.halaman', []).append(total)
+
+    return error
+
+def run_benchmark(data_dir: str = DATA_DIR,
+                  start_date=None,
+                  end_date=None,
+                  ulang: int = 3,
+                  render: bool = True,
+                  n_worker: int = 1) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menjalankan seluruh pengukuran dan menyusun laporannya
+
+    Parameters:
+        data_dir (str): Folder data
+        start_date (datetime.date): Tanggal awal rentang waktu, default tanggal order pertama
+        end_date (datetime.date): Tanggal akhir rentang waktu, default tanggal order terakhir
+        ulang (int): Jumlah pengulangan setiap tahap
+        render (bool): Ikut mengukur render halaman Streamlit
+        n_worker (int): Jumlah worker untuk pipeline.paralel dan kubus.query_ringkasan_kubus
+
+    Returns:
+        laporan (dict): Laporan benchmark yang siap ditulis sebagai JSON
+    """
+
+    durasi = {}
+    for _ in range(ulang):
+        tabel, rentang_waktu = ukur_pipeline(durasi, data_dir, start_date, end_date, n_worker)
+
+    error = ukur_render(durasi, data_dir, ulang) if render else []
+
+    return {'waktu': datetime.datetime.now().isoformat(timespec='seconds'),
+            'lingkungan': get_lingkungan(),
+            'data': {'data_dir': data_dir,
+                     'file': {nama: get_path_tabel(nama, data_dir) for nama in DATA_FILES},
+                     'jumlah_baris': {nama: len(df) for nama, df in tabel.items()},
+                     'memori_mb': {nama: df.memory_usage(deep=True).sum() / 1e6 for nama, df in tabel.items()},
+                     'rentang_waktu': [str(tanggal) for tanggal in rentang_waktu]},
+            'ulang': ulang,
+            'n_worker': n_worker,
+            'tahap': ringkas_durasi(durasi),
+            'error': error}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tahap-tahap dashboard')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Folder data (default: %(default)s)')
+    parser.add_argument('--start-date', type=datetime.date.fromisoformat, default=None,
+                        help='Tanggal awal YYYY-MM-DD (default: tanggal order pertama)')
+    parser.add_argument('--end-date', type=datetime.date.fromisoformat, default=None,
+                        help='Tanggal akhir YYYY-MM-DD (default: tanggal order terakhir)')
+    parser.add_argument('--ulang', type=int, default=3, help='Jumlah pengulangan (default: %(default)s)')
+    parser.add_argument('--output', default='benchmark.json', help='File laporan JSON (default: %(default)s)')
+    parser.add_argument('--n-worker', type=int, default=1,
+                        help='Jumlah worker untuk pipeline paralel dan query kubus (default: %(default)s)')
+    parser.add_argument('--tanpa-render', action='store_true', help='Tidak mengukur render halaman Streamlit')
+    args = parser.parse_args()
+
+    if args.ulang < 1:
+        parser.error('--ulang harus lebih besar dari 0')
+
+    laporan = run_benchmark(args.data_dir, args.start_date, args.end_date, args.ulang, not args.tanpa_render,
+                            args.n_worker)
+
+    with open(args.output, 'w') as f:
+        json.dump(laporan, f, indent=2)
+
+    for nama, ringkasan in laporan['tahap'].items():
+        print(f"{nama:<40} {ringkasan['median'] * 1000:>10.1f} ms")
+    for pesan in laporan['error']:
+        print(f'Error: {pesan}')
+    print(f'Laporan ditulis ke {args.output}')
+
+if __name__ == '__main__':
+    main()
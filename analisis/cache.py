@@ -0,0 +1,160 @@
+"""
+Modul ini berisi cache berukuran terbatas yang dipakai untuk menyimpan hasil pipeline per rentang waktu
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+
+    """
+    Cache berukuran terbatas dengan kebijakan LRU (Least Recently Used) beserta penghitung hit/miss.
+    Objek ini dibagikan antar rerun dan antar sesi sehingga akses dilindungi dengan lock.
+
+    Parameters:
+        maxsize (int): Jumlah maksimum entri yang disimpan sebelum entri terlama dibuang
+        maxbytes (int): Batas total ukuran nilai (len(nilai), misalnya bytes gambar), None berarti tanpa batas
+        fungsi_ukuran (callable): Fungsi pengganti len untuk menghitung ukuran nilai, misalnya get_ukuran_objek.
+                                  Jika diisi, nbytes selalu dihitung walaupun maxbytes None.
+    """
+
+    def __init__(self, maxsize: int = 16, maxbytes: int = None, fungsi_ukuran=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.fungsi_ukuran = fungsi_ukuran
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._dihitung = {}
+        self._lock = threading.Lock()
+
+    def get_ukuran(self, nilai) -> int:
+
+        """
+        Fungsi ini mengembalikan ukuran nilai yang dihitung terhadap maxbytes (0 jika ukuran tidak dipakai)
+        """
+
+        if self.fungsi_ukuran is not None:
+            return self.fungsi_ukuran(nilai)
+
+        return len(nilai) if self.maxbytes is not None else 0
+
+    def get_or_compute(self, key, fungsi):
+
+        """
+        Fungsi ini mengembalikan nilai untuk key dari cache, atau menghitungnya dengan fungsi() lalu menyimpannya.
+        Jika key yang sama sedang dihitung oleh thread lain (misalnya sesi lain dengan rentang waktu yang sama),
+        pemanggil menunggu hasilnya sehingga setiap key hanya dihitung dan disimpan di memori satu kali.
+
+        Parameters:
+            key (hashable): Kunci cache
+            fungsi (callable): Fungsi tanpa argumen untuk menghitung nilai ketika key belum ada di cache
+
+        Returns:
+            nilai yang tersimpan untuk key
+        """
+
+        while True:
+            with self._lock:
+                if key in self._data:
+                    self.hits += 1
+                    self._data.move_to_end(key)
+                    return self._data[key]
+                selesai = self._dihitung.get(key)
+                if selesai is None:
+                    self.misses += 1
+                    selesai = self._dihitung[key] = threading.Event()
+                    break
+            # Jika perhitungan di thread lain gagal, key diperiksa ulang dan dihitung oleh pemanggil ini
+            selesai.wait()
+
+        try:
+            nilai = fungsi()
+            self.put(key, nilai)
+        finally:
+            with self._lock:
+                self._dihitung.pop(key, None)
+            selesai.set()
+
+        return nilai
+
+    def put(self, key, nilai):
+
+        """
+        Fungsi ini bertujuan untuk menyimpan nilai untuk key (misalnya hasil yang diperbarui dari hasil lama)
+        tanpa mengubah penghitung hit/miss, lalu membuang entri terlama jika melebihi maxsize atau maxbytes
+        """
+
+        ukuran = self.get_ukuran(nilai)
+
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self.get_ukuran(self._data[key])
+            self._data[key] = nilai
+            self._data.move_to_end(key)
+            self.nbytes += ukuran
+            # Entri terbaru selalu disimpan walaupun ukurannya sendiri melebihi maxbytes
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and
+                                                     self.nbytes > self.maxbytes and len(self._data) > 1):
+                key_lama, nilai_lama = self._data.popitem(last=False)
+                self.nbytes -= self.get_ukuran(nilai_lama)
+
+    def items(self) -> list:
+
+        """
+        Fungsi ini mengembalikan salinan list (key, nilai) seluruh entri cache tanpa mengubah urutan LRU
+        """
+
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+
+        """
+        Fungsi ini menghapus seluruh entri cache tanpa mengubah penghitung hit/miss
+        """
+
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+
+        """
+        Fungsi ini mengembalikan statistik cache: jumlah hit, miss, entri, ukuran maksimum serta total bytes
+        """
+
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'entries': len(self._data),
+                    'maxsize': self.maxsize,
+                    'nbytes': self.nbytes,
+                    'maxbytes': self.maxbytes}
+
+def get_ukuran_objek(nilai) -> int:
+
+    """
+    Fungsi ini bertujuan untuk memperkirakan ukuran memori (bytes) sebuah nilai: Data Frame, Series dan Index
+    memakai memory_usage(deep=True), dictionary, list dan tuple dijumlahkan isinya
+
+    Parameters:
+        nilai: Nilai yang diukur
+
+    Returns:
+        ukuran (int): Perkiraan ukuran memori dalam bytes
+    """
+
+    if hasattr(nilai, 'memory_usage'):
+        ukuran = nilai.memory_usage(deep=True)
+        return int(ukuran.sum()) if hasattr(ukuran, 'sum') else int(ukuran)
+    if hasattr(nilai, 'nbytes'):
+        return int(nilai.nbytes)
+    if isinstance(nilai, dict):
+        return sum(get_ukuran_objek(key) + get_ukuran_objek(isi) for key, isi in nilai.items())
+    if isinstance(nilai, (list, tuple)):
+        return sum(get_ukuran_objek(isi) for isi in nilai)
+
+    return sys.getsizeof(nilai)
@@ -0,0 +1,645 @@
+"""
+Modul ini berisi engine analisis yang dapat dipanggil tanpa Streamlit, misalnya dari batch job atau benchmark:
+
+    from analisis import run
+    hasil = run('2017-01-01', '2017-12-31', top_cities=8, top_categories=10)
+
+Pustaka berat (pandas, numpy) baru diimpor ketika data pertama kali dimuat, sehingga import modul ini tetap ringan.
+"""
+
+import threading
+
+from analisis.cache import LRUCache, get_ukuran_objek
+from analisis.paralel import periksa_batal
+from analisis.profil import tahap
+
+# Data Frame hasil run_ringkasan (tanpa batas_error mode perkiraan)
+KOLOM_RINGKASAN = ['customer_state', 'customer_city', 'customer_id', 'seller_state', 'seller_city', 'seller_id',
+                   'kategori_kota_jual', 'kategori_kota_beli']
+
+class AnalisisEngine:
+
+    """
+    Engine yang memuat tabel dan kubus agregat sekali untuk setiap versi data, lalu menyimpan hasil
+    pipeline per rentang waktu di LRUCache. Objek ini aman dipakai bersama oleh beberapa thread, sehingga
+    satu engine (lihat get_engine) melayani seluruh sesi Streamlit di satu proses.
+
+    Tabel dan kubus bersifat read-only: filter rentang waktu berupa view tanpa salinan dan pipeline hanya membuat
+    Data Frame baru, sehingga pemanggil tidak boleh mengubah tabel, kubus maupun hasil di cache. Engine tidak mengubah
+    opsi global pandas; aplikasi (misalnya data_analisis_deployment.py) dapat menyalakan mode.copy_on_write agar
+    perubahan pada Data Frame turunan tidak pernah mengubah data bersama.
+
+    Parameters:
+        data_dir (str): Folder tempat file data berada
+        cache_size (int): Jumlah maksimum hasil rentang waktu yang disimpan di cache
+        n_worker (int): Jumlah worker untuk cabang pipeline dan query kubus, None berarti analisis.paralel.N_WORKER
+        snapshot (bool): Memakai snapshot hasil `python -m analisis.materialisasi` untuk rentang waktu default
+    """
+
+    def __init__(self, data_dir: str = 'data', cache_size: int = 16, n_worker: int = None, snapshot: bool = True):
+        self.data_dir = data_dir
+        self.pakai_snapshot = snapshot
+        self.snapshot = None
+        self.versi_snapshot = None
+        self.cache = LRUCache(maxsize=cache_size, fungsi_ukuran=get_ukuran_objek)
+        self._agregat = None
+        self.n_worker = n_worker
+        self.versi_data = None
+        self.versi_dasar = None
+        self.daftar_delta = ()
+        self.tabel = None
+        self.kubus = None
+        self.sketsa_kubus = None
+        self.ukuran_data = {'tabel': 0, 'kubus': 0, 'snapshot': 0}
+        self._lock = threading.Lock()
+        self._lock_agregat = threading.Lock()
+
+    @property
+    def agregat(self):
+
+        """
+        Registri agregat (analisis.agregat.RegistriAgregat) engine, dibuat saat pertama kali dipakai karena
+        analisis.agregat memuat pandas
+        """
+
+        from analisis.agregat import RegistriAgregat
+
+        with self._lock_agregat:
+            if self._agregat is None:
+                self._agregat = RegistriAgregat()
+
+        return self._agregat
+
+    def load(self) -> 'AnalisisEngine':
+
+        """
+        Fungsi ini bertujuan untuk memuat tabel dan membuat kubus agregat jika belum dimuat
+        atau jika salah satu file data berubah sejak pemuatan terakhir. Jika hanya ada delta baru
+        (lihat analisis/ingesti.py), hanya delta tersebut yang diterapkan.
+
+        Returns:
+            engine (AnalisisEngine): Objek engine itu sendiri
+        """
+
+        from analisis.ingesti import read_delta
+        from analisis.kubus import create_kubus
+        from analisis.loader import get_daftar_delta, get_versi_data, load_tabel
+
+        versi_dasar = get_versi_data(self.data_dir, dengan_delta=False)
+        daftar_delta = get_daftar_delta(self.data_dir)
+        with self._lock:
+            if versi_dasar + daftar_delta == self.versi_data:
+                return self
+
+            if versi_dasar != self.versi_dasar or daftar_delta[:len(self.daftar_delta)] != self.daftar_delta:
+                with tahap('engine.load_tabel'):
+                    tabel = load_tabel(self.data_dir)
+                with tahap('engine.create_kubus'):
+                    self.kubus = create_kubus(tabel['df_order'], tabel['df_order_items'],
+                                              tabel['df_order_payments'], tabel['df_product'],
+                                              tabel['df_sellers'], tabel['df_customer'])
+                self.tabel = tabel
+                self.versi_dasar, self.daftar_delta = versi_dasar, ()
+                self.versi_data = versi_dasar
+                # Hasil dari versi data lama tidak akan dipakai lagi
+                self.cache.clear()
+                self.sketsa_kubus = None
+                self.agregat.clear()
+                self.ukuran_data.update(tabel=get_ukuran_objek(self.tabel), kubus=get_ukuran_objek(self.kubus))
+
+            for delta in daftar_delta[len(self.daftar_delta):]:
+                self.append_delta(read_delta(delta[0]), delta)
+
+        return self
+
+    def append_delta(self, delta: dict, versi_delta: tuple):
+
+        """
+        Fungsi ini bertujuan untuk menerapkan satu delta ke tabel dan kubus, lalu memperbarui hasil pipeline
+        versi sebelumnya di cache (analisis.ingesti.append_hasil_pipeline), total berurut dari kubus di registri
+        agregat dan sketsa bulan yang disentuh delta (analisis.sketsa.append_sketsa_kubus) ke versi baru, dengan
+        biaya sebanding ukuran delta. Dipanggil oleh load dengan lock engine sudah dipegang.
+
+        Parameters:
+            delta (dict): Dictionary nama tabel dan Data Frame baris barunya
+            versi_delta (tuple): (path, mtime) file penanda delta yang ditambahkan ke versi data
+        """
+
+        from analisis.ingesti import append_hasil_pipeline, append_tabel, get_ukuran_tambahan
+        from analisis.kubus import append_kubus, create_kubus, query_ringkasan_kubus
+        from analisis.sketsa import append_sketsa_kubus
+
+        with tahap('engine.append_delta') as catatan:
+            tabel, delta = append_tabel(self.tabel, delta)
+            kubus_delta = create_kubus(delta['df_order'], delta['df_order_items'], delta['df_order_payments'],
+                                       tabel['df_product'], tabel['df_sellers'], tabel['df_customer'])
+            kubus = append_kubus(self.kubus, kubus_delta)
+            versi_data = self.versi_data + (versi_delta,)
+
+            hasil_baru = {}
+            for key, hasil in self.cache.items():
+                if key[0] == 'pipeline' and key[-1] == self.versi_data:
+                    try:
+                        hasil_baru[key[:-1] + (versi_data,)] = append_hasil_pipeline(hasil, tabel, delta,
+                                                                                     key[1], key[2])
+                    except ValueError:
+                        # Rentang waktu ini dihitung ulang saat diminta
+                        continue
+
+            # Total berurut dari kubus cukup ditambah total kubus delta pada rentang waktu yang sama
+            ringkasan_delta = {}
+
+            def get_total_delta(sumber, kolom):
+                if sumber[0] != 'kubus':
+                    return None
+                if sumber not in ringkasan_delta:
+                    ringkasan_delta[sumber] = query_ringkasan_kubus(kubus_delta, sumber[1], sumber[2], 1)
+                return ringkasan_delta[sumber][kolom]
+
+            self.agregat.append(self.versi_data, versi_data, get_total_delta)
+            if self.sketsa_kubus is not None:
+                self.sketsa_kubus = append_sketsa_kubus(self.sketsa_kubus, self.kubus, kubus, kubus_delta)
+
+            self.ukuran_data['tabel'] += get_ukuran_tambahan(self.tabel, delta)
+            self.ukuran_data['kubus'] += get_ukuran_tambahan(self.kubus, kubus_delta)
+
+            self.tabel, self.kubus, self.versi_data = tabel, kubus, versi_data
+            self.daftar_delta = self.daftar_delta + (versi_delta,)
+            self.cache.clear()
+            for key, hasil in hasil_baru.items():
+                self.cache.put(key, hasil)
+            catatan['baris'] = sum(len(df) for df in delta.values())
+
+    def append_data(self, delta: dict) -> 'AnalisisEngine':
+
+        """
+        Fungsi ini bertujuan untuk menyimpan order baru sebagai delta di folder data (analisis.ingesti.write_delta)
+        lalu menerapkannya. Engine di proses lain menerapkan delta yang sama saat load berikutnya.
+
+        Parameters:
+            delta (dict): Dictionary berisi df_order, df_order_items, df_order_payments (wajib) serta df_customer,
+                          df_sellers dan df_product (opsional) dengan kolom yang sama seperti file CSV
+
+        Returns:
+            engine (AnalisisEngine): Objek engine itu sendiri
+        """
+
+        from analisis.ingesti import write_delta
+
+        self.load()
+        write_delta(delta, self.data_dir)
+
+        return self.load()
+
+    def get_snapshot(self) -> dict:
+
+        """
+        Fungsi ini mengembalikan snapshot (lihat analisis.materialisasi) untuk versi data saat ini tanpa memuat tabel,
+        atau None jika snapshot tidak dipakai atau belum dibuat untuk versi data ini
+        """
+
+        if not self.pakai_snapshot:
+            return None
+
+        from analisis.loader import get_versi_data
+        from analisis.materialisasi import read_snapshot
+
+        versi_data = get_versi_data(self.data_dir)
+        with self._lock:
+            if versi_data != self.versi_snapshot:
+                with tahap('engine.read_snapshot'):
+                    self.snapshot = read_snapshot(self.data_dir, versi_data)
+                self.versi_snapshot = versi_data
+                self.ukuran_data['snapshot'] = get_ukuran_objek(self.snapshot)
+
+        return self.snapshot
+
+    def get_hasil_snapshot(self, start_date, end_date, top_cities: int = None, top_categories: int = None) -> dict:
+
+        """
+        Fungsi ini mengembalikan hasil di snapshot jika snapshot dibuat untuk rentang waktu yang sama
+        (serta top_cities dan top_categories yang sama jika diberikan), atau None jika tidak cocok
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            top_cities (int): Jumlah kota teratas yang diminta
+            top_categories (int): Jumlah kategori teratas yang diminta
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame snapshot dengan nama artefak sebagai key, atau None
+        """
+
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return None
+
+        manifest = snapshot['manifest']
+        if manifest['rentang_waktu'] != [str(start_date), str(end_date)]:
+            return None
+        if top_cities is not None and manifest['top_cities'] != top_cities:
+            return None
+        if top_categories is not None and manifest['top_categories'] != top_categories:
+            return None
+
+        return snapshot['hasil']
+
+    def get_ukuran_memori(self) -> dict:
+
+        """
+        Fungsi ini mengembalikan ukuran memori (bytes) data bersama engine: tabel, kubus, snapshot, hasil di cache
+        dan registri agregat
+        """
+
+        return {**self.ukuran_data, 'cache': self.cache.stats()['nbytes'],
+                'agregat': self.agregat.cache.stats()['nbytes']}
+
+    def get_rentang_waktu(self) -> tuple:
+
+        """
+        Fungsi ini mengembalikan tanggal order pertama dan terakhir
+
+        Returns:
+            rentang_waktu (tuple): (min_date, max_date) dari order_purchase_timestamp
+        """
+
+        import pandas as pd
+
+        # Snapshot menyimpan rentang waktu sehingga tampilan default tidak perlu memuat tabel
+        snapshot = self.get_snapshot()
+        if snapshot is not None:
+            return tuple(pd.Timestamp(waktu) for waktu in snapshot['manifest']['waktu_order'])
+
+        self.load()
+        waktu = self.tabel['df_order']['order_purchase_timestamp']
+
+        return waktu.min(), waktu.max()
+
+    def get_hasil_pipeline(self, start_date, end_date, cek_batal=None) -> dict:
+
+        """
+        Fungsi ini mengembalikan hasil analisis.pipeline.create_hasil_pipeline untuk rentang waktu dari cache
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame turunan dengan nama variabel sebagai key
+        """
+
+        from analisis.pipeline import create_hasil_pipeline
+
+        # Tabel dan versi data dibaca bersama agar delta yang diterapkan di antaranya tidak membuat hasil data lama
+        # tersimpan dengan versi data baru
+        self.load()
+        with self._lock:
+            tabel, versi_data = self.tabel, self.versi_data
+
+        def hitung():
+            with tahap('engine.create_hasil_pipeline'):
+                return create_hasil_pipeline(tabel, start_date, end_date, self.n_worker, cek_batal)
+
+        return self.cache.get_or_compute(('pipeline', start_date, end_date, versi_data), hitung)
+
+    def get_ringkasan_kubus(self, start_date, end_date, cek_batal=None) -> dict:
+
+        """
+        Fungsi ini mengembalikan hasil analisis.kubus.query_ringkasan_kubus untuk rentang waktu dari cache
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            ringkasan (dict): Dictionary berisi Series total dengan nama dimensi sebagai key
+        """
+
+        from analisis.kubus import query_ringkasan_kubus
+
+        self.load()
+        with self._lock:
+            kubus, versi_data = self.kubus, self.versi_data
+
+        def hitung():
+            with tahap('engine.query_ringkasan_kubus'):
+                return query_ringkasan_kubus(kubus, start_date, end_date, self.n_worker, cek_batal)
+
+        return self.cache.get_or_compute(('kubus', start_date, end_date, versi_data), hitung)
+
+    def get_ringkasan_sketsa(self, start_date, end_date, cek_batal=None) -> dict:
+
+        """
+        Fungsi ini mengembalikan hasil analisis.sketsa.query_ringkasan_sketsa untuk rentang waktu dari cache.
+        Sketsa per bulan dibuat sekali untuk setiap versi data saat mode perkiraan pertama kali dipakai.
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            ringkasan (dict): Dictionary berisi Series perkiraan dengan nama dimensi sebagai key dan 'batas_error'
+        """
+
+        from analisis.sketsa import create_sketsa_kubus, query_ringkasan_sketsa
+
+        self.load()
+        with self._lock:
+            if self.sketsa_kubus is None:
+                with tahap('engine.create_sketsa_kubus'):
+                    self.sketsa_kubus = create_sketsa_kubus(self.kubus)
+            kubus, sketsa_kubus, versi_data = self.kubus, self.sketsa_kubus, self.versi_data
+
+        def hitung():
+            periksa_batal(cek_batal)
+            with tahap('engine.query_ringkasan_sketsa'):
+                return query_ringkasan_sketsa(kubus, sketsa_kubus, start_date, end_date)
+
+        return self.cache.get_or_compute(('sketsa', start_date, end_date, versi_data), hitung)
+
+    def get_indeks_gap(self, start_date, end_date, cek_batal=None):
+
+        """
+        Fungsi ini mengembalikan hasil analisis.gap.create_indeks_gap untuk rentang waktu dari cache
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            indeks_gap (pandas DataFrame): Gap setiap (kota, kategori barang), urut per kota berdasarkan gap menurun
+        """
+
+        from analisis.gap import create_indeks_gap
+
+        hasil_snapshot = self.get_hasil_snapshot(start_date, end_date)
+        if hasil_snapshot is not None:
+            return hasil_snapshot['indeks_gap']
+
+        self.load()
+        with self._lock:
+            kubus, versi_data = self.kubus, self.versi_data
+
+        def hitung():
+            periksa_batal(cek_batal)
+            with tahap('engine.create_indeks_gap') as catatan:
+                indeks_gap = create_indeks_gap(kubus, start_date, end_date)
+                catatan['baris'] = len(indeks_gap)
+                return indeks_gap
+
+        return self.cache.get_or_compute(('gap', start_date, end_date, versi_data), hitung)
+
+    def get_agregat(self, kolom: str, start_date, end_date, perkiraan: bool = False, n: int = None,
+                    frame: str = None, cek_batal=None):
+
+        """
+        Fungsi ini mengembalikan total urut menurun untuk sebuah dimensi dari registri agregat
+        (analisis.agregat.RegistriAgregat), dihitung satu kali per rentang waktu dan versi data
+
+        Parameters:
+            kolom (str): Dimensi di DAFTAR_AGREGAT, misalnya 'customer_city' atau 'seller_id'
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            perkiraan (bool): True berarti total diambil dari sketsa top-K (hanya jika frame None)
+            n (int): Jumlah baris teratas, None berarti seluruh baris
+            frame (str): Nama Data Frame hasil pipeline sebagai sumber (misalnya 'df_customer_merged'),
+                         None berarti ringkasan kubus atau sketsa
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            agregat (pandas DataFrame): Data Frame satu kolom (payment_value_sum atau price_sum), urut menurun
+        """
+
+        from analisis.agregat import DAFTAR_AGREGAT, get_total_frame
+
+        kolom_ukuran = DAFTAR_AGREGAT[kolom]
+
+        self.load()
+        with self._lock:
+            versi_data = self.versi_data
+        if frame is not None:
+            sumber = ('pipeline', frame, start_date, end_date, versi_data)
+            fungsi_total = lambda: get_total_frame(self.get_hasil_pipeline(start_date, end_date, cek_batal)[frame], kolom,
+                                                   kolom_ukuran)
+        elif perkiraan:
+            sumber = ('sketsa', start_date, end_date, versi_data)
+            fungsi_total = lambda: self.get_ringkasan_sketsa(start_date, end_date, cek_batal)[kolom]
+        else:
+            sumber = ('kubus', start_date, end_date, versi_data)
+            fungsi_total = lambda: self.get_ringkasan_kubus(start_date, end_date, cek_batal)[kolom]
+
+        return self.agregat.get_agregat(sumber, kolom, kolom_ukuran, fungsi_total, n)
+
+    def get_rentang(self, start_date=None, end_date=None) -> tuple:
+
+        """
+        Fungsi ini mengubah start_date dan end_date menjadi datetime.date, None diganti tanggal order pertama/terakhir
+        """
+
+        import pandas as pd
+
+        min_date, max_date = self.get_rentang_waktu()
+        start_date = pd.Timestamp(min_date if start_date is None else start_date).date()
+        end_date = pd.Timestamp(max_date if end_date is None else end_date).date()
+
+        return start_date, end_date
+
+    def run_ringkasan(self, start_date=None, end_date=None, top_cities: int = 8, top_categories: int = 10,
+                      perkiraan: bool = False, cek_batal=None) -> dict:
+
+        """
+        Fungsi ini bertujuan untuk menghasilkan data grafik Pertanyaan 1-4 dari kubus agregat (tanpa pipeline penuh).
+        Hasilnya disimpan di cache per (rentang waktu, top_cities, top_categories, perkiraan).
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu, default tanggal order pertama
+            end_date (datetime.date): Tanggal akhir rentang waktu, default tanggal order terakhir
+            top_cities (int): Jumlah kota teratas pada kategori_kota_jual dan kategori_kota_beli
+            top_categories (int): Jumlah kategori teratas untuk setiap kota
+            perkiraan (bool): True berarti memakai sketsa top-K (analisis.sketsa) yang lebih cepat dengan batas error
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame berikut:
+                - customer_state, customer_city, customer_id (payment_value_sum, urut menurun)
+                - seller_state, seller_city, seller_id (price_sum, urut menurun)
+                - kategori_kota_jual (seller_city, product_category_name, count)
+                - kategori_kota_beli (customer_city, product_category_name, count)
+                - batas_error (dictionary batas error per dimensi, hanya pada mode perkiraan)
+        """
+
+        from analisis.agregat import DAFTAR_AGREGAT
+        from analisis.pipeline import return_kategori_di_kota_beli, return_kategori_di_kota_jual
+
+        start_date, end_date = self.get_rentang(start_date, end_date)
+        hasil_snapshot = None if perkiraan else self.get_hasil_snapshot(start_date, end_date, top_cities, top_categories)
+        if hasil_snapshot is not None:
+            return {nama: hasil_snapshot[nama] for nama in KOLOM_RINGKASAN}
+
+        # Versi data kunci cache dibaca setelah load, sehingga data yang berubah tidak memakai hasil versi lama
+        versi_data = self.load().versi_data
+
+        def hitung():
+            if perkiraan:
+                ringkasan = self.get_ringkasan_sketsa(start_date, end_date, cek_batal)
+            else:
+                ringkasan = self.get_ringkasan_kubus(start_date, end_date, cek_batal)
+
+            # Total urut per dimensi diambil dari registri agregat, sama untuk setiap top_cities dan top_categories
+            periksa_batal(cek_batal)
+            hasil = {kolom: self.get_agregat(kolom, start_date, end_date, perkiraan, cek_batal=cek_batal)
+                     for kolom in DAFTAR_AGREGAT}
+
+            periksa_batal(cek_batal)
+
+            hasil['kategori_kota_jual'] = return_kategori_di_kota_jual(hasil['seller_city'].head(top_cities),
+                                                                       ringkasan['kategori_di_kota_jual'],
+                                                                       top_categories)
+            hasil['kategori_kota_beli'] = return_kategori_di_kota_beli(hasil['customer_city'].head(top_cities),
+                                                                       ringkasan['kategori_di_kota_beli'],
+                                                                       top_categories)
+            if perkiraan:
+                hasil['batas_error'] = ringkasan['batas_error']
+
+            return hasil
+
+        return self.cache.get_or_compute(('ringkasan', start_date, end_date, top_cities, top_categories, perkiraan,
+                                          versi_data), hitung)
+
+    def run_gap(self, start_date=None, end_date=None, kota: str = None, n_kategori: int = 10,
+                cek_batal=None) -> dict:
+
+        """
+        Fungsi ini bertujuan untuk menghasilkan indeks gap permintaan (pengeluaran customer dikurangi pendapatan
+        seller) per kota dan kategori barang untuk seluruh kota
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu, default tanggal order pertama
+            end_date (datetime.date): Tanggal akhir rentang waktu, default tanggal order terakhir
+            kota (str): Kota yang kategorinya diurutkan, default kota dengan gap positif terbesar
+            n_kategori (int): Jumlah kategori dengan gap terbesar, None berarti seluruh kategori
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame berikut:
+                - gap_per_kota (pengeluaran_customer, pendapatan_seller, gap_positif per kota, urut menurun)
+                - gap_kategori (pengeluaran_customer, pendapatan_seller, gap per kategori di kota, urut menurun)
+        """
+
+        from analisis.gap import get_gap_kota, get_ringkasan_kota_gap
+
+        start_date, end_date = self.get_rentang(start_date, end_date)
+        # Versi data kunci cache dibaca setelah load (atau dari snapshot yang cocok, tanpa memuat tabel)
+        if self.get_hasil_snapshot(start_date, end_date) is not None:
+            versi_data = self.versi_snapshot
+        else:
+            versi_data = self.load().versi_data
+
+        gap_per_kota = self.cache.get_or_compute(('gap_per_kota', start_date, end_date, versi_data),
+                                                 lambda: get_ringkasan_kota_gap(
+                                                     self.get_indeks_gap(start_date, end_date, cek_batal)))
+        if kota is None and len(gap_per_kota):
+            kota = gap_per_kota.index[0]
+
+        periksa_batal(cek_batal)
+        return {'gap_per_kota': gap_per_kota,
+                'gap_kategori': get_gap_kota(self.get_indeks_gap(start_date, end_date, cek_batal), kota, n_kategori)}
+
+    def run_klaster(self, start_date=None, end_date=None, cek_batal=None) -> dict:
+
+        """
+        Fungsi ini bertujuan untuk menghasilkan klaster customer dan seller dari pipeline penuh
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu, default tanggal order pertama
+            end_date (datetime.date): Tanggal akhir rentang waktu, default tanggal order terakhir
+            cek_batal (callable): Pemeriksaan pembatalan di antara tahap (misalnya analisis.latar.Tugas.cek_batal)
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame klaster_customer dan klaster_seller
+        """
+
+        start_date, end_date = self.get_rentang(start_date, end_date)
+        hasil_snapshot = self.get_hasil_snapshot(start_date, end_date)
+        if hasil_snapshot is not None:
+            return {'klaster_customer': hasil_snapshot['klaster_customer'],
+                    'klaster_seller': hasil_snapshot['klaster_seller']}
+
+        hasil_pipeline = self.get_hasil_pipeline(start_date, end_date, cek_batal)
+
+        return {'klaster_customer': hasil_pipeline['df_customer_klaster'],
+                'klaster_seller': hasil_pipeline['df_sellers_klaster']}
+
+    def run(self, start_date=None, end_date=None, top_cities: int = 8, top_categories: int = 10) -> dict:
+
+        """
+        Fungsi ini bertujuan untuk menjalankan seluruh analisis pada rentang waktu [start_date, end_date]
+        dan mengembalikan Data Frame biasa yang siap dipakai tanpa Streamlit
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu, default tanggal order pertama
+            end_date (datetime.date): Tanggal akhir rentang waktu, default tanggal order terakhir
+            top_cities (int): Jumlah kota teratas pada kategori_kota_jual dan kategori_kota_beli
+            top_categories (int): Jumlah kategori teratas untuk setiap kota
+
+        Returns:
+            hasil (dict): Dictionary berisi Data Frame berikut:
+                - pivot_seller, pivot_order, df_sellers_merged, df_customer_merged
+                - customer_state, customer_city, customer_id (payment_value_sum, urut menurun)
+                - seller_state, seller_city, seller_id (price_sum, urut menurun)
+                - kategori_kota_jual (seller_city, product_category_name, count)
+                - kategori_kota_beli (customer_city, product_category_name, count)
+                - klaster_customer, klaster_seller
+        """
+
+        start_date, end_date = self.get_rentang(start_date, end_date)
+        hasil_snapshot = self.get_hasil_snapshot(start_date, end_date, top_cities, top_categories)
+        if hasil_snapshot is not None:
+            return {nama: df for nama, df in hasil_snapshot.items() if nama != 'indeks_gap'}
+
+        hasil_pipeline = self.get_hasil_pipeline(start_date, end_date)
+
+        hasil = {'pivot_seller': hasil_pipeline['pivot_seller'],
+                 'pivot_order': hasil_pipeline['pivot_order'],
+                 'df_sellers_merged': hasil_pipeline['df_sellers_merged'],
+                 'df_customer_merged': hasil_pipeline['df_customer_merged']}
+        hasil.update(self.run_ringkasan(start_date, end_date, top_cities, top_categories))
+        hasil.update(self.run_klaster(start_date, end_date))
+
+        return hasil
+
+## Engine bersama untuk satu proses
+engine_bersama = None
+engine_bersama_lock = threading.Lock()
+
+def get_engine(data_dir: str = 'data') -> AnalisisEngine:
+
+    """
+    Fungsi ini mengembalikan satu objek AnalisisEngine yang sama untuk seluruh pemanggil di proses ini
+
+    Parameters:
+        data_dir (str): Folder tempat file data berada (hanya dipakai saat engine pertama kali dibuat)
+
+    Returns:
+        engine (AnalisisEngine): Engine bersama
+    """
+
+    global engine_bersama
+
+    with engine_bersama_lock:
+        if engine_bersama is None:
+            engine_bersama = AnalisisEngine(data_dir=data_dir)
+
+    return engine_bersama
+
+def run(start_date=None, end_date=None, top_cities: int = 8, top_categories: int = 10) -> dict:
+
+    """
+    Fungsi ini menjalankan AnalisisEngine.run pada engine bersama (lihat get_engine)
+    """
+
+    return get_engine().run(start_date, end_date, top_cities, top_categories)
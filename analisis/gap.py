@@ -0,0 +1,92 @@
+"""
+Modul ini berisi indeks gap permintaan per kota dan kategori barang (lanjutan Pertanyaan 3): kategori yang banyak
+dibeli customer di sebuah kota namun sedikit dijual seller di kota yang sama.
+
+    gap = pengeluaran customer (jumlah price barang yang dibeli customer di kota tersebut)
+          - pendapatan seller (jumlah price barang yang dijual seller di kota tersebut)
+
+Pengeluaran per kategori memakai price barang (bukan payment_value) karena pembayaran dicatat per order, bukan per
+barang. Kedua sisi diambil dari kubus agregat harian (analisis/kubus.py), sehingga matriks untuk rentang waktu apa
+pun cukup dihitung dari baris kubus tanpa pipeline penuh.
+"""
+
+import pandas as pd
+
+from analisis.kubus import slice_kubus
+
+## Matriks gap
+def create_indeks_gap(kubus: dict, start_date, end_date) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat indeks gap seluruh pasangan (kota, kategori barang) pada rentang waktu
+    [start_date, end_date]. Kota yang hanya memiliki customer atau hanya memiliki seller tetap dimasukkan.
+
+    Parameters:
+        kubus (dict): Hasil analisis.kubus.create_kubus
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+
+    Returns:
+        indeks_gap (pandas DataFrame): Data Frame dengan index (kota, product_category_name) dan kolom
+                                       pengeluaran_customer, pendapatan_seller dan gap, urut berdasarkan kota
+                                       lalu gap menurun sehingga setiap kota dapat diambil dengan .loc[kota]
+    """
+
+    kubus_seller = slice_kubus(kubus['seller'], start_date, end_date)
+    kubus_kategori_customer = slice_kubus(kubus['kategori_customer'], start_date, end_date)
+
+    # Kota customer dan kota seller berasal dari tabel berbeda, sehingga keduanya dicocokkan sebagai string
+    pendapatan = kubus_seller.groupby(by=['seller_city', 'product_category_name'], observed=True)['price_sum'].sum()
+    pengeluaran = kubus_kategori_customer.groupby(by=['customer_city', 'product_category_name'],
+                                                  observed=True)['price_sum'].sum()
+    for total in (pendapatan, pengeluaran):
+        total.index = total.index.set_levels([level.astype(str) for level in total.index.levels])
+        total.index.names = ['kota', 'product_category_name']
+
+    indeks_gap = pd.concat([pengeluaran.rename('pengeluaran_customer'), pendapatan.rename('pendapatan_seller')],
+                           axis=1).fillna(0.0)
+    indeks_gap['gap'] = indeks_gap['pengeluaran_customer'] - indeks_gap['pendapatan_seller']
+
+    indeks_gap = indeks_gap.reset_index().sort_values(by=['kota', 'gap'], ascending=[True, False], kind='stable')
+
+    return indeks_gap.set_index(['kota', 'product_category_name'])
+
+def get_ringkasan_kota_gap(indeks_gap: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk meringkas indeks gap per kota: total pengeluaran, total pendapatan dan total gap
+    positif (peluang seller), urut menurun berdasarkan gap positif
+
+    Parameters:
+        indeks_gap (pandas DataFrame): Hasil create_indeks_gap
+
+    Returns:
+        ringkasan_kota (pandas DataFrame): Data Frame dengan index kota dan kolom pengeluaran_customer,
+                                           pendapatan_seller dan gap_positif
+    """
+
+    ringkasan_kota = indeks_gap.assign(gap_positif=indeks_gap['gap'].clip(lower=0)).groupby(level='kota')[
+                                    ['pengeluaran_customer', 'pendapatan_seller', 'gap_positif']].sum()
+
+    return ringkasan_kota.sort_values(by='gap_positif', ascending=False, kind='stable')
+
+def get_gap_kota(indeks_gap: pd.DataFrame, kota: str, n_kategori: int = 10) -> pd.DataFrame:
+
+    """
+    Fungsi ini mengembalikan n_kategori kategori dengan gap terbesar di sebuah kota
+
+    Parameters:
+        indeks_gap (pandas DataFrame): Hasil create_indeks_gap
+        kota (str): Nama kota
+        n_kategori (int): Jumlah kategori, None berarti seluruh kategori
+
+    Returns:
+        gap_kota (pandas DataFrame): Data Frame dengan index product_category_name, urut menurun berdasarkan gap
+    """
+
+    try:
+        gap_kota = indeks_gap.xs(kota, level='kota')
+    except KeyError:
+        gap_kota = indeks_gap.iloc[:0].droplevel('kota')
+
+    return gap_kota.head(n_kategori)
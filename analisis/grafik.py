@@ -0,0 +1,441 @@
+"""
+Modul ini berisi fungsi-fungsi pembuat grafik dashboard (matplotlib dan seaborn, tanpa Streamlit)
+beserta cache gambar hasil render.
+
+Setiap grafik dirender sekali menjadi bytes PNG (atau SVG) lalu disimpan di cache_grafik dengan kunci
+hash dari nama grafik, Data Frame masukan dan nilai widget. Rerun dengan masukan yang sama
+langsung memakai bytes tersebut tanpa menggambar ulang.
+"""
+
+import hashlib
+import io
+import pickle
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from analisis.cache import LRUCache
+from analisis.pipeline import kumpulan_klaster
+
+## Cache gambar
+# Batas jumlah gambar dan total ukuran bytes di cache, gambar yang paling lama tidak dipakai dibuang lebih dulu
+MAKS_GAMBAR = 256
+MAKS_BYTES_GAMBAR = 64 * 1024 * 1024
+
+# Format dan resolusi gambar, sama dengan bawaan st.pyplot
+FORMAT_GAMBAR = 'png'
+DPI_GAMBAR = 200
+
+# Lebar maksimum gambar (piksel) yang ditampilkan Streamlit. Gambar yang lebih lebar diperkecil oleh Streamlit
+# pada setiap rerun, sehingga resolusi gambar langsung dibatasi saat render.
+MAKS_LEBAR_GAMBAR = 2 * 730
+
+cache_grafik = LRUCache(maxsize=MAKS_GAMBAR, maxbytes=MAKS_BYTES_GAMBAR)
+
+def get_hash_masukan(*masukan) -> str:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan hash dari masukan grafik. Data Frame dan Series di-hash berdasarkan
+    isi, index, nama kolom dan dtype-nya, masukan lain berdasarkan repr (atau pickle jika repr tidak stabil).
+
+    Parameters:
+        *masukan: Data Frame, Series atau nilai widget yang dipakai grafik
+
+    Returns:
+        hash_masukan (str): Hash hex dari seluruh masukan
+    """
+
+    hash_masukan = hashlib.blake2b(digest_size=16)
+    for nilai in masukan:
+        if isinstance(nilai, (pd.DataFrame, pd.Series)):
+            df = nilai.to_frame() if isinstance(nilai, pd.Series) else nilai
+            hash_masukan.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+            hash_masukan.update(repr((list(df.columns), list(map(str, df.dtypes)), list(df.index.names))).encode())
+        elif isinstance(nilai, (str, int, float, bool, tuple, type(None))):
+            hash_masukan.update(repr(nilai).encode())
+        else:
+            hash_masukan.update(pickle.dumps(nilai))
+        # Pemisah antar masukan
+        hash_masukan.update(b'|')
+
+    return hash_masukan.hexdigest()
+
+def render_gambar(fig, format_gambar: str = FORMAT_GAMBAR) -> bytes:
+
+    """
+    Fungsi ini menyimpan fig menjadi bytes (dengan bbox_inches='tight' seperti st.pyplot) dengan lebar
+    paling besar MAKS_LEBAR_GAMBAR piksel, lalu menutup fig agar memorinya dilepas
+    """
+
+    # Lebar hasil bbox_inches='tight' (termasuk pad 0,1 inci di kiri dan kanan) bisa melebihi lebar figure,
+    # dan ukuran teks sedikit berubah mengikuti dpi, sehingga lebar PNG (byte 16-20 header) diperiksa lagi
+    lebar_inci = fig.get_tightbbox(fig.canvas.get_renderer()).width + 0.2
+    dpi = min(DPI_GAMBAR, MAKS_LEBAR_GAMBAR / lebar_inci)
+    for _ in range(3):
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=format_gambar, dpi=dpi, bbox_inches='tight')
+        if format_gambar != 'png':
+            break
+        lebar_piksel = int.from_bytes(buffer.getvalue()[16:20], 'big')
+        if lebar_piksel <= MAKS_LEBAR_GAMBAR:
+            break
+        dpi = dpi * (MAKS_LEBAR_GAMBAR - 2) / lebar_piksel
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+def get_gambar(nama: str, fungsi, *masukan, format_gambar: str = FORMAT_GAMBAR) -> bytes:
+
+    """
+    Fungsi ini bertujuan untuk mengembalikan bytes gambar grafik dari cache_grafik,
+    atau membuat grafik dengan fungsi(*masukan), merendernya dan menyimpannya jika belum ada di cache
+
+    Parameters:
+        nama (str): Nama grafik, bagian dari kunci cache
+        fungsi (callable): Fungsi pembuat grafik yang mengembalikan matplotlib Figure
+        *masukan: Masukan fungsi (Data Frame dan nilai widget), bagian dari kunci cache
+        format_gambar (str): 'png' atau 'svg'
+
+    Returns:
+        gambar (bytes): Bytes gambar hasil render
+    """
+
+    kunci = (nama, format_gambar, get_hash_masukan(*masukan))
+
+    return cache_grafik.get_or_compute(kunci, lambda: render_gambar(fungsi(*masukan), format_gambar))
+
+## Grafik Pertanyaan 1
+def create_grafik_pertanyaan_1(df_state: pd.DataFrame, df_city: pd.DataFrame, df_id: pd.DataFrame):
+
+    """
+    Fungsi ini bertujuan untuk membuat grafik top 5 total pengeluaran customer per state, kota dan id
+
+    Parameters:
+        df_state (pandas DataFrame): Total payment_value_sum per customer_state (urut menurun)
+        df_city (pandas DataFrame): Total payment_value_sum per customer_city (urut menurun)
+        df_id (pandas DataFrame): Total payment_value_sum per customer_id (urut menurun)
+
+    Returns:
+        fig (matplotlib Figure): Grafik Pertanyaan 1
+    """
+
+    fig, ax = plt.subplots(nrows=3, ncols=1, figsize=(12,20))
+
+    df_0 = df_state.head(5)
+    
+    colors = ["#8F4700", "#D3D3D3","#D3D3D3", "#D3D3D3", "#D3D3D3"]
+
+    sns.barplot(y=df_0.index.astype(str),
+                x=df_0['payment_value_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[0]
+                )
+    ax[0].set_xlabel("Total Pengeluaran (Juta BRL)", fontsize=24)
+    ax[0].set_ylabel("Nama State", fontsize=24)
+    ax[0].set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap State", fontsize=28)
+    ax[0].tick_params(axis='y', labelsize=20)
+    ax[0].tick_params(axis='x', labelsize=20)
+
+    df_0 = df_city.head(5)
+    
+    sns.barplot(y=df_0.index.astype(str),
+                x=df_0['payment_value_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[1]
+                )    
+    
+    ax[1].set_xlabel("Total Pengeluaran (Juta BRL)", fontsize=24)
+    ax[1].set_ylabel("Nama City", fontsize=24)
+    ax[1].set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap Kota", fontsize=28)
+    ax[1].tick_params(axis='y', labelsize=20)
+    ax[1].tick_params(axis='x', labelsize=20)
+    
+    df_0 = df_id.head(5)
+    
+    index_ = [i[:3]+'...' for i in df_0.index]
+
+    sns.barplot(y=index_,
+                x=df_0['payment_value_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[2]
+                )   
+
+    ax[2].set_xlabel("Total Pengeluaran (BRL)", fontsize=24)
+    ax[2].set_ylabel("ID Customer", fontsize=24)
+    ax[2].set_title("Top 5 Total Pengeluaran Customer", fontsize=28)
+    ax[2].tick_params(axis='y', labelsize=20)
+    ax[2].tick_params(axis='x', labelsize=20)
+
+    fig.tight_layout()
+
+    return fig
+
+## Grafik Pertanyaan 2
+def create_grafik_pertanyaan_2(df_state: pd.DataFrame, df_city: pd.DataFrame, df_id: pd.DataFrame):
+
+    """
+    Fungsi ini bertujuan untuk membuat grafik top 5 total penghasilan seller per state, kota dan id
+
+    Parameters:
+        df_state (pandas DataFrame): Total price_sum per seller_state (urut menurun)
+        df_city (pandas DataFrame): Total price_sum per seller_city (urut menurun)
+        df_id (pandas DataFrame): Total price_sum per seller_id (urut menurun)
+
+    Returns:
+        fig (matplotlib Figure): Grafik Pertanyaan 2
+    """
+
+    fig, ax = plt.subplots(nrows=3, ncols=1, figsize=(12,20))
+
+    df_0 = df_state.head(5)
+    
+    colors = ["#8F4700", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
+
+    sns.barplot(y=df_0.index.astype(str),
+                x=df_0['price_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[0]
+                )
+                
+    ax[0].set_xlabel("Total Penghasilan (Juta BRL)", fontsize=24)
+    ax[0].set_ylabel("Nama State", fontsize=24)
+    ax[0].set_title("Top 5 Total Penghasilan Seluruh Seller di Setiap State", fontsize=28)
+    ax[0].tick_params(axis='y', labelsize=20)
+    ax[0].tick_params(axis='x', labelsize=20)
+
+    df_0 = df_city.head(5)
+    
+    sns.barplot(y=df_0.index.astype(str),
+                x=df_0['price_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[1]
+                )    
+    
+    ax[1].set_xlabel("Total Penghasilan (Juta BRL)", fontsize=24)
+    ax[1].set_ylabel("Nama City", fontsize=24)
+    ax[1].set_title("Top 5 Total Penghasilan Seluruh Seller di Setiap Kota", fontsize=28)
+    ax[1].tick_params(axis='y', labelsize=20)
+    ax[1].tick_params(axis='x', labelsize=20)
+    
+    df_0 = df_id.head(5)
+    
+    index_ = [i[:3]+'...' for i in df_0.index]
+
+    sns.barplot(y=index_,
+                x=df_0['price_sum'],
+                data=df_0,
+                palette=colors,
+                ax=ax[2]
+                )   
+
+    ax[2].set_xlabel("Total Penghasilan (BRL)", fontsize=24)
+    ax[2].set_ylabel("ID Seller", fontsize=24)
+    ax[2].set_title("Top 5 Total Penghasilan Seller", fontsize=28)
+    ax[2].tick_params(axis='y', labelsize=20)
+    ax[2].tick_params(axis='x', labelsize=20)
+
+    fig.tight_layout()
+
+    return fig
+
+## Grafik Pertanyaan 3
+def create_grafik_pertanyaan_3(df_customer_city: pd.DataFrame, df_seller_city: pd.DataFrame):
+
+    """
+    Fungsi ini bertujuan untuk membuat grafik perbandingan top 5 pengeluaran dan penghasilan per kota
+
+    Parameters:
+        df_customer_city (pandas DataFrame): Total payment_value_sum per customer_city (urut menurun)
+        df_seller_city (pandas DataFrame): Total price_sum per seller_city (urut menurun)
+
+    Returns:
+        fig (matplotlib Figure): Grafik Pertanyaan 3
+    """
+
+    # Membuat kanvas
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))  # 1 baris, 2 kolom
+    colors = ["#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#8F4700"]
+
+    # Grafik pertama (masukan sudah urut menurun, dibalik agar nilai terbesar berada di atas)
+    df_0 = df_customer_city.head(5).iloc[::-1]
+    ax1.barh(y=df_0.index,
+            width=df_0['payment_value_sum'],
+            align='center',
+            color=colors
+            )
+    ax1.set_xlabel("Total Pengeluaran (Juta BRL)")
+    ax1.set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap Kota")
+
+    # Grafik kedua
+    df_0 = df_seller_city.head(5).iloc[::-1]
+    ax2.barh(y=df_0.index,
+            width=df_0['price_sum'],
+            align='center',
+            color=colors
+            )
+    ax2.set_xlabel("Total Pendapatan (Juta BRL)")
+    ax2.set_title("Top 5 Total Pendapatan Seluruh Seller di Setiap Kota")
+
+    # Tampilkan grafik
+    fig.tight_layout()  # Agar layout lebih rapi
+
+    return fig
+
+## Grafik Pertanyaan 4
+def get_kategori_kota_grafik(kategori_kota: pd.DataFrame, kolom_kota: str, n_kota: int, n_barang: int) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk mengambil n_kota kota pertama dan n_barang kategori pertama setiap kota dari
+    Data Frame panjang (sudah urut per kota lalu jumlah barang) sekaligus, serta memendekkan label kategori
+
+    Parameters:
+        kategori_kota (pandas DataFrame): Data Frame panjang (kolom_kota, product_category_name, count)
+        kolom_kota (str): 'seller_city' atau 'customer_city'
+        n_kota (int): Jumlah kota yang diambil
+        n_barang (int): Jumlah kategori barang yang diambil per kota
+
+    Returns:
+        kategori_kota (pandas DataFrame): Data Frame baru (Data Frame hasil cache tidak diubah)
+    """
+
+    urutan_kota = pd.factorize(kategori_kota[kolom_kota])[0]
+    urutan_barang = kategori_kota.groupby(kolom_kota, sort=False).cumcount().to_numpy()
+    kategori_kota = kategori_kota[(urutan_kota < n_kota) & (urutan_barang < n_barang)]
+
+    return kategori_kota.assign(product_category_name=kategori_kota['product_category_name'].str[:12] + '...')
+
+def create_grafik_pertanyaan_4(kategori_kota_jual: pd.DataFrame,
+                               kategori_kota_beli: pd.DataFrame,
+                               input_kota: int,
+                               input_barang: int):
+
+    """
+    Fungsi ini bertujuan untuk membuat grid grafik kategori barang yang banyak dijual dan dibeli di setiap kota
+
+    Parameters:
+        kategori_kota_jual (pandas DataFrame): Data Frame panjang (seller_city, product_category_name, count)
+        kategori_kota_beli (pandas DataFrame): Data Frame panjang (customer_city, product_category_name, count)
+        input_kota (int): Jumlah kota yang ditampilkan (dibatasi jumlah kota yang ada)
+        input_barang (int): Jumlah kategori barang yang ditampilkan per kota
+
+    Returns:
+        fig (matplotlib Figure): Grafik Pertanyaan 4
+    """
+
+    # Data Frame panjang dari engine sudah urut per kota lalu per jumlah barang
+    df_jual = get_kategori_kota_grafik(kategori_kota_jual, 'seller_city', input_kota, input_barang)
+    df_beli = get_kategori_kota_grafik(kategori_kota_beli, 'customer_city', input_kota, input_barang)
+    kelompok_jual = list(df_jual.groupby('seller_city', sort=False))
+    kelompok_beli = list(df_beli.groupby('customer_city', sort=False))
+    input_kota = max(min(input_kota, max(len(kelompok_jual), len(kelompok_beli))), 1)
+
+    figsize_y = 100/(8*10)
+
+    fig, ax = plt.subplots(nrows=input_kota, ncols=2, figsize=(25,figsize_y*(input_kota*input_barang)),
+                           squeeze=False)
+
+    colors = ["#8F4700"] + ["#D3D3D3"] * (input_barang - 1)
+
+    for j, (kelompok, satuan, judul) in enumerate([(kelompok_jual, "Total Penjualan Barang (Satuan)", "Penjualan"),
+                                                   (kelompok_beli, "Total Pembelian Barang (Satuan)", "Pembelian")]):
+        for i, (kota, df_kota) in enumerate(kelompok):
+
+            sns.barplot(y=df_kota['product_category_name'],
+                        x=df_kota['count'],
+                        data=df_kota,
+                        palette=colors[:len(df_kota)],
+                        ax=ax[i][j]
+                        )
+
+            ax[i][j].set_xlabel(satuan, fontsize=24)
+            ax[i][j].set_ylabel("Kategori Barang", fontsize=24)
+            ax[i][j].set_title(f"Top {input_barang} {judul} Kategori Barang di {kota}", fontsize=28)
+            ax[i][j].tick_params(axis='y', labelsize=20)
+            ax[i][j].tick_params(axis='x', labelsize=20)
+
+    fig.tight_layout()
+
+    return fig
+
+## Grafik klaster
+def create_grafik_klaster_customer(jumlah_customer: pd.Series):
+
+    """
+    Fungsi ini bertujuan untuk membuat pie chart jumlah customer per klaster (Klaster VI dan VII digabung)
+
+    Parameters:
+        jumlah_customer (pandas Series): Kolom customer_id_count dari klaster customer
+
+    Returns:
+        fig (matplotlib Figure): Grafik klaster customer
+    """
+
+    fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(12,20))
+
+    colors = ('#C46100', '#EF9234', '#F4B678', '#F9E0A2', '#F4B678', '#EF9234')
+    explode = (0.02, 0.03, 0.05, 0.07, 0.09, 0.11)
+
+    klaster = kumpulan_klaster[:5]
+    klaster.append("Klaster VI dan VII")
+    count = (jumlah_customer.iloc[0],
+             jumlah_customer.iloc[1],
+             jumlah_customer.iloc[2],
+             jumlah_customer.iloc[3],
+             jumlah_customer.iloc[4],
+             jumlah_customer.iloc[5]+jumlah_customer.iloc[6]
+             )
+
+    ax.pie(
+        x=count,
+        labels=klaster,
+        autopct='%1.1f%%',
+        colors=colors,
+        explode=explode,
+        wedgeprops = {'width': 0.5}
+        )
+    ax.set_title('Klaster Customer', fontsize=26)
+
+    return fig
+
+def create_grafik_klaster_seller(jumlah_seller: pd.Series):
+
+    """
+    Fungsi ini bertujuan untuk membuat pie chart jumlah seller per klaster
+
+    Parameters:
+        jumlah_seller (pandas Series): Kolom seller_id_count dari klaster seller
+
+    Returns:
+        fig (matplotlib Figure): Grafik klaster seller
+    """
+
+    fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(12,20))
+
+    klaster = kumpulan_klaster
+    count = (jumlah_seller.iloc[0],
+             jumlah_seller.iloc[1],
+             jumlah_seller.iloc[2],
+             jumlah_seller.iloc[3],
+             jumlah_seller.iloc[4],
+             jumlah_seller.iloc[5],
+             jumlah_seller.iloc[6]
+             )
+    colors = ('#8F4700', '#C46100', '#EF9234', '#F4B678', '#F9E0A2', '#F4B678', '#C46100')
+    explode = (0.02, 0.03, 0.05, 0.07, 0.09, 0.11, 0.13)
+    ax.pie(
+        x=count,
+        labels=klaster,
+        autopct='%1.1f%%',
+        colors=colors,
+        explode=explode,
+        wedgeprops = {'width': 0.5}
+        )
+    ax.set_title("Klaster Seller", fontsize=26)
+
+    return fig
@@ -0,0 +1,351 @@
+"""
+Modul ini berisi jalur ingesti data tambahan (delta): order baru beserta barang, payment dan (jika ada) customer,
+seller dan produk barunya, tanpa menulis ulang file *_clean.csv dan tanpa memuat ulang seluruh data.
+
+Setiap delta disimpan sebagai folder data/delta/<nomor>/ berisi satu file Parquet per tabel dan file penanda
+selesai.json yang ditulis terakhir. Waktu modifikasi file penanda masuk ke versi data (lihat
+analisis.loader.get_versi_data), sehingga engine di setiap proses mendeteksi delta baru dan hanya menerapkan delta
+tersebut: tabel diperpanjang, kubus agregat ditambah dengan analisis.kubus.append_kubus, dan hasil pipeline di cache
+(pivot_seller, pivot_order dan turunannya) diperbarui dari agregat delta, bukan dihitung ulang dari seluruh baris.
+
+Delta hanya boleh berisi order yang belum ada. Setelah file CSV ditulis ulang dengan data lengkap, hapus folder
+data/delta agar order tidak terhitung dua kali.
+
+Penggunaan:
+    python -m analisis.ingesti --order order_baru.csv --items items_baru.csv --payments payments_baru.csv
+                               [--customer customer_baru.csv] [--data-dir data]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis.loader import (DATA_DIR, DATA_FILES, DIR_DELTA, KOLOM_ID, KOLOM_URUT, concat_tabel,
+                             get_dtype_gabungan, read_csv_skema, sisip_urut, ubah_kategori)
+from analisis.pipeline import (create_df_customer_merged, create_df_sellers_merged, create_kategori_di_kota,
+                               create_kategori_per_id, create_kelompok_order, create_klaster_customer,
+                               create_klaster_sellers, create_pivot_order, create_pivot_seller, filter_rentang_waktu)
+from analisis.segmentasi import gabung_ringkasan_segmen
+
+# Tabel yang wajib ada di setiap delta; tabel lain di DATA_FILES (customer, seller, produk) boleh ada
+TABEL_DELTA = ['df_order', 'df_order_items', 'df_order_payments']
+
+## Menulis dan membaca delta
+def write_delta(delta: dict, data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini bertujuan untuk menyimpan delta sebagai folder data_dir/delta/<nomor>/ berikutnya. Folder ditulis
+    ke folder sementara lalu diganti sekaligus, dan file penanda ditulis terakhir.
+
+    Parameters:
+        delta (dict): Dictionary nama tabel (lihat TABEL_DELTA dan DATA_FILES) dan Data Frame baris barunya
+        data_dir (str): Folder data
+
+    Returns:
+        dir_delta (str): Lokasi folder delta
+    """
+
+    for nama in TABEL_DELTA:
+        if nama not in delta:
+            raise ValueError(f'Delta harus berisi tabel {nama}')
+    for nama in delta:
+        if nama not in DATA_FILES:
+            raise ValueError(f'Tabel {nama} tidak dikenal, pilihan: {list(DATA_FILES)}')
+
+    dir_induk = os.path.join(data_dir, DIR_DELTA)
+    os.makedirs(dir_induk, exist_ok=True)
+    nomor = max([int(nama) for nama in os.listdir(dir_induk) if nama.isdigit()], default=0) + 1
+    dir_delta = os.path.join(dir_induk, f'{nomor:06d}')
+    dir_sementara = dir_delta + '.tmp'
+    shutil.rmtree(dir_sementara, ignore_errors=True)
+    os.makedirs(dir_sementara)
+
+    baris = {}
+    for nama, df in delta.items():
+        # Kolom ID disimpan sebagai string, kamusnya dibuat ulang saat delta diterapkan
+        df = df.assign(**{kolom: df[kolom].astype(str) for kolom in KOLOM_ID if kolom in df.columns})
+        df.to_parquet(os.path.join(dir_sementara, f'{nama}.parquet'), index=False)
+        baris[nama] = len(df)
+
+    with open(os.path.join(dir_sementara, 'selesai.json'), 'w') as f:
+        json.dump({'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'), 'baris': baris}, f, indent=2)
+
+    os.replace(dir_sementara, dir_delta)
+
+    return dir_delta
+
+def read_delta(path_penanda: str) -> dict:
+
+    """
+    Fungsi ini membaca seluruh tabel sebuah delta dari lokasi file penandanya (lihat get_daftar_delta)
+    """
+
+    dir_delta = os.path.dirname(path_penanda)
+    with open(path_penanda) as f:
+        daftar_tabel = json.load(f)['baris']
+
+    return {nama: pd.read_parquet(os.path.join(dir_delta, f'{nama}.parquet')) for nama in daftar_tabel}
+
+## Menerapkan delta ke tabel
+def append_tabel(tabel: dict, delta: dict) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menambahkan baris delta ke tabel. Kolom ID dan kolom category delta dikodekan
+    dengan kamus tabel yang diperpanjang di akhir, sehingga kode lama tetap berlaku dan hanya baris delta yang
+    perlu dicocokkan. Tabel di KOLOM_URUT tetap urut berdasarkan waktu.
+
+    Parameters:
+        tabel (dict): Dictionary tabel hasil analisis.loader.load_tabel (tidak diubah)
+        delta (dict): Dictionary nama tabel dan Data Frame baris barunya
+
+    Returns:
+        tuple(tabel_baru, delta):
+        Dictionary tabel baru dan dictionary delta yang sudah dikodekan dan diurutkan (semua tabel DATA_FILES ada)
+    """
+
+    delta = {nama: delta[nama] if nama in delta else tabel[nama].iloc[:0] for nama in tabel}
+
+    for nama, df in delta.items():
+        kolom_hilang = [kolom for kolom in tabel[nama].columns if kolom not in df.columns]
+        if kolom_hilang:
+            raise ValueError(f'Kolom {kolom_hilang} tidak ada di delta {nama}')
+        df = df[tabel[nama].columns.tolist()]
+        for kolom in DATA_FILES[nama][1]:
+            df = df.assign(**{kolom: pd.to_datetime(df[kolom])})
+        delta[nama] = df
+
+    # Order delta harus baru, dan barang serta payment delta hanya boleh milik order delta
+    dtype_order = tabel['df_order']['order_id'].dtype
+    order_baru = delta['df_order']['order_id'].astype(str)
+    if (dtype_order.categories.get_indexer(order_baru) >= 0).any():
+        raise ValueError('Delta berisi order_id yang sudah ada di data')
+    for nama in ['df_order_items', 'df_order_payments']:
+        if not delta[nama]['order_id'].astype(str).isin(order_baru).all():
+            raise ValueError(f'{nama} delta berisi order_id yang tidak ada di df_order delta')
+
+    # Kamus setiap kolom category diperpanjang dengan nilai baru dari seluruh tabel delta
+    dtype_baru = {}
+    for df_tabel in tabel.values():
+        for kolom, dtype in df_tabel.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and kolom not in dtype_baru:
+                dtype_baru[kolom] = dtype
+    for kolom in dtype_baru:
+        for df in delta.values():
+            if kolom in df.columns:
+                dtype_baru[kolom] = get_dtype_gabungan(dtype_baru[kolom], df[kolom])
+
+    def ubah_tabel(df):
+        return df.assign(**{kolom: ubah_kategori(df[kolom], dtype_baru[kolom])
+                            for kolom in df.columns if kolom in dtype_baru})
+
+    tabel_baru = {}
+    for nama, df_lama in tabel.items():
+        df_delta = ubah_tabel(delta[nama])
+        kolom_urut = KOLOM_URUT.get(nama)
+        if kolom_urut is not None:
+            df_delta = df_delta.sort_values(by=kolom_urut, kind='stable', na_position='last').reset_index(drop=True)
+        delta[nama] = df_delta
+
+        if df_delta.empty:
+            tabel_baru[nama] = ubah_tabel(df_lama)
+            continue
+
+        df_gabungan = concat_tabel(ubah_tabel(df_lama), df_delta)
+        # Delta biasanya berisi waktu setelah data lama sehingga tidak perlu diurutkan ulang
+        if kolom_urut is not None and len(df_lama) and not (df_delta[kolom_urut].min() >= df_lama[kolom_urut].max()):
+            df_gabungan = df_gabungan.sort_values(by=kolom_urut, kind='stable',
+                                                  na_position='last').reset_index(drop=True)
+        tabel_baru[nama] = df_gabungan
+
+    return tabel_baru, delta
+
+def get_ukuran_tambahan(tabel_lama: dict, delta: dict) -> int:
+
+    """
+    Fungsi ini memperkirakan tambahan ukuran memori (bytes, seperti analisis.cache.get_ukuran_objek) tabel atau
+    kubus setelah delta ditambahkan, tanpa mengukur ulang seluruh tabel: isi baris delta, dengan kolom category
+    dihitung dari kodenya ditambah nilai kamus yang baru
+
+    Parameters:
+        tabel_lama (dict): Dictionary tabel atau kubus sebelum delta ditambahkan
+        delta (dict): Dictionary Data Frame delta yang sudah dikodekan dengan kamus baru
+
+    Returns:
+        ukuran (int): Perkiraan tambahan ukuran memori dalam bytes
+    """
+
+    ukuran = 0
+    for nama, df in delta.items():
+        for kolom in df.columns:
+            nilai = df[kolom]
+            if isinstance(nilai.dtype, pd.CategoricalDtype):
+                n_lama = len(tabel_lama[nama][kolom].cat.categories)
+                ukuran += nilai.array.codes.nbytes + int(nilai.cat.categories[n_lama:].memory_usage(deep=True))
+            else:
+                ukuran += int(nilai.memory_usage(index=False, deep=True))
+
+    return ukuran
+
+## Memperbarui hasil pipeline
+def ubah_kategori_frame(df, kumpulan_dtype: dict):
+
+    """
+    Fungsi ini mengubah kolom dan index category Data Frame (atau Series) hasil lama ke kamus baru di kumpulan_dtype.
+    Hanya kolom yang kamusnya bertambah yang diubah dengan kode lama (analisis.loader.ubah_kategori), dan Data Frame
+    hanya disalin dangkal sehingga kolom lain tidak ikut disalin.
+    """
+
+    ubah_index = (isinstance(df.index, pd.CategoricalIndex) and df.index.name in kumpulan_dtype
+                  and df.index.dtype != kumpulan_dtype[df.index.name])
+    daftar_kolom = [kolom for kolom in getattr(df, 'columns', [])
+                    if kolom in kumpulan_dtype and df[kolom].dtype != kumpulan_dtype[kolom]]
+    if not ubah_index and not daftar_kolom:
+        return df
+
+    df = df.copy(deep=False)
+    if ubah_index:
+        df.index = ubah_kategori(df.index, kumpulan_dtype[df.index.name])
+    for kolom in daftar_kolom:
+        df[kolom] = ubah_kategori(df[kolom], kumpulan_dtype[kolom])
+
+    return df
+
+def gabung_pivot_seller(pivot_lama: pd.DataFrame, pivot_delta: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menggabungkan pivot_seller lama dengan pivot_seller dari baris delta: sum dan count
+    dijumlahkan, mean dihitung ulang dari keduanya, max dan min digabung. Hanya seller di delta yang dihitung ulang
+    dan disisipkan kembali ke urutan lama (analisis.loader.sisip_urut).
+
+    Parameters:
+        pivot_lama (pandas DataFrame): pivot_seller dari data lama (kamus sudah disamakan)
+        pivot_delta (pandas DataFrame): pivot_seller dari baris delta
+
+    Returns:
+        tuple(pivot_seller, pivot_berubah):
+        pivot_seller gabungan (urut menurun berdasarkan price_sum) dan baris seller yang berubah atau baru
+    """
+
+    if pivot_delta.empty:
+        return pivot_lama, pivot_delta
+
+    posisi = pivot_lama.index.get_indexer(pivot_delta.index)
+    ada = posisi >= 0
+    lama_ada = pivot_lama.iloc[posisi[ada]]
+    delta_ada = pivot_delta[ada]
+
+    gabungan = {}
+    for nilai in ['price', 'freight_value']:
+        total = lama_ada[f'{nilai}_sum'].to_numpy() + delta_ada[f'{nilai}_sum'].to_numpy()
+        jumlah = lama_ada[f'{nilai}_count'].to_numpy() + delta_ada[f'{nilai}_count'].to_numpy()
+        gabungan[f'{nilai}_sum'] = total
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gabungan[f'{nilai}_mean'] = total / jumlah
+        gabungan[f'{nilai}_max'] = np.fmax(lama_ada[f'{nilai}_max'].to_numpy(), delta_ada[f'{nilai}_max'].to_numpy())
+        gabungan[f'{nilai}_min'] = np.fmin(lama_ada[f'{nilai}_min'].to_numpy(), delta_ada[f'{nilai}_min'].to_numpy())
+        gabungan[f'{nilai}_count'] = jumlah
+    gabungan = pd.DataFrame(gabungan, index=delta_ada.index)[pivot_lama.columns]
+    pivot_berubah = pd.concat([gabungan, pivot_delta[~ada]])
+
+    tetap = np.ones(len(pivot_lama), dtype=bool)
+    tetap[posisi[ada]] = False
+
+    return sisip_urut(pivot_lama[tetap], pivot_berubah, 'price_sum'), pivot_berubah
+
+def append_hasil_pipeline(hasil: dict, tabel_baru: dict, delta: dict, start_date, end_date) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk memperbarui hasil analisis.pipeline.create_hasil_pipeline rentang waktu
+    [start_date, end_date] dengan baris delta, tanpa menghitung ulang atau mengurutkan ulang baris lama:
+        - pivot_seller dan df_sellers_merged: hanya seller di delta yang digabung (gabung_pivot_seller) lalu
+          disisipkan kembali dengan binary search (analisis.loader.sisip_urut)
+        - pivot_order dan df_customer_merged: baris order delta disisipkan (order delta selalu baru)
+        - kategori_di_kota_jual dan kategori_di_kota_beli: jumlah barang delta ditambahkan
+        - df_customer_klaster: ringkasan klaster order delta digabung dengan ringkasan lama
+        - df_sellers_klaster: dihitung ulang dari df_sellers_merged (satu baris per seller, tanpa baris barang)
+
+    Parameters:
+        hasil (dict): Hasil create_hasil_pipeline dari data lama
+        tabel_baru (dict): Tabel setelah delta diterapkan (hasil append_tabel)
+        delta (dict): Delta yang sudah dikodekan (hasil append_tabel)
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+
+    Returns:
+        hasil (dict): Dictionary dengan key yang sama seperti create_hasil_pipeline
+    """
+
+    kumpulan_dtype = {kolom: dtype for df in tabel_baru.values() for kolom, dtype in df.dtypes.items()
+                      if isinstance(dtype, pd.CategoricalDtype)}
+    hasil = {nama: ubah_kategori_frame(df, kumpulan_dtype) for nama, df in hasil.items()}
+
+    df_order_delta = filter_rentang_waktu(delta['df_order'], 'order_purchase_timestamp', start_date, end_date)
+    df_order_items_delta = filter_rentang_waktu(delta['df_order_items'], 'shipping_limit_date', start_date, end_date)
+    kelompok_order = create_kelompok_order(df_order_delta)
+
+    # Sisi seller
+    pivot_seller, pivot_berubah = gabung_pivot_seller(hasil['pivot_seller'],
+                                                      create_pivot_seller(df_order_items_delta,
+                                                                          tabel_baru['df_product'], kelompok_order))
+    df_sellers_merged = hasil['df_sellers_merged'].drop(columns='Klaster', errors='ignore')
+    df_sellers_merged = sisip_urut(df_sellers_merged[~df_sellers_merged['seller_id'].isin(pivot_berubah.index)],
+                                   create_df_sellers_merged(pivot_berubah, tabel_baru['df_sellers']), 'price_sum',
+                                   ignore_index=True)
+    kategori_seller = create_kategori_per_id(df_order_items_delta, tabel_baru['df_product'], kelompok_order,
+                                             'seller_id', 'seller')
+    kategori_di_kota_jual = hasil['kategori_di_kota_jual'].add(
+                                create_kategori_di_kota(kategori_seller, df_sellers_merged, 'seller_id', 'seller_city'),
+                                fill_value=0).astype(hasil['kategori_di_kota_jual'].dtype)
+    df_sellers_klaster = create_klaster_sellers(df_sellers_merged)
+
+    # Sisi customer
+    pivot_order_delta = create_pivot_order(df_order_items_delta, tabel_baru['df_product'],
+                                           delta['df_order_payments'], kelompok_order)
+    pivot_order = sisip_urut(hasil['pivot_order'], pivot_order_delta, 'payment_value_sum')
+    df_customer_merged_delta = create_df_customer_merged(pivot_order_delta, df_order_delta, tabel_baru['df_customer'])
+    df_customer_klaster = gabung_ringkasan_segmen(hasil['df_customer_klaster'],
+                                                  create_klaster_customer(df_customer_merged_delta),
+                                                  'customer_id_count', 'payment_value_sum')
+    df_customer_merged = sisip_urut(hasil['df_customer_merged'], df_customer_merged_delta, 'payment_value_sum',
+                                    ignore_index=True)
+    kategori_order = create_kategori_per_id(df_order_items_delta, tabel_baru['df_product'], kelompok_order,
+                                            'order_id', 'customer')
+    kategori_di_kota_beli = hasil['kategori_di_kota_beli'].add(
+                                create_kategori_di_kota(kategori_order, df_customer_merged_delta, 'order_id',
+                                                        'customer_city'),
+                                fill_value=0).astype(hasil['kategori_di_kota_beli'].dtype)
+
+    return {'pivot_seller': pivot_seller,
+            'pivot_order': pivot_order,
+            'df_sellers_merged': df_sellers_merged,
+            'df_customer_merged': df_customer_merged,
+            'kategori_di_kota_jual': kategori_di_kota_jual,
+            'kategori_di_kota_beli': kategori_di_kota_beli,
+            'df_customer_klaster': df_customer_klaster,
+            'df_sellers_klaster': df_sellers_klaster}
+
+def main():
+    parser = argparse.ArgumentParser(description='Menambahkan order baru sebagai delta tanpa menulis ulang file CSV')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Folder data (default: %(default)s)')
+    parser.add_argument('--order', required=True, help='File CSV order baru (kolom sama dengan df_order_clean.csv)')
+    parser.add_argument('--items', required=True, help='File CSV barang order baru')
+    parser.add_argument('--payments', required=True, help='File CSV payment order baru')
+    parser.add_argument('--customer', help='File CSV customer baru')
+    parser.add_argument('--sellers', help='File CSV seller baru')
+    parser.add_argument('--product', help='File CSV produk baru')
+    args = parser.parse_args()
+
+    daftar_file = {'df_order': args.order, 'df_order_items': args.items, 'df_order_payments': args.payments,
+                   'df_customer': args.customer, 'df_sellers': args.sellers, 'df_product': args.product}
+    delta = {nama: read_csv_skema(path, DATA_FILES[nama][1]) for nama, path in daftar_file.items() if path}
+
+    dir_delta = write_delta(delta, args.data_dir)
+    print(f'Delta {dir_delta}: ' + ', '.join(f'{nama} {len(df)} baris' for nama, df in delta.items()))
+
+if __name__ == '__main__':
+    main()
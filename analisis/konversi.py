@@ -0,0 +1,150 @@
+"""
+Perintah untuk mengonversi file CSV hasil data cleaning ke format Parquet atau ke folder memory-map.
+File Parquet menyimpan dtype category, datetime dan kamus kolom ID sehingga dashboard
+tidak perlu mem-parsing teks CSV setiap kali dijalankan. Folder memory-map (data/memmap) menyimpan setiap kolom
+sebagai file .npy yang dapat dipetakan read-only oleh beberapa proses Streamlit sekaligus, sehingga
+page cache sistem operasi dipakai bersama dan proses baru tidak perlu membaca ulang seluruh tabel.
+
+Penggunaan:
+    python -m analisis.konversi [--data-dir data] [--format parquet|memmap]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis.loader import (DATA_DIR, DATA_FILES, DIR_MEMMAP, KOLOM_ID, encode_kolom_id, get_path_csv,
+                             get_path_manifest_memmap, get_path_parquet, read_csv_skema, sort_tabel)
+
+def konversi_csv_ke_parquet(data_dir: str = DATA_DIR) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membaca seluruh file CSV di DATA_FILES sesuai skema, mengodekan kolom ID,
+    mengurutkan tabel berdasarkan waktu, lalu menyimpan setiap tabel ke file Parquet di folder yang sama
+
+    Parameters:
+        data_dir (str): Folder data
+
+    Returns:
+        hasil (dict): Dictionary berisi nama tabel dan lokasi file Parquet-nya
+    """
+
+    tabel = {nama: read_csv_skema(get_path_csv(nama, data_dir), kolom_tanggal)
+             for nama, (file_csv, kolom_tanggal) in DATA_FILES.items()}
+    tabel = sort_tabel(encode_kolom_id(tabel))
+
+    hasil = {}
+    for nama, df in tabel.items():
+        path = get_path_parquet(nama, data_dir)
+        # Ditulis ke file sementara lalu diganti sekaligus agar dashboard tidak membaca file setengah jadi
+        path_sementara = path + '.tmp'
+        df.to_parquet(path_sementara, index=False)
+        os.replace(path_sementara, path)
+        hasil[nama] = path
+
+    return hasil
+
+def konversi_csv_ke_memmap(data_dir: str = DATA_DIR) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membaca seluruh file CSV di DATA_FILES sesuai skema, mengodekan kolom ID,
+    mengurutkan tabel berdasarkan waktu, lalu menyimpan setiap kolom ke file .npy di folder data_dir/memmap:
+
+        <tabel>/<kolom>.npy       kolom angka dan datetime
+        <tabel>/<kolom>.kode.npy  kode kolom category dan kolom teks
+        kamus/<kunci>.npy         kamus category, satu file untuk setiap kolom ID yang dipakai seluruh tabel
+        manifest.json             daftar tabel dan kolom beserta jenisnya
+
+    Folder ditulis ke folder sementara lalu diganti sekaligus. Proses yang masih memetakan file lama tetap
+    dapat membacanya sampai memuat ulang data.
+
+    Parameters:
+        data_dir (str): Folder data
+
+    Returns:
+        hasil (dict): Dictionary berisi nama tabel dan lokasi foldernya
+    """
+
+    tabel = {nama: read_csv_skema(get_path_csv(nama, data_dir), kolom_tanggal)
+             for nama, (file_csv, kolom_tanggal) in DATA_FILES.items()}
+    tabel = sort_tabel(encode_kolom_id(tabel))
+
+    dir_memmap = os.path.join(data_dir, DIR_MEMMAP)
+    dir_sementara = dir_memmap + '.tmp'
+    shutil.rmtree(dir_sementara, ignore_errors=True)
+    os.makedirs(os.path.join(dir_sementara, 'kamus'))
+
+    def simpan_kamus(kunci, kategori):
+        path = os.path.join(dir_sementara, 'kamus', f'{kunci}.npy')
+        if not os.path.exists(path):
+            nilai = kategori.to_numpy()
+            np.save(path, nilai.astype(str) if nilai.dtype == object else nilai)
+        return kunci
+
+    manifest = {'tabel': {}}
+    hasil = {}
+    for nama, df in tabel.items():
+        os.makedirs(os.path.join(dir_sementara, nama))
+        daftar_kolom = []
+        for kolom in df.columns:
+            nilai = df[kolom]
+            if isinstance(nilai.dtype, pd.CategoricalDtype) or nilai.dtype == object:
+                jenis = 'kategori' if isinstance(nilai.dtype, pd.CategoricalDtype) else 'teks'
+                nilai = nilai.astype('category')
+                # Kolom ID memakai satu kamus untuk seluruh tabel (sama seperti encode_kolom_id)
+                kamus = simpan_kamus(kolom if kolom in KOLOM_ID else f'{nama}.{kolom}', nilai.cat.categories)
+                np.save(os.path.join(dir_sementara, nama, f'{kolom}.kode.npy'), nilai.array.codes)
+                daftar_kolom.append({'nama': kolom, 'jenis': jenis, 'kamus': kamus})
+            else:
+                np.save(os.path.join(dir_sementara, nama, f'{kolom}.npy'), nilai.to_numpy())
+                daftar_kolom.append({'nama': kolom, 'jenis': 'nilai'})
+        manifest['tabel'][nama] = {'baris': len(df), 'kolom': daftar_kolom}
+        hasil[nama] = os.path.join(dir_memmap, nama)
+
+    # Manifest ditulis terakhir karena waktu modifikasinya menjadi versi data
+    with open(os.path.join(dir_sementara, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    dir_lama = dir_memmap + '.lama'
+    shutil.rmtree(dir_lama, ignore_errors=True)
+    if os.path.exists(dir_memmap):
+        os.replace(dir_memmap, dir_lama)
+    os.replace(dir_sementara, dir_memmap)
+    shutil.rmtree(dir_lama, ignore_errors=True)
+
+    return hasil
+
+def get_ukuran_folder(path: str) -> int:
+
+    """
+    Fungsi ini mengembalikan total ukuran (bytes) seluruh file di dalam folder path
+    """
+
+    return sum(os.path.getsize(os.path.join(akar, file)) for akar, _, daftar_file in os.walk(path)
+               for file in daftar_file)
+
+def main():
+    parser = argparse.ArgumentParser(description='Konversi file *_clean.csv ke Parquet atau memory-map')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Folder data (default: %(default)s)')
+    parser.add_argument('--format', choices=['parquet', 'memmap'], default='parquet',
+                        help='Format tujuan (default: %(default)s)')
+    args = parser.parse_args()
+
+    waktu_mulai = time.perf_counter()
+    if args.format == 'memmap':
+        hasil = konversi_csv_ke_memmap(args.data_dir)
+        print(f'Manifest: {get_path_manifest_memmap(args.data_dir)}')
+    else:
+        hasil = konversi_csv_ke_parquet(args.data_dir)
+    for nama, path in hasil.items():
+        ukuran = get_ukuran_folder(path) if os.path.isdir(path) else os.path.getsize(path)
+        print(f'{nama}: {path} ({ukuran / 1e6:.2f} MB)')
+    print(f'Selesai dalam {time.perf_counter() - waktu_mulai:.2f} detik')
+
+if __name__ == '__main__':
+    main()
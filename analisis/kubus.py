@@ -0,0 +1,332 @@
+"""
+Modul ini berisi kubus agregat harian untuk menjawab grafik Pertanyaan 1-4 pada rentang waktu apa pun.
+
+Filter dashboard memakai dua kolom waktu (order_purchase_timestamp dan shipping_limit_date) dengan batas
+pukul 00:00:00 di kedua ujung. Karena itu setiap baris kubus diberi kunci dua hari:
+
+    hari_awal  = hari (dibulatkan ke bawah) paling awal dari kedua waktu
+    hari_akhir = hari (dibulatkan ke atas) paling akhir dari kedua waktu
+
+Sebuah baris termasuk rentang [start_date, end_date] jika start_date <= hari_awal dan hari_akhir <= end_date,
+sehingga hasil query sama persis dengan filter baris mentah.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analisis.loader import concat_tabel
+from analisis.paralel import jalankan_paralel
+from analisis.pipeline import KELOMPOK_STATUS, create_kelompok_order, create_mask_kelompok
+from analisis.profil import tahap
+
+## Konversi waktu ke nomor hari
+def get_nomor_hari(tanggal) -> int:
+
+    """
+    Fungsi ini mengembalikan nomor hari (jumlah hari sejak 1970-01-01) dari sebuah tanggal
+    """
+
+    return int(np.datetime64(pd.Timestamp(tanggal), 'D').astype(np.int64))
+
+def get_hari_bawah_atas(waktu: pd.Series) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan nomor hari yang dibulatkan ke bawah dan ke atas untuk setiap waktu
+
+    Parameters:
+        waktu (pandas Series): Series datetime
+
+    Returns:
+        tuple(hari_bawah, hari_atas): numpy ndarray int64, waktu tepat pukul 00:00:00 memiliki hari_bawah == hari_atas
+    """
+
+    nilai = waktu.to_numpy(dtype='datetime64[ns]')
+    hari = nilai.astype('datetime64[D]')
+    hari_bawah = hari.astype(np.int64)
+    hari_atas = hari_bawah + (nilai != hari.astype('datetime64[ns]'))
+
+    return hari_bawah, hari_atas
+
+## Membuat kubus
+def create_kubus_seller(df_barang: pd.DataFrame, df_sellers: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat kubus seller: jumlah price, freight_value dan barang
+    per (hari_awal, hari_akhir, seller, kategori barang)
+
+    Parameters:
+        df_barang (pandas DataFrame): barang kelompok seller dengan kolom hari_awal, hari_akhir, seller_id,
+                                      product_category_name, price dan freight_value
+        df_sellers (pandas DataFrame): Data Frame df_sellers
+
+    Returns:
+        kubus_seller (pandas DataFrame): kubus seller yang urut berdasarkan hari_awal
+    """
+
+    df_temp = pd.merge(df_barang, df_sellers[['seller_id', 'seller_city', 'seller_state']], on='seller_id', how='inner')
+
+    # Kategori kosong tetap dihitung di price_sum, seperti pada pivot_seller
+    kubus_seller = df_temp.groupby(by=['hari_awal', 'hari_akhir', 'seller_id', 'seller_city', 'seller_state',
+                                       'product_category_name'], observed=True, dropna=False).agg(
+                                                        price_sum=('price', 'sum'),
+                                                        freight_value_sum=('freight_value', 'sum'),
+                                                        jumlah_barang=('price', 'size')).reset_index()
+
+    return kubus_seller.sort_values(by='hari_awal', kind='stable').reset_index(drop=True)
+
+def create_kubus_order(df_barang: pd.DataFrame,
+                       df_order_payments: pd.DataFrame,
+                       df_order: pd.DataFrame,
+                       df_customer: pd.DataFrame,
+                       kelompok_order: pd.Series) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat kubus order: payment_value per (hari_awal, hari_akhir, customer).
+
+    Sebuah order masuk ke df_customer_merged jika minimal satu barangnya ada di rentang waktu. Agar tetap tepat,
+    setiap order disimpan sebagai interval-interval barang yang tidak saling memuat (diurutkan naik), lalu
+    pasangan interval berurutan ditambahkan dengan bobot -1. Jumlah bobot baris yang masuk rentang waktu
+    selalu 1 jika minimal satu interval masuk dan 0 jika tidak ada.
+
+    Parameters:
+        df_barang (pandas DataFrame): barang kelompok customer dengan kolom order_id, hari_awal dan hari_akhir
+        df_order_payments (pandas DataFrame): Data Frame df_order_payments
+        df_order (pandas DataFrame): Data Frame df_order
+        df_customer (pandas DataFrame): Data Frame df_customer
+        kelompok_order (pandas Series): hasil create_kelompok_order
+
+    Returns:
+        kubus_order (pandas DataFrame): kubus order yang urut berdasarkan hari_awal
+    """
+
+    df_payment = df_order_payments[create_mask_kelompok(df_order_payments, kelompok_order, 'customer')]
+    payment_per_order = df_payment.groupby(by='order_id', observed=True)['payment_value'].sum().rename('payment_value_sum')
+
+    # Interval yang memuat interval lain pada order yang sama tidak mengubah hasil, sehingga dibuang
+    interval = df_barang[['order_id', 'hari_awal', 'hari_akhir']].drop_duplicates()
+    interval = interval.sort_values(by=['order_id', 'hari_awal', 'hari_akhir'],
+                                    ascending=[True, False, True], kind='stable')
+    min_akhir = interval.groupby(by='order_id', observed=True)['hari_akhir'].cummin()
+    min_akhir_sebelumnya = min_akhir.groupby(interval['order_id'], observed=True).shift(
+                                fill_value=np.iinfo(np.int64).max)
+    interval = interval[interval['hari_akhir'] < min_akhir_sebelumnya]
+    interval = interval.sort_values(by=['order_id', 'hari_awal'], kind='stable')
+    interval['bobot'] = 1
+
+    # Pasangan interval berurutan (hari_awal interval ke-i, hari_akhir interval ke-i+1) dengan bobot -1
+    order_berikutnya = interval['order_id'].shift(-1)
+    pasangan = interval[interval['order_id'] == order_berikutnya].copy()
+    pasangan['hari_akhir'] = interval['hari_akhir'].shift(-1)[interval['order_id'] == order_berikutnya].astype(np.int64)
+    pasangan['bobot'] = -1
+
+    interval = pd.concat([interval, pasangan])
+
+    df_temp = pd.merge(interval, payment_per_order, on='order_id', how='inner')
+    df_temp = pd.merge(df_temp, df_order[['order_id', 'customer_id']], on='order_id', how='inner')
+    df_temp = pd.merge(df_temp, df_customer[['customer_id', 'customer_city', 'customer_state']],
+                       on='customer_id', how='inner')
+    df_temp['payment_value_sum'] = df_temp['payment_value_sum'] * df_temp['bobot']
+
+    kubus_order = df_temp[['hari_awal', 'hari_akhir', 'order_id', 'customer_id', 'customer_city', 'customer_state',
+                           'bobot', 'payment_value_sum']]
+
+    return kubus_order.sort_values(by='hari_awal', kind='stable').reset_index(drop=True)
+
+def create_kubus_kategori_customer(df_barang: pd.DataFrame,
+                                   kubus_order: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat kubus kategori customer: jumlah barang yang dibeli dan jumlah price-nya
+    per (hari_awal, hari_akhir, kota customer, kategori barang)
+
+    Parameters:
+        df_barang (pandas DataFrame): barang kelompok customer dengan kolom order_id, hari_awal, hari_akhir,
+                                      product_category_name dan price
+        kubus_order (pandas DataFrame): hasil create_kubus_order, dipakai untuk kota customer setiap order
+
+    Returns:
+        kubus_kategori_customer (pandas DataFrame): kubus kategori customer yang urut berdasarkan hari_awal
+    """
+
+    kota_order = kubus_order[['order_id', 'customer_city']].drop_duplicates(subset='order_id')
+    df_temp = pd.merge(df_barang, kota_order, on='order_id', how='inner')
+
+    kubus_kategori_customer = df_temp.groupby(by=['hari_awal', 'hari_akhir', 'customer_city', 'product_category_name'],
+                                              observed=True).agg(jumlah_barang=('price', 'size'),
+                                                                 price_sum=('price', 'sum')).reset_index()
+
+    return kubus_kategori_customer.sort_values(by='hari_awal', kind='stable').reset_index(drop=True)
+
+def create_kubus(df_order: pd.DataFrame,
+                 df_order_items: pd.DataFrame,
+                 df_order_payments: pd.DataFrame,
+                 df_product: pd.DataFrame,
+                 df_sellers: pd.DataFrame,
+                 df_customer: pd.DataFrame,
+                 kelompok_status: dict = KELOMPOK_STATUS) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat seluruh kubus agregat harian dari tabel-tabel dasar.
+    Fungsi yang sama dipakai untuk data tambahan (misalnya satu hari order baru) sebelum digabung dengan append_kubus.
+
+    Parameters:
+        df_order (pandas DataFrame): Data Frame df_order
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_order_payments (pandas DataFrame): Data Frame df_order_payments
+        df_product (pandas DataFrame): Data Frame df_product
+        df_sellers (pandas DataFrame): Data Frame df_sellers
+        df_customer (pandas DataFrame): Data Frame df_customer
+        kelompok_status (dict): Dictionary kelompok order_status
+
+    Returns:
+        kubus (dict): Dictionary berisi kubus 'seller', 'order' dan 'kategori_customer'
+    """
+
+    kelompok_order = create_kelompok_order(df_order, kelompok_status)
+
+    # Satu baris per barang beserta interval harinya (waktu pembelian order dan batas pengiriman barang)
+    df_barang = pd.merge(df_order_items[['order_id', 'seller_id', 'product_id', 'shipping_limit_date',
+                                         'price', 'freight_value']],
+                         df_product, on='product_id', how='inner')
+    df_barang = pd.merge(df_barang, df_order[['order_id', 'order_purchase_timestamp']], on='order_id', how='inner')
+    df_barang = df_barang[df_barang['order_purchase_timestamp'].notna() & df_barang['shipping_limit_date'].notna()]
+
+    beli_bawah, beli_atas = get_hari_bawah_atas(df_barang['order_purchase_timestamp'])
+    kirim_bawah, kirim_atas = get_hari_bawah_atas(df_barang['shipping_limit_date'])
+    df_barang = df_barang.assign(hari_awal=np.minimum(beli_bawah, kirim_bawah),
+                                 hari_akhir=np.maximum(beli_atas, kirim_atas))
+
+    df_barang_seller = df_barang[create_mask_kelompok(df_barang, kelompok_order, 'seller')]
+    df_barang_customer = df_barang[create_mask_kelompok(df_barang, kelompok_order, 'customer')]
+
+    with tahap('kubus.create_kubus_order') as catatan:
+        kubus_order = create_kubus_order(df_barang_customer, df_order_payments, df_order, df_customer, kelompok_order)
+        catatan['baris'] = len(kubus_order)
+
+    with tahap('kubus.create_kubus_seller') as catatan:
+        kubus_seller = create_kubus_seller(df_barang_seller, df_sellers)
+        catatan['baris'] = len(kubus_seller)
+
+    with tahap('kubus.create_kubus_kategori_customer') as catatan:
+        kubus_kategori_customer = create_kubus_kategori_customer(df_barang_customer, kubus_order)
+        catatan['baris'] = len(kubus_kategori_customer)
+
+    return {'seller': kubus_seller,
+            'order': kubus_order,
+            'kategori_customer': kubus_kategori_customer}
+
+def append_kubus(kubus: dict, kubus_baru: dict) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menambahkan kubus dari data baru (hasil create_kubus pada order-order baru)
+    ke kubus yang sudah ada tanpa membangun ulang seluruh kubus. Data baru harus berisi order yang belum ada
+    di kubus lama; baris dengan kunci yang sama cukup dijumlahkan saat query.
+
+    Parameters:
+        kubus (dict): Kubus lama
+        kubus_baru (dict): Kubus dari data baru
+
+    Returns:
+        kubus (dict): Kubus gabungan yang tetap urut berdasarkan hari_awal
+    """
+
+    hasil = {}
+    for nama, df_lama in kubus.items():
+        df_baru = kubus_baru[nama]
+        df_gabungan = concat_tabel(df_lama, df_baru)
+
+        # Data baru biasanya berada setelah data lama sehingga tidak perlu diurutkan ulang
+        if len(df_lama) and len(df_baru) and df_baru['hari_awal'].min() < df_lama['hari_awal'].iloc[-1]:
+            df_gabungan = df_gabungan.sort_values(by='hari_awal', kind='stable').reset_index(drop=True)
+
+        hasil[nama] = df_gabungan
+
+    return hasil
+
+## Query kubus
+def slice_kubus(df_kubus: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk memilih baris kubus yang masuk rentang waktu [start_date, end_date].
+    Batas bawah dicari dengan binary search pada hari_awal, batas atas dengan mask pada hari_akhir.
+
+    Parameters:
+        df_kubus (pandas DataFrame): Salah satu kubus yang urut berdasarkan hari_awal
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+
+    Returns:
+        df_kubus (pandas DataFrame): Baris kubus di dalam rentang waktu
+    """
+
+    hari_mulai = get_nomor_hari(start_date)
+    hari_selesai = get_nomor_hari(end_date)
+
+    awal = df_kubus['hari_awal'].searchsorted(hari_mulai, side='left')
+    df_kubus = df_kubus.iloc[awal:]
+
+    return df_kubus[df_kubus['hari_akhir'].to_numpy() <= hari_selesai]
+
+def get_total_seller(kubus_seller: pd.DataFrame, kolom: str) -> pd.Series:
+
+    """
+    Fungsi ini mengembalikan jumlah price_sum per kolom (seller_state, seller_city atau seller_id) dari kubus seller
+    """
+
+    return kubus_seller.groupby(by=kolom, observed=True)['price_sum'].sum()
+
+def get_total_customer(kubus_order: pd.DataFrame, kolom: str) -> pd.Series:
+
+    """
+    Fungsi ini mengembalikan jumlah payment_value_sum per kolom (customer_state, customer_city atau customer_id)
+    dari kubus order
+    """
+
+    total = kubus_order.groupby(by=kolom, observed=True)[['bobot', 'payment_value_sum']].sum()
+
+    # Customer yang seluruh barisnya saling meniadakan (jumlah bobot 0) tidak termasuk rentang waktu
+    return total.loc[total['bobot'] > 0, 'payment_value_sum']
+
+def get_kategori_di_kota(df_kubus: pd.DataFrame, kolom_kota: str) -> pd.Series:
+
+    """
+    Fungsi ini mengembalikan jumlah barang (bernama 'count') dengan index (kota, product_category_name) dari kubus
+    """
+
+    return df_kubus.groupby(by=[kolom_kota, 'product_category_name'],
+                            observed=True)['jumlah_barang'].sum().rename('count')
+
+def query_ringkasan_kubus(kubus: dict, start_date, end_date, n_worker: int = None, cek_batal=None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan total per state, kota dan id (seller maupun customer) serta
+    jumlah kategori barang per kota pada rentang waktu [start_date, end_date] dari kubus.
+    Setiap groupby tidak saling bergantung sehingga dijalankan di worker pool jika n_worker lebih dari 1.
+
+    Parameters:
+        kubus (dict): Hasil create_kubus atau append_kubus
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+        n_worker (int): Jumlah worker, None berarti analisis.paralel.N_WORKER
+        cek_batal (callable): Pemeriksaan pembatalan sebelum setiap groupby, None berarti tanpa pembatalan
+
+    Returns:
+        ringkasan (dict): Dictionary berisi Series total dengan nama dimensi sebagai key, serta
+                          'kategori_di_kota_jual' dan 'kategori_di_kota_beli' (jumlah barang bernama 'count')
+                          dengan index (kota, kategori)
+    """
+
+    kubus_seller = slice_kubus(kubus['seller'], start_date, end_date)
+    kubus_order = slice_kubus(kubus['order'], start_date, end_date)
+    kubus_kategori_customer = slice_kubus(kubus['kategori_customer'], start_date, end_date)
+
+    tugas = {}
+    for kolom in ['seller_state', 'seller_city', 'seller_id']:
+        tugas[kolom] = (get_total_seller, kubus_seller, kolom)
+    for kolom in ['customer_state', 'customer_city', 'customer_id']:
+        tugas[kolom] = (get_total_customer, kubus_order, kolom)
+
+    tugas['kategori_di_kota_jual'] = (get_kategori_di_kota, kubus_seller, 'seller_city')
+    tugas['kategori_di_kota_beli'] = (get_kategori_di_kota, kubus_kategori_customer, 'customer_city')
+
+    return jalankan_paralel(tugas, n_worker, cek_batal)
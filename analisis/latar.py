@@ -0,0 +1,185 @@
+"""
+Modul ini berisi penghitung latar belakang untuk pola stale-while-revalidate di dashboard: ketika rentang waktu
+berubah, hasil rentang sebelumnya tetap ditampilkan (ditandai usang) sementara worker thread mengisi cache engine
+untuk rentang baru. Setiap pemilik (sesi) hanya memiliki satu tugas aktif; permintaan baru membatalkan tugas
+sebelumnya, sehingga menggeser slider berkali-kali tidak menumpuk perhitungan yang tidak dipakai.
+
+Pembatalan bersifat kooperatif: tugas yang masih antre dibatalkan langsung, sedangkan tugas yang sedang berjalan
+berhenti di pemeriksaan berikutnya. Tugas.cek_batal diteruskan sebagai cek_batal ke metode run_* engine dan dipanggil
+di antara tahap pipeline, kueri kubus per dimensi dan indeks gap (lihat analisis.paralel.periksa_batal). Tahap yang
+sedang berjalan tetap diselesaikan; hasil tahap yang sudah lengkap tersimpan di cache engine, sehingga dapat dipakai
+jika rentang tersebut diminta lagi.
+"""
+
+import os
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+# Jumlah worker latar belakang yang dipakai bersama oleh seluruh sesi
+N_WORKER_LATAR = int(os.environ.get('ANALISIS_N_WORKER_LATAR', 2))
+
+class TugasDibatalkan(Exception):
+
+    """
+    Exception yang dilempar Tugas.cek_batal ketika tugas digantikan oleh permintaan yang lebih baru
+    """
+
+class Tugas:
+
+    """
+    Satu permintaan perhitungan latar belakang beserta penanda pembatalannya
+
+    Parameters:
+        kunci (tuple): Identitas permintaan, misalnya (start_date, end_date, perkiraan, bagian, versi_data)
+    """
+
+    def __init__(self, kunci: tuple):
+        self.kunci = kunci
+        self.future = None
+        self._batal = threading.Event()
+
+    def batalkan(self):
+
+        """
+        Fungsi ini menandai tugas sebagai dibatalkan dan membatalkan future jika belum mulai berjalan
+        """
+
+        self._batal.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def cek_batal(self):
+
+        """
+        Fungsi ini melempar TugasDibatalkan jika tugas sudah dibatalkan, dipanggil di antara tahap perhitungan
+        """
+
+        if self._batal.is_set():
+            raise TugasDibatalkan()
+
+    def dibatalkan(self) -> bool:
+        return self._batal.is_set()
+
+    def selesai(self) -> bool:
+
+        """
+        Fungsi ini mengembalikan True jika tugas sudah selesai (berhasil, gagal atau dibatalkan)
+        """
+
+        return self.future is not None and self.future.done()
+
+    def get_error(self):
+
+        """
+        Fungsi ini mengembalikan exception tugas yang sudah selesai (TugasDibatalkan jika dibatalkan),
+        atau None jika tugas berhasil
+        """
+
+        try:
+            return self.future.exception(timeout=0)
+        except CancelledError:
+            return TugasDibatalkan()
+
+class PenghitungLatar:
+
+    """
+    Worker pool latar belakang dengan satu tugas aktif per pemilik dan penghitung tugas yang dikirim, selesai
+    dan dibatalkan. Objek ini dibagikan antar sesi sehingga akses dilindungi dengan lock.
+
+    Parameters:
+        n_worker (int): Jumlah worker thread, None berarti N_WORKER_LATAR
+    """
+
+    def __init__(self, n_worker: int = None):
+        self.n_worker = N_WORKER_LATAR if n_worker is None else n_worker
+        self.pool = ThreadPoolExecutor(max_workers=self.n_worker, thread_name_prefix='analisis-latar')
+        self.dikirim = 0
+        self.berhasil = 0
+        self.dibatalkan = 0
+        self._tugas = {}
+        # RLock karena future.cancel() dan add_done_callback dapat memanggil _catat di thread yang memegang lock
+        self._lock = threading.RLock()
+
+    def minta(self, pemilik, kunci: tuple, fungsi, *args) -> Tugas:
+
+        """
+        Fungsi ini mengembalikan tugas pemilik untuk kunci. Jika tugas terakhir pemilik memiliki kunci yang sama,
+        tugas tersebut dipakai ulang (sedang berjalan atau sudah selesai); jika tidak, tugas lama dibatalkan dan
+        fungsi(tugas, *args) dikirim ke worker.
+
+        Parameters:
+            pemilik (hashable): Pemilik tugas, misalnya id sesi dashboard
+            kunci (tuple): Identitas permintaan
+            fungsi (callable): Fungsi perhitungan dengan tugas sebagai argumen pertama (untuk tugas.cek_batal)
+            *args: Argumen fungsi berikutnya
+
+        Returns:
+            tugas (Tugas): Tugas untuk kunci tersebut
+        """
+
+        with self._lock:
+            tugas_lama = self._tugas.get(pemilik)
+            if tugas_lama is not None and tugas_lama.kunci == kunci and not tugas_lama.dibatalkan():
+                return tugas_lama
+
+            if tugas_lama is not None and not tugas_lama.selesai():
+                tugas_lama.batalkan()
+
+            tugas = Tugas(kunci)
+            tugas.future = self.pool.submit(self._jalankan, tugas, fungsi, *args)
+            tugas.future.add_done_callback(lambda future: self._catat(tugas))
+            self._tugas[pemilik] = tugas
+            self.dikirim += 1
+
+        return tugas
+
+    def _jalankan(self, tugas: Tugas, fungsi, *args):
+        tugas.cek_batal()
+        return fungsi(tugas, *args)
+
+    def _catat(self, tugas: Tugas):
+        with self._lock:
+            if isinstance(tugas.get_error(), TugasDibatalkan):
+                self.dibatalkan += 1
+            elif tugas.get_error() is None:
+                self.berhasil += 1
+
+    def lepas(self, pemilik):
+
+        """
+        Fungsi ini membatalkan dan melupakan tugas pemilik, misalnya ketika hasilnya sudah ditampilkan
+        """
+
+        with self._lock:
+            tugas = self._tugas.pop(pemilik, None)
+        if tugas is not None and not tugas.selesai():
+            tugas.batalkan()
+
+    def stats(self) -> dict:
+
+        """
+        Fungsi ini mengembalikan jumlah tugas yang dikirim, berhasil, dibatalkan dan masih berjalan atau antre
+        """
+
+        with self._lock:
+            berjalan = sum(not tugas.selesai() for tugas in self._tugas.values())
+            return {'dikirim': self.dikirim, 'berhasil': self.berhasil, 'dibatalkan': self.dibatalkan,
+                    'berjalan': berjalan, 'n_worker': self.n_worker}
+
+## Penghitung latar bersama untuk satu proses
+penghitung_bersama = None
+penghitung_bersama_lock = threading.Lock()
+
+def get_penghitung_latar() -> PenghitungLatar:
+
+    """
+    Fungsi ini mengembalikan satu objek PenghitungLatar yang sama untuk seluruh sesi di proses ini
+    """
+
+    global penghitung_bersama
+
+    with penghitung_bersama_lock:
+        if penghitung_bersama is None:
+            penghitung_bersama = PenghitungLatar()
+
+    return penghitung_bersama
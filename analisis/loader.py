@@ -0,0 +1,467 @@
+"""
+Modul ini berisi skema data dan fungsi-fungsi untuk membaca tabel-tabel hasil data cleaning,
+baik dari file CSV, dari file Parquet, maupun dari folder memory-map hasil konversi (lihat analisis/konversi.py)
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from analisis.profil import tahap
+
+## Skema data
+DATA_DIR = 'data'
+
+# Nama file CSV beserta kolom yang dikonversi ke datetime
+DATA_FILES = {'df_customer': ('df_customer_clean.csv', ()),
+              'df_order': ('df_order_clean.csv', ('order_purchase_timestamp',)),
+              'df_order_items': ('df_order_items_clean.csv', ('shipping_limit_date',)),
+              'df_order_payments': ('df_order_payments_clean.csv', ()),
+              'df_product': ('df_product_clean.csv', ()),
+              'df_sellers': ('df_sellers_clean.csv', ())}
+
+# Kolom berkardinalitas rendah dibaca langsung sebagai category
+SKEMA_KATEGORI = {'seller_city': 'category',
+                  'seller_state': 'category',
+                  'customer_city': 'category',
+                  'customer_state': 'category',
+                  'product_category_name': 'category',
+                  'order_status': 'category',
+                  'payment_type': 'category'}
+
+# Kolom ID (hex 32 karakter) dikodekan sebagai integer dengan kamus yang sama di setiap tabel,
+# sehingga merge antar tabel berjalan di atas kode integer
+KOLOM_ID = ['order_id', 'product_id', 'seller_id', 'customer_id']
+
+# Kolom waktu untuk mengurutkan tabel saat dibaca, sehingga filter rentang waktu cukup memakai binary search
+KOLOM_URUT = {'df_order': 'order_purchase_timestamp',
+              'df_order_items': 'shipping_limit_date'}
+
+# Subfolder data_dir berisi tabel dalam format memory-map (satu file .npy per kolom)
+DIR_MEMMAP = 'memmap'
+
+# Subfolder data_dir berisi data tambahan (order baru) hasil analisis.ingesti, satu folder untuk setiap delta
+DIR_DELTA = 'delta'
+
+## Lokasi file
+def get_path_csv(nama: str, data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini mengembalikan lokasi file CSV untuk tabel nama
+    """
+
+    return os.path.join(data_dir, DATA_FILES[nama][0])
+
+def get_path_parquet(nama: str, data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini mengembalikan lokasi file Parquet untuk tabel nama (nama file CSV dengan ekstensi .parquet)
+    """
+
+    return os.path.splitext(get_path_csv(nama, data_dir))[0] + '.parquet'
+
+def get_path_tabel(nama: str, data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini bertujuan untuk memilih file yang dibaca untuk tabel nama. File Parquet dipilih jika ada
+    dan tidak lebih lama dari file CSV-nya, selain itu file CSV yang dibaca.
+
+    Parameters:
+        nama (str): Nama tabel di DATA_FILES
+        data_dir (str): Folder data
+
+    Returns:
+        path (str): Lokasi file yang dibaca
+    """
+
+    path_csv = get_path_csv(nama, data_dir)
+    path_parquet = get_path_parquet(nama, data_dir)
+
+    if os.path.exists(path_parquet) and (not os.path.exists(path_csv) or
+                                         os.path.getmtime(path_parquet) >= os.path.getmtime(path_csv)):
+        return path_parquet
+
+    return path_csv
+
+def get_path_manifest_memmap(data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini mengembalikan lokasi file manifest folder memory-map
+    """
+
+    return os.path.join(data_dir, DIR_MEMMAP, 'manifest.json')
+
+def cek_memmap(data_dir: str = DATA_DIR) -> bool:
+
+    """
+    Fungsi ini bertujuan untuk memeriksa apakah folder memory-map dapat dibaca, yaitu manifest-nya ada
+    dan tidak lebih lama dari seluruh file CSV (sumber data utama)
+
+    Parameters:
+        data_dir (str): Folder data
+
+    Returns:
+        aktif (bool): True jika tabel dibaca dari folder memory-map
+    """
+
+    path_manifest = get_path_manifest_memmap(data_dir)
+    if not os.path.exists(path_manifest):
+        return False
+
+    waktu_manifest = os.path.getmtime(path_manifest)
+    for nama in DATA_FILES:
+        path_csv = get_path_csv(nama, data_dir)
+        if os.path.exists(path_csv) and os.path.getmtime(path_csv) > waktu_manifest:
+            return False
+
+    return True
+
+def get_daftar_delta(data_dir: str = DATA_DIR) -> tuple:
+
+    """
+    Fungsi ini mengembalikan (path, mtime) file penanda setiap delta yang sudah selesai ditulis di data_dir/delta,
+    urut sesuai nomor delta. Delta yang belum memiliki file penanda (masih ditulis) diabaikan.
+    """
+
+    dir_delta = os.path.join(data_dir, DIR_DELTA)
+    if not os.path.isdir(dir_delta):
+        return ()
+
+    daftar_delta = []
+    for nama in sorted(os.listdir(dir_delta)):
+        path_penanda = os.path.join(dir_delta, nama, 'selesai.json')
+        if nama.isdigit() and os.path.exists(path_penanda):
+            daftar_delta.append((path_penanda, os.path.getmtime(path_penanda)))
+
+    return tuple(daftar_delta)
+
+def get_versi_data(data_dir: str = DATA_DIR, dengan_delta: bool = True) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan versi data, yaitu tuple berisi (path, mtime) setiap file yang dibaca.
+    Versi ini berubah setiap kali salah satu file berubah, file Parquet maupun folder memory-map dibuat,
+    atau delta baru ditambahkan (lihat analisis/ingesti.py).
+
+    Parameters:
+        data_dir (str): Folder data
+        dengan_delta (bool): Ikut memasukkan file penanda setiap delta (lihat get_daftar_delta)
+
+    Returns:
+        versi_data (tuple): Tuple berisi (path, mtime) untuk setiap tabel di DATA_FILES,
+                            atau untuk manifest jika tabel dibaca dari folder memory-map, diikuti setiap delta
+    """
+
+    daftar_delta = get_daftar_delta(data_dir) if dengan_delta else ()
+
+    if cek_memmap(data_dir):
+        path_manifest = get_path_manifest_memmap(data_dir)
+        return ((path_manifest, os.path.getmtime(path_manifest)),) + daftar_delta
+
+    versi_data = []
+    for nama in DATA_FILES:
+        path = get_path_tabel(nama, data_dir)
+        versi_data.append((path, os.path.getmtime(path)))
+
+    return tuple(versi_data) + daftar_delta
+
+## Membaca tabel
+def read_csv_skema(path: str, kolom_tanggal: tuple = (), kolom: list = None) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membaca file CSV dengan dtype category untuk kolom di SKEMA_KATEGORI
+    beserta konversi kolom datetime-nya
+
+    Parameters:
+        path (str): Lokasi file CSV
+        kolom_tanggal (tuple): Kolom-kolom yang dikonversi ke datetime
+        kolom (list): Kolom yang dibaca, None berarti seluruh kolom
+
+    Returns:
+        df (pandas DataFrame): Data Frame hasil pembacaan file CSV
+    """
+
+    df = pd.read_csv(path, dtype=SKEMA_KATEGORI, usecols=kolom)
+    for kolom_waktu in kolom_tanggal:
+        if kolom_waktu in df.columns:
+            df[kolom_waktu] = pd.to_datetime(df[kolom_waktu])
+
+    return df
+
+def read_tabel(nama: str, data_dir: str = DATA_DIR, kolom: list = None) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membaca satu tabel, dari file Parquet jika tersedia atau dari file CSV.
+    File Parquet sudah menyimpan dtype category dan datetime sehingga tidak perlu parsing ulang,
+    dan hanya kolom yang diminta yang dibaca dari disk.
+
+    Parameters:
+        nama (str): Nama tabel di DATA_FILES
+        data_dir (str): Folder data
+        kolom (list): Kolom yang dibaca, None berarti seluruh kolom
+
+    Returns:
+        df (pandas DataFrame): Data Frame tabel nama
+    """
+
+    path = get_path_tabel(nama, data_dir)
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=kolom)
+
+    return read_csv_skema(path, DATA_FILES[nama][1], kolom)
+
+def read_tabel_chunk(nama: str, data_dir: str = DATA_DIR, kolom: list = None, ukuran_chunk: int = 1_000_000):
+
+    """
+    Fungsi ini bertujuan untuk membaca satu tabel per potongan (chunk) tanpa memuat seluruh file ke memori.
+    Kolom ID tidak dikodekan (lihat encode_kolom_id) karena kamusnya baru diketahui setelah seluruh file dibaca.
+
+    Parameters:
+        nama (str): Nama tabel di DATA_FILES
+        data_dir (str): Folder data
+        kolom (list): Kolom yang dibaca, None berarti seluruh kolom
+        ukuran_chunk (int): Jumlah baris maksimum setiap potongan
+
+    Returns:
+        generator berisi Data Frame potongan tabel nama, berurutan sesuai baris di file
+    """
+
+    path = get_path_tabel(nama, data_dir)
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=ukuran_chunk, columns=kolom):
+            yield batch.to_pandas()
+        return
+
+    kolom_tanggal = DATA_FILES[nama][1]
+    for df in pd.read_csv(path, dtype=SKEMA_KATEGORI, usecols=kolom, chunksize=ukuran_chunk):
+        for kolom_waktu in kolom_tanggal:
+            if kolom_waktu in df.columns:
+                df[kolom_waktu] = pd.to_datetime(df[kolom_waktu])
+        yield df
+
+def read_memmap(data_dir: str = DATA_DIR) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membaca seluruh tabel dari folder memory-map tanpa parsing dan tanpa salinan.
+    Kolom angka dan datetime, serta kode kolom category, langsung memakai array np.load(mmap_mode='r'),
+    sehingga beberapa proses yang membaca folder yang sama berbagi page cache sistem operasi.
+    Kamus category (termasuk kamus kolom ID yang sama di seluruh tabel) dan kolom teks dibuat di setiap proses.
+    Tabel sudah dikodekan dan diurutkan saat konversi (lihat analisis.konversi.konversi_csv_ke_memmap).
+
+    Parameters:
+        data_dir (str): Folder data
+
+    Returns:
+        tabel (dict): Dictionary berisi nama tabel dan Data Frame-nya (array read-only)
+    """
+
+    dir_memmap = os.path.join(data_dir, DIR_MEMMAP)
+    with open(get_path_manifest_memmap(data_dir)) as f:
+        manifest = json.load(f)
+
+    # np.asarray menghasilkan view ndarray biasa (bukan subclass memmap) atas memori yang sama
+    def load_npy(*bagian):
+        return np.asarray(np.load(os.path.join(dir_memmap, *bagian), mmap_mode='r'))
+
+    kumpulan_dtype = {}
+    def get_dtype_kamus(kunci):
+        if kunci not in kumpulan_dtype:
+            kumpulan_dtype[kunci] = pd.CategoricalDtype(categories=pd.Index(load_npy('kamus', f'{kunci}.npy')))
+        return kumpulan_dtype[kunci]
+
+    tabel = {}
+    for nama, info in manifest['tabel'].items():
+        kolom = {}
+        for info_kolom in info['kolom']:
+            nama_kolom, jenis = info_kolom['nama'], info_kolom['jenis']
+            if jenis == 'nilai':
+                kolom[nama_kolom] = load_npy(nama, f'{nama_kolom}.npy')
+            else:
+                kategori = pd.Categorical.from_codes(load_npy(nama, f'{nama_kolom}.kode.npy'),
+                                                     dtype=get_dtype_kamus(info_kolom['kamus']))
+                # Kolom teks disimpan sebagai kode dan kamus, lalu dikembalikan ke object seperti di file CSV
+                kolom[nama_kolom] = kategori if jenis == 'kategori' else np.asarray(kategori, dtype=object)
+        tabel[nama] = pd.DataFrame(kolom, copy=False)
+
+    return tabel
+
+### Mengodekan kolom ID
+def encode_kolom_id(tabel: dict) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk mengubah setiap kolom di KOLOM_ID menjadi category dengan kamus (categories)
+    yang sama di seluruh tabel. Kamus diurutkan sehingga urutan kode sama dengan urutan string aslinya.
+
+    Parameters:
+        tabel (dict): Dictionary berisi nama tabel dan Data Frame-nya
+
+    Returns:
+        tabel (dict): Dictionary yang sama dengan kolom ID yang telah dikodekan
+    """
+
+    for kolom in KOLOM_ID:
+        daftar_df = [df for df in tabel.values() if kolom in df.columns]
+        if not daftar_df:
+            continue
+
+        # Kolom yang sudah category (misalnya dari Parquet) cukup digabungkan kamusnya
+        daftar_nilai = [df[kolom].cat.categories if isinstance(df[kolom].dtype, pd.CategoricalDtype)
+                        else pd.Index(df[kolom].dropna().unique())
+                        for df in daftar_df]
+        kamus = daftar_nilai[0].append(daftar_nilai[1:]).unique().sort_values()
+        dtype_id = pd.CategoricalDtype(categories=kamus)
+
+        for df in daftar_df:
+            df[kolom] = df[kolom].astype(dtype_id)
+
+    return tabel
+
+### Menggabungkan tabel dengan kolom category
+def ubah_kategori(nilai: pd.Series, dtype: pd.CategoricalDtype) -> pd.Series:
+
+    """
+    Fungsi ini mengubah Series (atau Index) ke dtype category. Jika kamus lama merupakan awal dari kamus dtype
+    (kamus hanya ditambah di akhir), kode lama dipakai ulang tanpa mencocokkan ulang nilainya.
+    """
+
+    if nilai.dtype == dtype:
+        return nilai
+
+    if isinstance(nilai.dtype, pd.CategoricalDtype):
+        kategori_lama = nilai.dtype.categories
+        if len(kategori_lama) <= len(dtype.categories) and dtype.categories[:len(kategori_lama)].equals(kategori_lama):
+            kode = nilai.array.codes if isinstance(nilai, pd.Series) else nilai.codes
+            kategori = pd.Categorical.from_codes(kode, dtype=dtype)
+            if isinstance(nilai, pd.Index):
+                return pd.CategoricalIndex(kategori, name=nilai.name)
+            return pd.Series(kategori, index=nilai.index, name=nilai.name)
+
+    return nilai.astype(dtype)
+
+def get_dtype_gabungan(dtype: pd.CategoricalDtype, nilai_baru) -> pd.CategoricalDtype:
+
+    """
+    Fungsi ini mengembalikan dtype category dengan kamus dtype ditambah nilai_baru yang belum ada (urut, di akhir
+    kamus), sehingga kode lama tetap berlaku. dtype yang sama dikembalikan jika tidak ada nilai baru.
+    """
+
+    if isinstance(getattr(nilai_baru, 'dtype', None), pd.CategoricalDtype):
+        nilai_baru = nilai_baru.dtype.categories
+    nilai_baru = pd.Index(pd.unique(pd.Index(nilai_baru).dropna()))
+
+    tambahan = nilai_baru[dtype.categories.get_indexer(nilai_baru) < 0]
+    if len(tambahan) == 0:
+        return dtype
+
+    return pd.CategoricalDtype(categories=dtype.categories.append(tambahan.sort_values()), ordered=dtype.ordered)
+
+def concat_tabel(df_lama: pd.DataFrame, df_baru: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menggabungkan dua Data Frame berkolom sama tanpa mengubah kolom category menjadi
+    object. Kamus kolom category df_baru yang belum ada di df_lama ditambahkan di akhir kamus df_lama.
+
+    Parameters:
+        df_lama (pandas DataFrame): Data Frame lama
+        df_baru (pandas DataFrame): Data Frame baru
+
+    Returns:
+        df (pandas DataFrame): Gabungan df_lama dan df_baru dengan index baru 0..n-1
+    """
+
+    ubah_lama, ubah_baru = {}, {}
+    for kolom in df_lama.columns:
+        dtype = df_lama[kolom].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and kolom in df_baru.columns and df_baru[kolom].dtype != dtype:
+            dtype_gabungan = get_dtype_gabungan(dtype, df_baru[kolom])
+            ubah_lama[kolom] = ubah_kategori(df_lama[kolom], dtype_gabungan)
+            ubah_baru[kolom] = ubah_kategori(df_baru[kolom], dtype_gabungan)
+
+    return pd.concat([df_lama.assign(**ubah_lama), df_baru.assign(**ubah_baru)], ignore_index=True)
+
+def sisip_urut(df_lama: pd.DataFrame, df_baru: pd.DataFrame, kolom: str, ignore_index: bool = False) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menyisipkan baris df_baru ke df_lama yang sudah urut menurun berdasarkan kolom.
+    Posisi setiap baris baru dicari dengan binary search sehingga hanya baris baru yang diurutkan. Hasilnya sama
+    dengan pd.concat([df_lama, df_baru]).sort_values(by=kolom, ascending=False, kind='stable'): nilai kosong di
+    akhir dan baris lama berada di depan baris baru dengan nilai yang sama.
+
+    Parameters:
+        df_lama (pandas DataFrame): Data Frame yang urut menurun berdasarkan kolom
+        df_baru (pandas DataFrame): Baris baru dengan kolom dan dtype yang sama (tidak harus urut)
+        kolom (str): Kolom urutan
+        ignore_index (bool): True berarti index hasil diganti 0..n-1
+
+    Returns:
+        df (pandas DataFrame): Gabungan df_lama dan df_baru yang urut menurun berdasarkan kolom
+    """
+
+    df_baru = df_baru.sort_values(by=kolom, ascending=False, kind='stable')
+
+    # Nilai dinegasikan agar urut naik; np.searchsorted menempatkan NaN di akhir seperti na_position='last'
+    posisi = np.searchsorted(-df_lama[kolom].to_numpy(np.float64), -df_baru[kolom].to_numpy(np.float64),
+                             side='right')
+    urutan = np.insert(np.arange(len(df_lama)), posisi, np.arange(len(df_lama), len(df_lama) + len(df_baru)))
+
+    df = pd.concat([df_lama, df_baru]).take(urutan)
+
+    return df.reset_index(drop=True) if ignore_index else df
+
+### Mengurutkan tabel berdasarkan waktu
+def sort_tabel(tabel: dict) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk mengurutkan tabel di KOLOM_URUT berdasarkan kolom waktunya (NaT di akhir).
+    Pengurutan stabil sehingga tabel yang sudah urut (misalnya dari Parquet) diproses dalam waktu linear.
+
+    Parameters:
+        tabel (dict): Dictionary berisi nama tabel dan Data Frame-nya
+
+    Returns:
+        tabel (dict): Dictionary yang sama dengan tabel yang telah diurutkan
+    """
+
+    for nama, kolom in KOLOM_URUT.items():
+        if nama in tabel and kolom in tabel[nama].columns:
+            tabel[nama] = tabel[nama].sort_values(by=kolom, kind='stable', na_position='last').reset_index(drop=True)
+
+    return tabel
+
+def load_tabel(data_dir: str = DATA_DIR) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membaca seluruh tabel di DATA_FILES, mengodekan kolom ID-nya
+    dan mengurutkan tabel di KOLOM_URUT berdasarkan waktu
+
+    Parameters:
+        data_dir (str): Folder data
+
+    Returns:
+        tabel (dict): Dictionary berisi nama tabel dan Data Frame-nya
+    """
+
+    if cek_memmap(data_dir):
+        with tahap('load.read_memmap') as catatan:
+            tabel = read_memmap(data_dir)
+            catatan['baris'] = sum(len(df) for df in tabel.values())
+        return tabel
+
+    tabel = {}
+    for nama in DATA_FILES:
+        with tahap(f'load.{nama}') as catatan:
+            tabel[nama] = read_tabel(nama, data_dir)
+            catatan['baris'] = len(tabel[nama])
+
+    with tahap('load.encode_kolom_id'):
+        tabel = encode_kolom_id(tabel)
+
+    with tahap('load.sort_tabel'):
+        tabel = sort_tabel(tabel)
+
+    return tabel
@@ -0,0 +1,156 @@
+"""
+Perintah untuk menghitung seluruh hasil dashboard pada rentang waktu default (tanggal order pertama sampai
+terakhir) secara offline, lalu menyimpannya sebagai snapshot berversi di data/snapshot/<versi>/:
+
+    <nama>.parquet   setiap Data Frame hasil AnalisisEngine.run (pivot, merged, total per state/kota/id,
+                     kategori barang per kota, klaster) dan indeks gap permintaan
+    manifest.json    versi data, waktu order pertama/terakhir, rentang waktu, top_cities, top_categories
+                     dan daftar artefak
+
+Versi snapshot adalah hash dari versi data (lihat analisis.loader.get_versi_data), sehingga snapshot otomatis
+tidak dipakai lagi setelah salah satu file data berubah. Engine membaca snapshot yang cocok untuk tampilan
+default tanpa memuat tabel, sedangkan rentang waktu lain tetap dihitung langsung.
+
+Penggunaan:
+    python -m analisis.materialisasi [--data-dir data] [--top-cities 8] [--top-categories 10]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from analisis.loader import DATA_DIR, get_versi_data
+
+# Folder snapshot di dalam folder data dan jumlah versi snapshot yang disimpan
+DIR_SNAPSHOT = 'snapshot'
+JUMLAH_SNAPSHOT = 3
+
+## Lokasi snapshot
+def get_kode_versi(versi_data: tuple) -> str:
+
+    """
+    Fungsi ini mengembalikan kode pendek (12 karakter hex) dari versi data, dipakai sebagai nama folder snapshot
+    """
+
+    return hashlib.sha1(json.dumps(versi_data, default=str).encode()).hexdigest()[:12]
+
+def get_dir_snapshot(versi_data: tuple, data_dir: str = DATA_DIR) -> str:
+
+    """
+    Fungsi ini mengembalikan lokasi folder snapshot untuk sebuah versi data
+    """
+
+    return os.path.join(data_dir, DIR_SNAPSHOT, get_kode_versi(versi_data))
+
+## Menulis dan membaca snapshot
+def create_snapshot(data_dir: str = DATA_DIR, top_cities: int = 8, top_categories: int = 10) -> str:
+
+    """
+    Fungsi ini bertujuan untuk menjalankan pipeline penuh pada rentang waktu default dan menyimpan hasilnya
+    sebagai snapshot untuk versi data saat ini. Folder ditulis ke folder sementara lalu diganti sekaligus,
+    dan hanya JUMLAH_SNAPSHOT snapshot terbaru yang disimpan.
+
+    Parameters:
+        data_dir (str): Folder data
+        top_cities (int): Jumlah kota teratas pada kategori_kota_jual dan kategori_kota_beli
+        top_categories (int): Jumlah kategori teratas untuk setiap kota
+
+    Returns:
+        dir_snapshot (str): Lokasi folder snapshot
+    """
+
+    from analisis.engine import AnalisisEngine
+
+    engine = AnalisisEngine(data_dir=data_dir, snapshot=False).load()
+    versi_data = engine.versi_data
+    min_date, max_date = engine.get_rentang_waktu()
+    start_date, end_date = engine.get_rentang()
+
+    hasil = engine.run(start_date, end_date, top_cities, top_categories)
+    hasil['indeks_gap'] = engine.get_indeks_gap(start_date, end_date)
+
+    dir_snapshot = get_dir_snapshot(versi_data, data_dir)
+    dir_sementara = dir_snapshot + '.tmp'
+    shutil.rmtree(dir_sementara, ignore_errors=True)
+    os.makedirs(dir_sementara)
+
+    for nama, df in hasil.items():
+        df.to_parquet(os.path.join(dir_sementara, f'{nama}.parquet'))
+
+    manifest = {'versi_data': versi_data,
+                'kode_versi': get_kode_versi(versi_data),
+                'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'waktu_order': [str(min_date), str(max_date)],
+                'rentang_waktu': [str(start_date), str(end_date)],
+                'top_cities': top_cities,
+                'top_categories': top_categories,
+                'artefak': sorted(hasil)}
+    with open(os.path.join(dir_sementara, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    shutil.rmtree(dir_snapshot, ignore_errors=True)
+    os.replace(dir_sementara, dir_snapshot)
+
+    # Snapshot versi lama dihapus, kecuali JUMLAH_SNAPSHOT yang terbaru
+    dir_induk = os.path.dirname(dir_snapshot)
+    daftar_dir = sorted((os.path.join(dir_induk, nama) for nama in os.listdir(dir_induk)
+                         if not nama.endswith('.tmp')), key=os.path.getmtime, reverse=True)
+    for dir_lama in daftar_dir[JUMLAH_SNAPSHOT:]:
+        shutil.rmtree(dir_lama, ignore_errors=True)
+
+    return dir_snapshot
+
+def read_snapshot(data_dir: str = DATA_DIR, versi_data: tuple = None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membaca snapshot untuk versi data saat ini
+
+    Parameters:
+        data_dir (str): Folder data
+        versi_data (tuple): Versi data, None berarti dihitung dengan get_versi_data
+
+    Returns:
+        snapshot (dict): Dictionary berisi 'manifest' dan 'hasil' (Data Frame dengan nama artefak sebagai key),
+                         atau None jika belum ada snapshot untuk versi data ini
+    """
+
+    if versi_data is None:
+        versi_data = get_versi_data(data_dir)
+
+    dir_snapshot = get_dir_snapshot(versi_data, data_dir)
+    path_manifest = os.path.join(dir_snapshot, 'manifest.json')
+    if not os.path.exists(path_manifest):
+        return None
+
+    with open(path_manifest) as f:
+        manifest = json.load(f)
+
+    hasil = {nama: pd.read_parquet(os.path.join(dir_snapshot, f'{nama}.parquet')) for nama in manifest['artefak']}
+
+    return {'manifest': manifest, 'hasil': hasil}
+
+def main():
+    parser = argparse.ArgumentParser(description='Menyimpan hasil dashboard rentang waktu default sebagai snapshot')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Folder data (default: %(default)s)')
+    parser.add_argument('--top-cities', type=int, default=8, help='Jumlah kota teratas (default: %(default)s)')
+    parser.add_argument('--top-categories', type=int, default=10,
+                        help='Jumlah kategori teratas setiap kota (default: %(default)s)')
+    args = parser.parse_args()
+
+    waktu_mulai = time.perf_counter()
+    dir_snapshot = create_snapshot(args.data_dir, args.top_cities, args.top_categories)
+    with open(os.path.join(dir_snapshot, 'manifest.json')) as f:
+        manifest = json.load(f)
+    print(f"Snapshot {manifest['kode_versi']} ({manifest['rentang_waktu'][0]} - {manifest['rentang_waktu'][1]}): "
+          f'{dir_snapshot}')
+    for nama in manifest['artefak']:
+        print(f"{nama}: {os.path.getsize(os.path.join(dir_snapshot, f'{nama}.parquet')) / 1e6:.2f} MB")
+    print(f'Selesai dalam {time.perf_counter() - waktu_mulai:.2f} detik')
+
+if __name__ == '__main__':
+    main()
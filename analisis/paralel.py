@@ -0,0 +1,86 @@
+"""
+Modul ini berisi worker pool untuk menjalankan tahap-tahap yang tidak saling bergantung secara bersamaan,
+misalnya cabang seller dan cabang customer pada pipeline, atau groupby total per state/kota/id pada kubus.
+
+Worker berupa thread karena operasi pandas/numpy yang berat (merge, groupby, sort) melepas GIL dan tabel
+tidak perlu disalin ke proses lain. Jumlah worker diatur dengan parameter n_worker atau variabel lingkungan
+ANALISIS_N_WORKER; nilai 1 (default) menjalankan seluruh tugas berurutan di thread pemanggil.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from analisis.profil import bawa_sesi
+
+# Jumlah worker default untuk seluruh pemanggil yang tidak menentukan n_worker
+N_WORKER = int(os.environ.get('ANALISIS_N_WORKER', 1))
+
+# Satu pool untuk setiap jumlah worker, dipakai bersama oleh seluruh rerun dan sesi
+kumpulan_pool = {}
+lock_pool = threading.Lock()
+
+# Penanda thread worker, sehingga tugas di dalam worker tidak mengirim tugas baru ke pool (mencegah deadlock)
+lokal = threading.local()
+
+def get_pool(n_worker: int) -> ThreadPoolExecutor:
+
+    """
+    Fungsi ini mengembalikan ThreadPoolExecutor bersama dengan n_worker worker, dibuat saat pertama kali dipakai
+    """
+
+    with lock_pool:
+        if n_worker not in kumpulan_pool:
+            kumpulan_pool[n_worker] = ThreadPoolExecutor(max_workers=n_worker, thread_name_prefix='analisis',
+                                                         initializer=setattr, initargs=(lokal, 'worker', True))
+
+    return kumpulan_pool[n_worker]
+
+def periksa_batal(cek_batal=None):
+
+    """
+    Fungsi ini memanggil cek_batal (misalnya analisis.latar.Tugas.cek_batal) jika diberikan. Dipanggil di antara
+    tahap perhitungan panjang agar permintaan yang sudah digantikan berhenti sebelum tahap berikutnya.
+    """
+
+    if cek_batal is not None:
+        cek_batal()
+
+def jalankan_paralel(tugas: dict, n_worker: int = None, cek_batal=None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menjalankan beberapa tugas yang tidak saling bergantung di worker pool.
+    Jika n_worker <= 1, hanya ada satu tugas, atau dipanggil dari dalam worker, tugas dijalankan berurutan.
+    Tahap profil di dalam tugas tetap tercatat di sesi profil pemanggil.
+
+    Parameters:
+        tugas (dict): Dictionary nama tugas -> tuple (fungsi, *argumen)
+        n_worker (int): Jumlah worker, None berarti N_WORKER
+        cek_batal (callable): Pemeriksaan pembatalan yang dipanggil sebelum setiap tugas dimulai, None berarti
+                              tanpa pembatalan
+
+    Returns:
+        hasil (dict): Dictionary nama tugas -> nilai kembalian fungsi, dengan urutan yang sama seperti tugas
+    """
+
+    n_worker = N_WORKER if n_worker is None else n_worker
+
+    if n_worker <= 1 or len(tugas) <= 1 or getattr(lokal, 'worker', False):
+        hasil = {}
+        for nama, (fungsi, *args) in tugas.items():
+            periksa_batal(cek_batal)
+            hasil[nama] = fungsi(*args)
+        return hasil
+
+    def dengan_pemeriksaan(fungsi):
+        def fungsi_diperiksa(*args):
+            periksa_batal(cek_batal)
+            return fungsi(*args)
+        return fungsi_diperiksa
+
+    pool = get_pool(n_worker)
+    futures = {nama: pool.submit(bawa_sesi(dengan_pemeriksaan(fungsi)), *args)
+               for nama, (fungsi, *args) in tugas.items()}
+
+    # result() meneruskan exception dari worker ke pemanggil
+    return {nama: future.result() for nama, future in futures.items()}
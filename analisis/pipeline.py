@@ -0,0 +1,669 @@
+"""
+Modul ini berisi fungsi-fungsi pipeline (filter, pivot, merge, kategori per kota dan klaster)
+yang tidak bergantung pada Streamlit. Dipakai oleh analisis/engine.py dan kubus agregat (analisis/kubus.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from analisis.paralel import jalankan_paralel, periksa_batal
+from analisis.profil import tahap
+from analisis.segmentasi import create_segmen_bin, ringkas_segmen
+
+## Mendapatkan kelompok order berdasarkan status
+# Kelompok order berdasarkan order_status, dapat diubah tanpa mengubah fungsi-fungsi di bawah
+KELOMPOK_STATUS = {'cancel_unav': ['canceled', 'unavailable'],
+                   'seller': ['delivered', 'invoiced', 'shipped', 'processing', 'created', 'approved'],
+                   'customer': ['delivered', 'shipped', 'invoiced', 'processing', 'created', 'approved']}
+
+def create_kelompok_order(df_order: pd.DataFrame, kelompok_status: dict = KELOMPOK_STATUS) -> pd.Series:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan indeks kelompok setiap order berdasarkan order_status dalam satu kali scan.
+    Setiap kelompok di kelompok_status mendapat satu bit (sesuai urutannya), sehingga satu order dapat
+    masuk ke beberapa kelompok sekaligus.
+
+    Parameters:
+        df_order (pandas DataFrame): Data Frame df_order
+        kelompok_status (dict): Dictionary berisi nama kelompok dan daftar order_status anggotanya
+
+    Returns:
+        kelompok_order (pandas Series): bitmask kelompok (uint8) dengan index order_id
+    """
+
+    kode_status, daftar_status = pd.factorize(df_order['order_status'])
+
+    # Tabel bit per status, lalu satu kali lookup untuk seluruh order
+    bit_per_status = np.zeros(len(daftar_status) + 1, dtype=np.uint8)
+    for posisi, anggota in enumerate(kelompok_status.values()):
+        bit_per_status[:-1][np.asarray(daftar_status.isin(anggota))] |= np.uint8(1 << posisi)
+
+    # kode_status -1 (status kosong) mengarah ke elemen terakhir yang bernilai 0
+    kelompok_order = pd.Series(bit_per_status[kode_status], index=pd.Index(df_order['order_id']), name='kelompok')
+
+    return kelompok_order
+
+def create_mask_kelompok(df: pd.DataFrame,
+                         kelompok_order: pd.Series,
+                         nama_kelompok: str,
+                         kelompok_status: dict = KELOMPOK_STATUS) -> np.ndarray:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan boolean mask baris df yang order_id-nya termasuk kelompok nama_kelompok.
+    Jika order_id di kedua sisi memakai kamus category yang sama, mask dihitung langsung dari kode integer.
+
+    Parameters:
+        df (pandas DataFrame): Data Frame dengan kolom order_id
+        kelompok_order (pandas Series): hasil create_kelompok_order
+        nama_kelompok (str): Nama kelompok di kelompok_status
+        kelompok_status (dict): Dictionary yang dipakai saat membuat kelompok_order
+
+    Returns:
+        mask (numpy ndarray): boolean mask sepanjang df
+    """
+
+    bit = np.uint8(1 << list(kelompok_status).index(nama_kelompok))
+    order_id = df['order_id']
+
+    if (isinstance(order_id.dtype, pd.CategoricalDtype) and
+            isinstance(kelompok_order.index.dtype, pd.CategoricalDtype) and
+            order_id.dtype == kelompok_order.index.dtype):
+        # Bitmask per kode order_id, order di luar df_order bernilai 0
+        bit_per_kode = np.zeros(len(order_id.cat.categories) + 1, dtype=np.uint8)
+        bit_per_kode[kelompok_order.index.codes] = kelompok_order.to_numpy()
+        bit_per_kode[-1] = 0
+        return (bit_per_kode[order_id.cat.codes.to_numpy()] & bit) != 0
+
+    return (order_id.map(kelompok_order).fillna(0).to_numpy(dtype=np.uint8) & bit) != 0
+
+## Filter rentang waktu
+def filter_rentang_waktu(df: pd.DataFrame, kolom: str, start_date, end_date) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk memilih baris df dengan start_date <= kolom <= end_date menggunakan binary search.
+    df harus sudah urut berdasarkan kolom (dilakukan oleh loader, lihat KOLOM_URUT), sehingga hasilnya berupa
+    potongan baris yang berurutan tanpa membuat boolean mask untuk seluruh baris.
+
+    Parameters:
+        df (pandas DataFrame): Data Frame yang sudah urut berdasarkan kolom
+        kolom (str): Nama kolom datetime
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+
+    Returns:
+        df (pandas DataFrame): Potongan baris df di dalam rentang waktu
+    """
+
+    # Batas sama dengan perbandingan terhadap str(tanggal), yaitu pukul 00:00:00 di kedua ujung
+    awal = df[kolom].searchsorted(pd.Timestamp(start_date), side='left')
+    akhir = df[kolom].searchsorted(pd.Timestamp(end_date), side='right')
+
+    return df.iloc[awal:akhir]
+
+## Mendapatkan pivot_seller dan pivot_order
+def create_pivot_seller(df_order_items: pd.DataFrame,
+                        df_product: pd.DataFrame,
+                        kelompok_order: pd.Series) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame pivot_seller (price dan freight_value per seller).
+    Kolom <nilai>_count menyimpan jumlah barang sehingga pivot dapat digabung dengan pivot data baru
+    (lihat analisis.ingesti.gabung_pivot_seller).
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_product (pandas DataFrame): Data Frame df_product
+        kelompok_order (pandas Series): hasil create_kelompok_order
+
+    Returns:
+        pivot_seller (pandas DataFrame): Data Frame pivot_seller
+    """
+
+    df_temp = pd.merge(df_order_items, df_product, on='product_id', how='inner')
+    pivot_seller = df_temp[create_mask_kelompok(df_temp, kelompok_order, 'seller')].groupby(by='seller_id', observed=True).agg({
+                                                                'price': ['sum','mean','max', 'min', 'count'],
+                                                                'freight_value': ['sum','mean','max', 'min', 'count']
+                                                                }).sort_values(by=('price','sum'), ascending=False, kind='stable')
+    pivot_seller.columns = ['_'.join(col).strip() for col in pivot_seller.columns.values]
+
+    return pivot_seller
+
+def create_pivot_order(df_order_items: pd.DataFrame,
+                       df_product: pd.DataFrame,
+                       df_order_payments: pd.DataFrame,
+                       kelompok_order: pd.Series) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame pivot_order (payment_value, price dan freight_value per order)
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_product (pandas DataFrame): Data Frame df_product
+        df_order_payments (pandas DataFrame): Data Frame df_order_payments
+        kelompok_order (pandas Series): hasil create_kelompok_order
+
+    Returns:
+        pivot_order (pandas DataFrame): Data Frame pivot_order
+    """
+
+    df_temp = df_order_items.drop(columns=['order_item_id','shipping_limit_date','seller_id'])
+    df_temp = pd.merge(df_temp, df_product, on='product_id', how='inner')
+    df_temp = df_temp[create_mask_kelompok(df_temp, kelompok_order, 'customer')].groupby(by='order_id', observed=True).agg({
+                                                                'price': ['sum','mean','max', 'min'],
+                                                                'freight_value': ['sum','mean','max', 'min']
+                                                                }).sort_values(by=('price','sum'), ascending=False)
+    df_temp.columns = ['_'.join(col).strip() for col in df_temp.columns.values]
+
+    pivot_order = df_order_payments[create_mask_kelompok(df_order_payments, kelompok_order, 'customer')].groupby(by='order_id', observed=True).agg({
+                                                        'payment_value': ['mean','max', 'min','sum'],
+                                                        }).sort_values(by=('payment_value','sum'), ascending=False, kind='stable')
+    pivot_order.columns = ['_'.join(col).strip() for col in pivot_order.columns.values]
+    pivot_order = pd.merge(pivot_order, df_temp, on='order_id', how='inner')
+
+    return pivot_order
+
+def create_pivot_seller_and_order(df_order_items: pd.DataFrame,
+                                  df_product: pd.DataFrame,
+                                  df_order_payments: pd.DataFrame,
+                                  df_order: pd.DataFrame,
+                                  kelompok_order: pd.Series = None) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame pivot_seller dan pivot_order
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_product (pandas DataFrame): Data Frame df_product
+        df_order_payments (pandas DataFrame): Data Frame df_order_payments
+        df_order (pandas DataFrame): Data Frame df_order
+        kelompok_order (pandas Series): hasil create_kelompok_order, dihitung dari df_order jika None
+
+    Returns:
+        tuple(pivot_seller, pivot_order):
+        Data Frame pivot_seller dan  Data Frame pivot_order        
+    """
+
+    if kelompok_order is None:
+        kelompok_order = create_kelompok_order(df_order)
+
+    return (create_pivot_seller(df_order_items, df_product, kelompok_order),
+            create_pivot_order(df_order_items, df_product, df_order_payments, kelompok_order))
+
+## Mendapatkan jumlah kategori barang per seller dan per order
+def create_kategori_per_id(df_order_items: pd.DataFrame,
+                           df_product: pd.DataFrame,
+                           kelompok_order: pd.Series,
+                           kolom_id: str,
+                           nama_kelompok: str) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghitung jumlah barang per kategori untuk setiap seller atau setiap order.
+    Hasilnya berupa Data Frame panjang (satu baris per pasangan id dan kategori) sehingga tidak perlu
+    menyimpan list kategori di setiap baris pivot_seller dan pivot_order
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_product (pandas DataFrame): Data Frame df_product
+        kelompok_order (pandas Series): hasil create_kelompok_order
+        kolom_id (str): 'seller_id' atau 'order_id'
+        nama_kelompok (str): Nama kelompok di KELOMPOK_STATUS, 'seller' atau 'customer'
+
+    Returns:
+        kategori_per_id (pandas DataFrame): Data Frame dengan kolom [kolom_id, product_category_name, count]
+    """
+
+    df_temp = pd.merge(df_order_items[list(dict.fromkeys(['order_id', kolom_id, 'product_id']))],
+                       df_product, on='product_id', how='inner')
+    df_temp['product_category_name'] = df_temp['product_category_name'].astype('category')
+
+    kategori_per_id = df_temp[create_mask_kelompok(df_temp, kelompok_order, nama_kelompok)].groupby(
+                        by=[kolom_id, 'product_category_name'], observed=True).size().rename('count').reset_index()
+
+    return kategori_per_id
+
+def create_kategori_seller_and_order(df_order_items: pd.DataFrame,
+                                     df_product: pd.DataFrame,
+                                     df_order: pd.DataFrame,
+                                     kelompok_order: pd.Series = None) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menghitung jumlah barang per kategori untuk setiap seller dan setiap order
+    (lihat create_kategori_per_id)
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items
+        df_product (pandas DataFrame): Data Frame df_product
+        df_order (pandas DataFrame): Data Frame df_order
+        kelompok_order (pandas Series): hasil create_kelompok_order, dihitung dari df_order jika None
+
+    Returns:
+        tuple(kategori_seller, kategori_order):
+        Data Frame dengan kolom [seller_id, product_category_name, count] dan
+        Data Frame dengan kolom [order_id, product_category_name, count]
+    """
+
+    if kelompok_order is None:
+        kelompok_order = create_kelompok_order(df_order)
+
+    return (create_kategori_per_id(df_order_items, df_product, kelompok_order, 'seller_id', 'seller'),
+            create_kategori_per_id(df_order_items, df_product, kelompok_order, 'order_id', 'customer'))
+
+## Mendapatkan df_sellers_merged dan df_customer_merged
+def create_df_sellers_and_customer_merged(pivot_seller: pd.DataFrame,
+                                          df_sellers: pd.DataFrame,
+                                          pivot_order: pd.DataFrame,
+                                          df_order: pd.DataFrame,
+                                          df_customer: pd.DataFrame) -> tuple:
+    
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame df_sellers_merged dan df_customer_merged
+
+    Parameters:
+        pivot_seller (pandas DataFrame): Data Frame pivot_seller
+        df_sellers (pandas DataFrame): Data Frame df_sellers
+        pivot_order (pandas DataFrame): Data Frame pivot_order
+        df_order (pandas DataFrame): Data Frame df_order
+        df_customer (pandas DataFrame): Data Frame df_customer
+
+    Returns:
+        tuple(df_sellers_merged, df_customer_merged):
+        Data Frame df_sellers_merged dan Data Frame df_customer_merged        
+    """
+
+    return (create_df_sellers_merged(pivot_seller, df_sellers),
+            create_df_customer_merged(pivot_order, df_order, df_customer))
+
+def create_df_sellers_merged(pivot_seller: pd.DataFrame, df_sellers: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame df_sellers_merged (pivot_seller beserta kota dan state seller)
+    """
+
+    return pd.merge(pivot_seller, df_sellers, on='seller_id', how='inner')
+
+def create_df_customer_merged(pivot_order: pd.DataFrame,
+                              df_order: pd.DataFrame,
+                              df_customer: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan Data Frame df_customer_merged (pivot_order beserta customer_id,
+    kolom df_order dan kota serta state customer)
+    """
+
+    df_order_merged = pd.merge(pivot_order, df_order, on='order_id', how='inner')
+    cols = df_order_merged.columns.tolist()
+    cols.insert(1, cols.pop(cols.index('customer_id')))
+    df_order_merged = df_order_merged[cols]
+
+    return pd.merge(df_order_merged, df_customer, on='customer_id', how='inner')
+
+## Mendapatkan df_sellers_city_merged
+def create_df_sellers_city_merged(df_sellers_merged: pd.DataFrame, n_kota: int = 8) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan n_kota (default 8) kota berpenghasilan terbesar
+    yang disajikan ke Data Frame create_df_sellers_city_merged
+
+    Parameters:
+        df_sellers_merged (pandas DataFrame): Data Frame df_sellers_merged
+        n_kota (int): Jumlah kota yang diambil
+
+    Returns:
+        df_sellers_city_merged: Data Frame df_sellers_city_merged
+    """    
+
+    df_sellers_city_merged = df_sellers_merged.groupby(by='seller_city', observed=True).agg({
+                                                    'price_sum': 'sum'
+                                                    }).sort_values(by = ('price_sum'), ascending = False).head(n_kota)
+    
+    return df_sellers_city_merged
+
+## Mendapatkan kategori barang teratas di setiap kota teratas
+def create_top_kategori_kota(kota_teratas,
+                             kategori_di_kota: pd.Series,
+                             n_kategori: int = 10,
+                             kolom_kota: str = None) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan n_kategori kategori dengan jumlah barang terbanyak di setiap kota
+    kota_teratas dalam satu operasi berkelompok, tanpa perulangan per kota, sebagai Data Frame panjang:
+
+    kota_1, kategori_1, count
+    kota_1, kategori_2, count
+    ...
+    kota_n, kategori_m, count
+
+    Parameters:
+        kota_teratas (pandas Index): Kota yang diambil sesuai urutannya, misalnya index df_sellers_city_merged
+        kategori_di_kota (pandas Series): hasil create_kategori_di_kota
+        n_kategori (int): Jumlah kategori yang diambil untuk setiap kota, None berarti seluruh kategori
+        kolom_kota (str): Nama kolom kota pada hasil, default nama level kota kategori_di_kota
+
+    Returns:
+        kategori_kota (pandas DataFrame): Data Frame dengan kolom kolom_kota, product_category_name (str) dan count,
+                                          urut sesuai kota_teratas lalu jumlah barang menurun
+    """
+
+    if kolom_kota is None:
+        kolom_kota = kategori_di_kota.index.names[0]
+
+    # Urutan setiap kota di kota_teratas dicari sekali per kota unik (level index), lalu disebar lewat kode index
+    index = kategori_di_kota.index
+    urutan_level = pd.Index(pd.Index(kota_teratas).astype(str)).get_indexer(index.levels[0].astype(str))
+    urutan_kota = urutan_level[index.codes[0]]
+    ada = urutan_kota >= 0
+
+    kategori_kota = pd.DataFrame({kolom_kota: index.get_level_values(0)[ada].astype(str),
+                                  'product_category_name': index.get_level_values(1)[ada].astype(str),
+                                  'count': kategori_di_kota.to_numpy()[ada],
+                                  'urutan_kota': urutan_kota[ada]})
+
+    # Urutan stabil membuat kategori dengan jumlah sama tetap urut abjad
+    kategori_kota = kategori_kota.sort_values(by=['urutan_kota', 'count'], ascending=[True, False], kind='stable')
+    if n_kategori is not None:
+        kategori_kota = kategori_kota[kategori_kota.groupby('urutan_kota').cumcount().to_numpy() < n_kategori]
+
+    return kategori_kota.drop(columns='urutan_kota').reset_index(drop=True)
+
+## Mendapatkan kategori barang yang banyak dijual di kota berpenghasilan tertinggi
+def return_kategori_di_kota_jual(df_sellers_city_merged: pd.DataFrame,
+                                 kategori_di_kota: pd.Series,
+                                 n_kategori: int = 10) -> pd.DataFrame:
+    
+    """
+    Fungsi ini bertujuan untuk menghasilkan n_kategori (default 10) kategori yang terjual terbanyak di kota-kota
+    berpenghasilan terbesar (seluruh kota di df_sellers_city_merged, berapa pun jumlahnya) sebagai Data Frame
+    panjang dengan kolom seller_city, product_category_name dan count
+
+    Parameters:
+        df_sellers_city_merged (pandas Data Frame): Data Frame df_sellers_city_merged
+        kategori_di_kota (pandas Series): hasil create_kategori_di_kota
+        n_kategori (int): Jumlah kategori yang diambil untuk setiap kota
+
+    Returns:
+        penjualan_kategoribarang_di_kota (pandas DataFrame): Hasil create_top_kategori_kota
+    """
+
+    return create_top_kategori_kota(df_sellers_city_merged.index, kategori_di_kota, n_kategori, 'seller_city')
+
+## Mendapatkan jumlah kategori barang per kota
+def create_kategori_di_kota(df_kategori: pd.DataFrame,
+                            df_merged: pd.DataFrame,
+                            kolom_id: str,
+                            kolom_kota: str) -> pd.Series:
+
+    """
+    Fungsi ini bertujuan untuk menjumlahkan kategori barang per kota dengan satu groupby,
+    berdasarkan jumlah kategori per seller atau per order
+
+    Parameters:
+        df_kategori (pandas DataFrame): Data Frame kategori_seller atau kategori_order
+        df_merged (pandas DataFrame): Data Frame df_sellers_merged atau df_customer_merged
+        kolom_id (str): 'seller_id' atau 'order_id'
+        kolom_kota (str): 'seller_city' atau 'customer_city'
+
+    Returns:
+        kategori_di_kota (pandas Series): jumlah barang dengan index (kota, product_category_name)
+    """
+
+    df_temp = pd.merge(df_kategori, df_merged[[kolom_id, kolom_kota]], on=kolom_id, how='inner')
+    kategori_di_kota = df_temp.groupby(by=[kolom_kota, 'product_category_name'], observed=True)['count'].sum()
+
+    return kategori_di_kota
+
+## Mendapatkan df_customer_city_merged
+def create_df_customer_city_merged(df_customer_merged: pd.DataFrame, n_kota: int = 8) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan n_kota (default 8) kota berpengeluaran terbesar
+    yang disajikan ke Data Frame create_df_customer_city_merged
+
+    Parameters:
+        df_customer_merged (pandas DataFrame): Data Frame df_customer_merged
+        n_kota (int): Jumlah kota yang diambil
+
+    Returns:
+        df_customer_city_merged (pandas DataFrame): Data Frame df_customer_city_merged
+    """    
+
+    df_customer_city_merged = df_customer_merged.groupby(by='customer_city', observed=True).agg({
+                                                        'payment_value_sum': 'sum'
+                                                        }).sort_values(by = ('payment_value_sum'), ascending = False).head(n_kota)
+    
+    return df_customer_city_merged
+
+## Mendapatkan kategori barang yang banyak dibeli di kota berpengeluaran tertinggi
+def return_kategori_di_kota_beli(df_customer_city_merged: pd.DataFrame,
+                                 kategori_di_kota: pd.Series,
+                                 n_kategori: int = 10) -> pd.DataFrame:
+    
+    """
+    Fungsi ini bertujuan untuk menghasilkan n_kategori (default 10) kategori yang dibeli terbanyak di kota-kota
+    berpengeluaran terbesar (seluruh kota di df_customer_city_merged, berapa pun jumlahnya) sebagai Data Frame
+    panjang dengan kolom customer_city, product_category_name dan count
+
+    Parameters:
+        df_customer_city_merged (pandas Data Frame): Data Frame df_customer_city_merged
+        kategori_di_kota (pandas Series): hasil create_kategori_di_kota
+        n_kategori (int): Jumlah kategori yang diambil untuk setiap kota
+
+    Returns:
+        pembelian_kategoribarang_di_kota (pandas DataFrame): Hasil create_top_kategori_kota
+    """
+
+    return create_top_kategori_kota(df_customer_city_merged.index, kategori_di_kota, n_kategori, 'customer_city')
+
+## Membuat Klaster customer dan seller
+kumpulan_klaster = ['Klaster I','Klaster II','Klaster III','Klaster IV','Klaster V','Klaster VI','Klaster VII']
+
+# Batas klaster (BRL), dapat diganti dengan batas lain atau segmen kuantil (lihat analisis/segmentasi.py)
+BATAS_KLASTER_CUSTOMER = [0, 70, 130, 210, 350, 1000, 4000, float('inf')]
+BATAS_KLASTER_SELLER = [0, 300, 1000, 2500, 5000, 10000, 50000, float('inf')]
+
+def create_klaster(df_merged: pd.DataFrame,
+                   kolom_nilai: str,
+                   nama_jumlah: str,
+                   batas: list,
+                   label: list = kumpulan_klaster) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk memberi label klaster setiap baris df_merged berdasarkan kolom_nilai lalu meringkas
+    jumlah anggota dan statistik kolom_nilai per klaster. Label disimpan di kolom 'Klaster' sebagai category
+    (kode integer), tanpa list anggota per klaster.
+
+    Parameters:
+        df_merged (pandas DataFrame): Data Frame df_customer_merged atau df_sellers_merged
+        kolom_nilai (str): 'payment_value_sum' atau 'price_sum'
+        nama_jumlah (str): Nama kolom jumlah anggota, misalnya 'customer_id_count'
+        batas (list): Batas klaster yang urut naik, sebanyak len(label) + 1
+        label (list): Nama setiap klaster
+
+    Returns:
+        df_klaster (pandas DataFrame): Satu baris per klaster, kolom pertama berisi jumlah anggota
+    """
+
+    kode = create_segmen_bin(df_merged[kolom_nilai], batas)
+    df_merged['Klaster'] = pd.Categorical.from_codes(kode, categories=label, ordered=True)
+
+    return ringkas_segmen(kode, df_merged[kolom_nilai], label, nama_jumlah, kolom_nilai)
+
+def create_klaster_customer(df_customer_merged: pd.DataFrame,
+                            batas: list = BATAS_KLASTER_CUSTOMER) -> pd.DataFrame:
+
+    """
+    Fungsi ini digunakan untuk menghasilkan klaster customer berdasarkan payment_value_sum
+
+    Parameters:
+        df_customer_merged (pandas Data Frames): Data Frame df_customer_merged
+        batas (list): Batas klaster, default BATAS_KLASTER_CUSTOMER
+    
+    Returns:
+        df_customer_klaster (pandas DataFrame): Data Frame df_customer_klaster dengan kolom customer_id_count
+                                                dan ringkasan payment_value_sum per klaster
+    """
+
+    return create_klaster(df_customer_merged, 'payment_value_sum', 'customer_id_count', batas)
+
+def create_klaster_sellers(df_sellers_merged: pd.DataFrame,
+                           batas: list = BATAS_KLASTER_SELLER) -> pd.DataFrame:
+
+    """
+    Fungsi ini digunakan untuk menghasilkan klaster seller berdasarkan price_sum
+
+    Parameters:
+        df_sellers_merged (pandas Data Frames): Data Frame df_sellers_merged
+        batas (list): Batas klaster, default BATAS_KLASTER_SELLER
+    
+    Returns:
+        df_sellers_klaster (pandas DataFrame): Data Frame df_sellers_klaster dengan kolom seller_id_count
+                                               dan ringkasan price_sum per klaster
+    """
+
+    return create_klaster(df_sellers_merged, 'price_sum', 'seller_id_count', batas)
+
+## Cabang seller dan cabang customer
+def create_cabang_seller(df_order_items: pd.DataFrame,
+                         df_product: pd.DataFrame,
+                         df_sellers: pd.DataFrame,
+                         kelompok_order: pd.Series,
+                         cek_batal=None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat seluruh Data Frame turunan sisi seller (pivot, merged, kategori per kota
+    dan klaster). Cabang ini tidak bergantung pada cabang customer sehingga keduanya dapat dijalankan bersamaan.
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items yang sudah difilter
+        df_product (pandas DataFrame): Data Frame df_product
+        df_sellers (pandas DataFrame): Data Frame df_sellers
+        kelompok_order (pandas Series): hasil create_kelompok_order
+        cek_batal (callable): Pemeriksaan pembatalan di antara tahap, None berarti tanpa pembatalan
+
+    Returns:
+        hasil (dict): Dictionary berisi pivot_seller, df_sellers_merged, kategori_di_kota_jual dan df_sellers_klaster
+    """
+
+    with tahap('create_pivot_seller') as catatan:
+        pivot_seller = create_pivot_seller(df_order_items, df_product, kelompok_order)
+        catatan['baris'] = len(pivot_seller)
+
+    periksa_batal(cek_batal)
+    with tahap('create_df_sellers_merged') as catatan:
+        df_sellers_merged = create_df_sellers_merged(pivot_seller, df_sellers)
+        catatan['baris'] = len(df_sellers_merged)
+
+    periksa_batal(cek_batal)
+    with tahap('create_kategori_di_kota.jual') as catatan:
+        kategori_seller = create_kategori_per_id(df_order_items, df_product, kelompok_order, 'seller_id', 'seller')
+        kategori_di_kota_jual = create_kategori_di_kota(kategori_seller, df_sellers_merged, 'seller_id', 'seller_city')
+        catatan['baris'] = len(kategori_di_kota_jual)
+
+    periksa_batal(cek_batal)
+    with tahap('create_klaster_sellers') as catatan:
+        df_sellers_klaster = create_klaster_sellers(df_sellers_merged)
+        catatan['baris'] = len(df_sellers_klaster)
+
+    return {'pivot_seller': pivot_seller,
+            'df_sellers_merged': df_sellers_merged,
+            'kategori_di_kota_jual': kategori_di_kota_jual,
+            'df_sellers_klaster': df_sellers_klaster}
+
+def create_cabang_customer(df_order_items: pd.DataFrame,
+                           df_product: pd.DataFrame,
+                           df_order_payments: pd.DataFrame,
+                           df_order: pd.DataFrame,
+                           df_customer: pd.DataFrame,
+                           kelompok_order: pd.Series,
+                           cek_batal=None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat seluruh Data Frame turunan sisi customer (pivot, merged, kategori per kota
+    dan klaster). Cabang ini tidak bergantung pada cabang seller sehingga keduanya dapat dijalankan bersamaan.
+
+    Parameters:
+        df_order_items (pandas DataFrame): Data Frame df_order_items yang sudah difilter
+        df_product (pandas DataFrame): Data Frame df_product
+        df_order_payments (pandas DataFrame): Data Frame df_order_payments
+        df_order (pandas DataFrame): Data Frame df_order yang sudah difilter
+        df_customer (pandas DataFrame): Data Frame df_customer
+        kelompok_order (pandas Series): hasil create_kelompok_order
+        cek_batal (callable): Pemeriksaan pembatalan di antara tahap, None berarti tanpa pembatalan
+
+    Returns:
+        hasil (dict): Dictionary berisi pivot_order, df_customer_merged, kategori_di_kota_beli dan df_customer_klaster
+    """
+
+    with tahap('create_pivot_order') as catatan:
+        pivot_order = create_pivot_order(df_order_items, df_product, df_order_payments, kelompok_order)
+        catatan['baris'] = len(pivot_order)
+
+    periksa_batal(cek_batal)
+    with tahap('create_df_customer_merged') as catatan:
+        df_customer_merged = create_df_customer_merged(pivot_order, df_order, df_customer)
+        catatan['baris'] = len(df_customer_merged)
+
+    periksa_batal(cek_batal)
+    with tahap('create_kategori_di_kota.beli') as catatan:
+        kategori_order = create_kategori_per_id(df_order_items, df_product, kelompok_order, 'order_id', 'customer')
+        kategori_di_kota_beli = create_kategori_di_kota(kategori_order, df_customer_merged, 'order_id', 'customer_city')
+        catatan['baris'] = len(kategori_di_kota_beli)
+
+    periksa_batal(cek_batal)
+    with tahap('create_klaster_customer') as catatan:
+        df_customer_klaster = create_klaster_customer(df_customer_merged)
+        catatan['baris'] = len(df_customer_klaster)
+
+    return {'pivot_order': pivot_order,
+            'df_customer_merged': df_customer_merged,
+            'kategori_di_kota_beli': kategori_di_kota_beli,
+            'df_customer_klaster': df_customer_klaster}
+
+## Filter dan pipeline data frame
+def create_hasil_pipeline(tabel: dict, start_date, end_date, n_worker: int = None, cek_batal=None) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menerapkan filter rentang waktu lalu membuat seluruh Data Frame turunan
+    (pivot, merged, kategori per kota dan klaster). Cabang seller dan cabang customer dijalankan
+    di worker pool jika n_worker lebih dari 1 (lihat analisis/paralel.py).
+
+    Parameters:
+        tabel (dict): Dictionary tabel dasar hasil analisis.loader.load_tabel
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+        n_worker (int): Jumlah worker, None berarti analisis.paralel.N_WORKER
+        cek_batal (callable): Pemeriksaan pembatalan di antara tahap (analisis.paralel.periksa_batal),
+                              None berarti tanpa pembatalan
+
+    Returns:
+        hasil (dict): Dictionary berisi Data Frame turunan dengan nama variabel sebagai key
+    """
+
+    with tahap('filter_rentang_waktu') as catatan:
+        df_order_update = filter_rentang_waktu(tabel['df_order'], "order_purchase_timestamp", start_date, end_date)
+        df_order_items_update = filter_rentang_waktu(tabel['df_order_items'], "shipping_limit_date",
+                                                     start_date, end_date)
+        catatan['baris'] = len(df_order_update) + len(df_order_items_update)
+
+    # Indeks kelompok status dibuat sekali dan dipakai ulang oleh seluruh filter di kedua cabang
+    periksa_batal(cek_batal)
+    with tahap('create_kelompok_order') as catatan:
+        kelompok_order = create_kelompok_order(df_order_update)
+        catatan['baris'] = len(kelompok_order)
+
+    periksa_batal(cek_batal)
+    with tahap('create_cabang_seller_dan_customer'):
+        cabang = jalankan_paralel({'seller': (create_cabang_seller, df_order_items_update, tabel['df_product'],
+                                              tabel['df_sellers'], kelompok_order, cek_batal),
+                                   'customer': (create_cabang_customer, df_order_items_update, tabel['df_product'],
+                                                tabel['df_order_payments'], df_order_update, tabel['df_customer'],
+                                                kelompok_order, cek_batal)},
+                                  n_worker, cek_batal)
+
+    return {'pivot_seller': cabang['seller']['pivot_seller'],
+            'pivot_order': cabang['customer']['pivot_order'],
+            'df_sellers_merged': cabang['seller']['df_sellers_merged'],
+            'df_customer_merged': cabang['customer']['df_customer_merged'],
+            'kategori_di_kota_jual': cabang['seller']['kategori_di_kota_jual'],
+            'kategori_di_kota_beli': cabang['customer']['kategori_di_kota_beli'],
+            'df_customer_klaster': cabang['customer']['df_customer_klaster'],
+            'df_sellers_klaster': cabang['seller']['df_sellers_klaster']}
@@ -0,0 +1,223 @@
+"""
+Modul ini berisi instrumentasi waktu per tahap (wall time, puncak memori dan jumlah baris) untuk pipeline
+dan grafik dashboard. Instrumentasi hanya aktif selama ada sesi profil di thread yang sama (lihat mulai_sesi),
+sehingga tanpa sesi profil setiap tahap hanya menambah satu pengecekan.
+
+Penggunaan:
+    from analisis import profil
+
+    with profil.sesi('batch') as sesi:   # diakhiri walaupun terjadi exception, lalu ditulis ke file log
+        with profil.tahap('create_pivot_seller_and_order') as catatan:
+            pivot_seller, pivot_order = ...
+            catatan['baris'] = len(pivot_order)
+    hasil = sesi['tahap']
+
+Puncak memori diukur dengan tracemalloc (alokasi Python dan numpy), berlaku untuk seluruh proses
+sehingga sesi yang berjalan bersamaan di thread lain ikut terhitung.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Lokasi file log JSON Lines, satu baris untuk setiap sesi profil
+PATH_LOG = os.environ.get('ANALISIS_PROFIL_LOG', 'profil.jsonl')
+
+lokal = threading.local()
+lock_log = threading.Lock()
+
+# tracemalloc hanya dinyalakan selama masih ada sesi profil yang aktif (id sesi -> thread pemiliknya)
+lock_sesi = threading.Lock()
+sesi_aktif = {}
+
+def get_sesi():
+
+    """
+    Fungsi ini mengembalikan sesi profil yang aktif di thread ini, atau None jika tidak ada
+    """
+
+    return getattr(lokal, 'sesi', None)
+
+def mulai_sesi(label: str = '') -> dict:
+
+    """
+    Fungsi ini bertujuan untuk memulai sesi profil di thread ini. Seluruh tahap berikutnya di thread ini
+    dicatat ke sesi tersebut sampai selesai_sesi dipanggil.
+
+    Parameters:
+        label (str): Label sesi, misalnya rentang waktu yang dipilih
+
+    Returns:
+        sesi (dict): Sesi profil yang baru dimulai
+    """
+
+    sesi_lama = get_sesi()
+    lokal.sesi = {'waktu': datetime.datetime.now().isoformat(timespec='seconds'),
+                  'label': label,
+                  'thread': threading.current_thread().name,
+                  'tahap': [],
+                  'tumpukan': []}
+
+    with lock_sesi:
+        if sesi_lama is not None:
+            sesi_aktif.pop(id(sesi_lama), None)
+        # Sesi milik thread yang sudah berhenti tanpa selesai_sesi tidak lagi menahan tracemalloc
+        for kunci in [kunci for kunci, thread in sesi_aktif.items() if not thread.is_alive()]:
+            del sesi_aktif[kunci]
+        sesi_aktif[id(lokal.sesi)] = threading.current_thread()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    return lokal.sesi
+
+def selesai_sesi(path_log: str = PATH_LOG) -> list:
+
+    """
+    Fungsi ini bertujuan untuk mengakhiri sesi profil di thread ini dan menambahkannya ke file log JSON Lines
+
+    Parameters:
+        path_log (str): Lokasi file log, None berarti tidak ditulis ke file
+
+    Returns:
+        tahap (list): List dictionary berisi nama, level, detik, puncak_memori_mb dan baris setiap tahap
+    """
+
+    sesi = get_sesi()
+    if sesi is None:
+        return []
+
+    with lock_sesi:
+        lokal.sesi = None
+        sesi_aktif.pop(id(sesi), None)
+        if not sesi_aktif and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    sesi.pop('tumpukan')
+    if path_log:
+        with lock_log, open(path_log, 'a') as f:
+            f.write(json.dumps(sesi, default=str) + '\n')
+
+    return sesi['tahap']
+
+@contextlib.contextmanager
+def sesi(label: str = '', aktif: bool = True, path_log: str = PATH_LOG):
+
+    """
+    Context manager untuk satu sesi profil di thread ini. Sesi selalu diakhiri (selesai_sesi) walaupun blok
+    dihentikan oleh exception, misalnya rerun Streamlit saat widget berubah; sesi seperti itu ditandai 'terputus'.
+
+    Parameters:
+        label (str): Label sesi
+        aktif (bool): False berarti tidak ada sesi profil (menghasilkan None)
+        path_log (str): Lokasi file log, None berarti tidak ditulis ke file
+
+    Returns:
+        sesi (dict): Sesi profil yang berisi 'tahap' setelah blok selesai, atau None jika tidak aktif
+    """
+
+    if not aktif:
+        yield None
+        return
+
+    sesi_baru = mulai_sesi(label)
+    try:
+        yield sesi_baru
+    except BaseException:
+        sesi_baru['terputus'] = True
+        raise
+    finally:
+        if get_sesi() is sesi_baru:
+            selesai_sesi(path_log)
+
+@contextlib.contextmanager
+def tahap(nama: str):
+
+    """
+    Context manager untuk mencatat satu tahap. Dictionary yang dihasilkan dapat diisi 'baris' oleh pemanggil.
+    Tahap bersarang dicatat dengan level yang lebih dalam, dan puncak memorinya ikut dihitung pada tahap induk.
+
+    Parameters:
+        nama (str): Nama tahap
+    """
+
+    sesi = get_sesi()
+    catatan = {'nama': nama}
+    if sesi is None:
+        yield catatan
+        return
+
+    tumpukan = sesi['tumpukan']
+    # Puncak memori tahap induk sejauh ini disimpan sebelum penghitung puncak di-reset
+    if tumpukan:
+        tumpukan[-1]['puncak'] = max(tumpukan[-1]['puncak'], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    memori_awal = tracemalloc.get_traced_memory()[0]
+
+    bingkai = {'puncak': 0}
+    tumpukan.append(bingkai)
+    catatan['level'] = len(tumpukan) - 1
+    sesi['tahap'].append(catatan)
+
+    waktu_mulai = time.perf_counter()
+    try:
+        yield catatan
+    finally:
+        catatan['detik'] = time.perf_counter() - waktu_mulai
+        puncak = max(bingkai['puncak'], tracemalloc.get_traced_memory()[1])
+        catatan['puncak_memori_mb'] = max(puncak - memori_awal, 0) / 1e6
+        tumpukan.pop()
+        if tumpukan:
+            tumpukan[-1]['puncak'] = max(tumpukan[-1]['puncak'], puncak)
+
+def bawa_sesi(fungsi):
+
+    """
+    Fungsi ini bertujuan untuk membungkus fungsi yang akan dijalankan di thread lain (misalnya worker pool)
+    agar tahap-tahap di dalamnya tercatat di sesi profil thread pemanggil, dengan level di bawah tahap
+    yang sedang berjalan. Jika tidak ada sesi profil, fungsi dikembalikan apa adanya.
+
+    Parameters:
+        fungsi (callable): Fungsi yang akan dijalankan di thread lain
+
+    Returns:
+        fungsi (callable): Fungsi yang memakai sesi profil pemanggil selama dijalankan
+    """
+
+    sesi = get_sesi()
+    if sesi is None:
+        return fungsi
+
+    kedalaman = len(sesi['tumpukan'])
+
+    def fungsi_dengan_sesi(*args, **kwargs):
+        sesi_lama = get_sesi()
+        # List tahap dipakai bersama, tumpukan dibuat terpisah untuk setiap thread
+        lokal.sesi = {**sesi, 'tumpukan': [{'puncak': 0} for _ in range(kedalaman)]}
+        try:
+            return fungsi(*args, **kwargs)
+        finally:
+            lokal.sesi = sesi_lama
+
+    return fungsi_dengan_sesi
+
+def read_log(path_log: str = PATH_LOG) -> list:
+
+    """
+    Fungsi ini bertujuan untuk membaca seluruh sesi dari file log, misalnya untuk diagregasi antar sesi
+
+    Parameters:
+        path_log (str): Lokasi file log
+
+    Returns:
+        daftar_sesi (list): List sesi profil
+    """
+
+    if not os.path.exists(path_log):
+        return []
+
+    with open(path_log) as f:
+        return [json.loads(baris) for baris in f if baris.strip()]
@@ -0,0 +1,178 @@
+"""
+Modul ini berisi engine segmentasi untuk klaster customer dan seller. Setiap anggota diberi label segmen
+berupa kode integer (int8/int16) dengan np.searchsorted, lalu ringkasan per segmen (jumlah anggota, total,
+rata-rata, min dan max) dihitung dengan np.bincount tanpa menyimpan daftar anggota per segmen.
+
+Tiga cara pembagian segmen:
+    - batas tetap:   create_segmen_bin(nilai, [0, 70, 130, ..., inf])
+    - kuantil:       create_segmen_bin(nilai, get_batas_kuantil(nilai, 5))
+    - multi metrik:  create_segmen_rfm(df, {'recency': 5, 'frequency': 5, 'monetary': 5}) seperti segmentasi RFM
+"""
+
+import numpy as np
+import pandas as pd
+
+## Label segmen
+def get_dtype_kode(n_segmen: int) -> type:
+
+    """
+    Fungsi ini mengembalikan dtype integer terkecil untuk menyimpan kode n_segmen segmen (beserta kode -1)
+    """
+
+    return np.int8 if n_segmen < 2**7 else np.int16 if n_segmen < 2**15 else np.int32
+
+def create_segmen_bin(nilai: pd.Series, batas: list) -> np.ndarray:
+
+    """
+    Fungsi ini bertujuan untuk memberi kode segmen setiap nilai berdasarkan batas, dengan aturan yang sama seperti
+    pd.cut(nilai, bins=batas, include_lowest=True): segmen ke-i adalah (batas[i], batas[i+1]] dan segmen pertama
+    juga memuat batas[0]. Nilai kosong atau di luar batas mendapat kode -1.
+
+    Parameters:
+        nilai (pandas Series): Nilai yang disegmentasi
+        batas (list): Batas segmen yang urut naik, sebanyak jumlah segmen + 1
+
+    Returns:
+        kode (numpy ndarray): Kode segmen 0..len(batas)-2, atau -1
+    """
+
+    nilai = np.asarray(nilai, dtype=np.float64)
+    batas = np.asarray(batas, dtype=np.float64)
+
+    kode = np.searchsorted(batas[1:-1], nilai, side='left')
+    di_luar = np.isnan(nilai) | (nilai < batas[0]) | (nilai > batas[-1])
+
+    return np.where(di_luar, -1, kode).astype(get_dtype_kode(len(batas) - 1))
+
+def get_batas_kuantil(nilai: pd.Series, n_segmen: int) -> list:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan batas segmen kuantil (jumlah anggota setiap segmen hampir sama)
+    untuk dipakai di create_segmen_bin. Batas yang sama (misalnya karena banyak nilai kembar) digabung.
+
+    Parameters:
+        nilai (pandas Series): Nilai yang disegmentasi
+        n_segmen (int): Jumlah segmen yang diinginkan
+
+    Returns:
+        batas (list): Batas segmen yang urut naik
+    """
+
+    nilai = np.asarray(nilai, dtype=np.float64)
+    nilai = nilai[~np.isnan(nilai)]
+    if len(nilai) == 0:
+        return [0.0, 0.0]
+
+    return list(np.unique(np.quantile(nilai, np.linspace(0, 1, n_segmen + 1))))
+
+def create_segmen_rfm(df: pd.DataFrame, metrik: dict) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk membuat segmen gabungan dari beberapa metrik (misalnya recency, frequency dan
+    monetary). Setiap metrik diberi skor 1..n dari segmennya (kuantil jika n berupa int, atau batas tetap jika
+    berupa list), lalu skor seluruh metrik digabung menjadi satu kode integer.
+
+    Parameters:
+        df (pandas DataFrame): Data Frame berisi kolom-kolom metrik
+        metrik (dict): Dictionary nama kolom -> jumlah segmen kuantil (int) atau batas segmen (list)
+
+    Returns:
+        tuple(kode, label):
+        kode segmen gabungan (numpy ndarray, -1 jika salah satu metrik kosong) dan list label segmen
+        dengan format 'kolom1=skor|kolom2=skor|...' sesuai urutan kode
+    """
+
+    kode = np.zeros(len(df), dtype=np.int64)
+    kosong = np.zeros(len(df), dtype=bool)
+    daftar_skor = [[]]
+
+    for kolom, pembagian in metrik.items():
+        batas = get_batas_kuantil(df[kolom], pembagian) if isinstance(pembagian, int) else pembagian
+        n_segmen = len(batas) - 1
+        kode_metrik = create_segmen_bin(df[kolom], batas)
+
+        # Kode gabungan dengan basis campuran: kode * n_segmen + kode_metrik
+        kode = kode * n_segmen + np.maximum(kode_metrik, 0)
+        kosong |= kode_metrik < 0
+        daftar_skor = [skor + [f'{kolom}={i + 1}'] for skor in daftar_skor for i in range(n_segmen)]
+
+    label = ['|'.join(skor) for skor in daftar_skor]
+    kode = np.where(kosong, -1, kode).astype(get_dtype_kode(len(label)))
+
+    return kode, label
+
+## Ringkasan segmen
+def ringkas_segmen(kode: np.ndarray, nilai: pd.Series, label: list, nama_jumlah: str, nama_nilai: str) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menghitung jumlah anggota serta total, rata-rata, min dan max nilai setiap segmen
+    dengan np.bincount. Segmen tanpa anggota tetap ditampilkan dengan jumlah 0.
+
+    Parameters:
+        kode (numpy ndarray): Kode segmen dari create_segmen_bin atau create_segmen_rfm
+        nilai (pandas Series): Nilai yang diringkas (misalnya payment_value_sum)
+        label (list): Label setiap segmen sesuai urutan kode
+        nama_jumlah (str): Nama kolom jumlah anggota, misalnya 'customer_id_count'
+        nama_nilai (str): Awalan nama kolom ringkasan nilai, misalnya 'payment_value_sum'
+
+    Returns:
+        ringkasan (pandas DataFrame): Satu baris per segmen dengan index bernama 'Klaster'
+    """
+
+    n_segmen = len(label)
+    nilai = np.asarray(nilai, dtype=np.float64)
+    masuk = kode >= 0
+    kode, nilai = kode[masuk].astype(np.intp), nilai[masuk]
+
+    jumlah = np.bincount(kode, minlength=n_segmen)
+    total = np.bincount(kode, weights=nilai, minlength=n_segmen)
+
+    minimum = np.full(n_segmen, np.inf)
+    maksimum = np.full(n_segmen, -np.inf)
+    np.minimum.at(minimum, kode, nilai)
+    np.maximum.at(maksimum, kode, nilai)
+    ada = jumlah > 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rata_rata = total / jumlah
+
+    return pd.DataFrame({nama_jumlah: jumlah,
+                         f'{nama_nilai}_total': total,
+                         f'{nama_nilai}_mean': np.where(ada, rata_rata, np.nan),
+                         f'{nama_nilai}_min': np.where(ada, minimum, np.nan),
+                         f'{nama_nilai}_max': np.where(ada, maksimum, np.nan)},
+                        index=pd.CategoricalIndex(label, categories=label, ordered=True, name='Klaster'))
+
+def gabung_ringkasan_segmen(ringkasan_lama: pd.DataFrame, ringkasan_baru: pd.DataFrame, nama_jumlah: str,
+                            nama_nilai: str) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk menggabungkan dua hasil ringkas_segmen dengan label yang sama, misalnya ringkasan
+    anggota lama dan ringkasan anggota baru, tanpa membaca ulang nilai setiap anggota
+
+    Parameters:
+        ringkasan_lama (pandas DataFrame): Hasil ringkas_segmen dari anggota lama
+        ringkasan_baru (pandas DataFrame): Hasil ringkas_segmen dari anggota baru
+        nama_jumlah (str): Nama kolom jumlah anggota, misalnya 'customer_id_count'
+        nama_nilai (str): Awalan nama kolom ringkasan nilai, misalnya 'payment_value_sum'
+
+    Returns:
+        ringkasan (pandas DataFrame): Ringkasan gabungan dengan kolom dan index yang sama
+    """
+
+    jumlah = ringkasan_lama[nama_jumlah].to_numpy() + ringkasan_baru[nama_jumlah].to_numpy()
+    total = ringkasan_lama[f'{nama_nilai}_total'].to_numpy() + ringkasan_baru[f'{nama_nilai}_total'].to_numpy()
+    ada = jumlah > 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rata_rata = total / jumlah
+
+    # fmin dan fmax mengabaikan NaN dari segmen tanpa anggota
+    return pd.DataFrame({nama_jumlah: jumlah,
+                         f'{nama_nilai}_total': total,
+                         f'{nama_nilai}_mean': np.where(ada, rata_rata, np.nan),
+                         f'{nama_nilai}_min': np.fmin(ringkasan_lama[f'{nama_nilai}_min'].to_numpy(),
+                                                      ringkasan_baru[f'{nama_nilai}_min'].to_numpy()),
+                         f'{nama_nilai}_max': np.fmax(ringkasan_lama[f'{nama_nilai}_max'].to_numpy(),
+                                                      ringkasan_baru[f'{nama_nilai}_max'].to_numpy())},
+                        index=ringkasan_lama.index)
@@ -0,0 +1,308 @@
+"""
+Perintah untuk membuat data sintetis berbentuk data Olist (keenam tabel *_clean.csv dengan skema yang sama
+seperti analisis/loader.py) pada skala yang dapat diatur, untuk keperluan benchmark (lihat analisis/benchmark.py).
+Tabel order, order_items, order_payments dan customer ditulis per potongan sehingga skala puluhan juta
+barang tidak perlu disimpan seluruhnya di memori.
+
+Penggunaan:
+    python -m analisis.sintetis --n-barang 100000 --data-dir data_benchmark [--seed 0]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis.loader import get_path_csv
+
+## Parameter data sintetis
+# Rentang waktu order sama dengan data asli
+WAKTU_AWAL = pd.Timestamp('2016-09-04')
+WAKTU_AKHIR = pd.Timestamp('2018-09-03 23:59:59')
+
+# Kota (city, state) beserta bobot kemunculannya
+KOTA = [('sao paulo', 'SP', 155), ('rio de janeiro', 'RJ', 69), ('belo horizonte', 'MG', 28),
+        ('brasilia', 'DF', 21), ('curitiba', 'PR', 15), ('campinas', 'SP', 15), ('porto alegre', 'RS', 14),
+        ('salvador', 'BA', 12), ('guarulhos', 'SP', 12), ('sao bernardo do campo', 'SP', 9),
+        ('niteroi', 'RJ', 8), ('santo andre', 'SP', 8), ('osasco', 'SP', 7), ('santos', 'SP', 7),
+        ('goiania', 'GO', 7), ('sao jose dos campos', 'SP', 7), ('fortaleza', 'CE', 7), ('sorocaba', 'SP', 6),
+        ('recife', 'PE', 6), ('florianopolis', 'SC', 6), ('jundiai', 'SP', 6), ('ribeirao preto', 'SP', 5),
+        ('belem', 'PA', 4), ('barueri', 'SP', 4), ('juiz de fora', 'MG', 4), ('londrina', 'PR', 4),
+        ('maringa', 'PR', 3), ('uberlandia', 'MG', 3), ('vitoria', 'ES', 3), ('manaus', 'AM', 3),
+        ('joinville', 'SC', 3), ('ibitinga', 'SP', 3), ('piracicaba', 'SP', 3), ('mogi das cruzes', 'SP', 3),
+        ('natal', 'RN', 2), ('campo grande', 'MS', 2), ('cuiaba', 'MT', 2), ('joao pessoa', 'PB', 2),
+        ('sao luis', 'MA', 2), ('maceio', 'AL', 2), ('teresina', 'PI', 1), ('aracaju', 'SE', 1),
+        ('porto velho', 'RO', 1), ('palmas', 'TO', 1), ('macapa', 'AP', 1), ('boa vista', 'RR', 1),
+        ('rio branco', 'AC', 1)]
+
+# Kategori barang beserta bobot kemunculannya
+KATEGORI = [('cama_mesa_banho', 111), ('beleza_saude', 96), ('esporte_lazer', 86), ('moveis_decoracao', 83),
+            ('informatica_acessorios', 78), ('utilidades_domesticas', 70), ('relogios_presentes', 59),
+            ('telefonia', 45), ('ferramentas_jardim', 44), ('automotivo', 42), ('brinquedos', 41),
+            ('cool_stuff', 38), ('perfumaria', 35), ('bebes', 30), ('eletronicos', 28), ('papelaria', 25),
+            ('fashion_bolsas_e_acessorios', 21), ('pet_shop', 19), ('moveis_escritorio', 17),
+            ('consoles_games', 11), ('malas_acessorios', 11), ('construcao_ferramentas_construcao', 10),
+            ('eletrodomesticos', 8), ('instrumentos_musicais', 7), ('eletroportateis', 7), ('casa_construcao', 6),
+            ('livros_interesse_geral', 6), ('alimentos', 5), ('moveis_sala', 5), ('casa_conforto', 4),
+            ('bebidas', 4), ('audio', 4), ('market_place', 3), ('construcao_ferramentas_iluminacao', 3),
+            ('climatizacao', 3), ('moveis_cozinha_area_de_servico_jantar_e_jardim', 3), ('alimentos_bebidas', 3),
+            ('industria_comercio_e_negocios', 2), ('livros_tecnicos', 2), ('telefonia_fixa', 2),
+            ('fashion_calcados', 2), ('eletrodomesticos_2', 2), ('agro_industria_e_comercio', 2),
+            ('artes', 2), ('pcs', 2), ('sinalizacao_e_seguranca', 2), ('artigos_de_festas', 1),
+            ('fashion_roupa_masculina', 1), ('flores', 1), ('seguros_e_servicos', 1)]
+
+# Status order beserta bobot kemunculannya
+STATUS_ORDER = [('delivered', 9702), ('shipped', 111), ('canceled', 63), ('unavailable', 61),
+                ('invoiced', 31), ('processing', 30), ('created', 1), ('approved', 1)]
+
+JENIS_PEMBAYARAN = [('credit_card', 74), ('boleto', 19), ('voucher', 5), ('debit_card', 2)]
+
+## Fungsi pembantu
+def get_peluang(daftar: list) -> np.ndarray:
+
+    """
+    Fungsi ini mengubah bobot pada elemen terakhir setiap tuple di daftar menjadi peluang yang berjumlah 1
+    """
+
+    bobot = np.array([item[-1] for item in daftar], dtype='float64')
+
+    return bobot / bobot.sum()
+
+def create_id_hex(rng: np.random.Generator, n: int) -> np.ndarray:
+
+    """
+    Fungsi ini bertujuan untuk membuat n ID acak berupa string hex 32 karakter (seperti ID pada data Olist)
+    tanpa perulangan Python
+
+    Parameters:
+        rng (numpy Generator): Pembangkit bilangan acak
+        n (int): Jumlah ID
+
+    Returns:
+        id_hex (numpy array): Array string hex 32 karakter
+    """
+
+    acak = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    huruf = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    ascii_hex = np.empty((n, 32), dtype=np.uint8)
+    ascii_hex[:, 0::2] = huruf[acak >> 4]
+    ascii_hex[:, 1::2] = huruf[acak & 15]
+
+    return ascii_hex.view('S32').ravel().astype('U32')
+
+def format_waktu(detik: np.ndarray) -> np.ndarray:
+
+    """
+    Fungsi ini mengubah array detik sejak epoch menjadi string 'YYYY-MM-DD HH:MM:SS' tanpa perulangan Python
+    """
+
+    teks = np.datetime_as_string(detik.astype('datetime64[s]')).astype('S19')
+    ascii_teks = teks.view(np.uint8).reshape(-1, 19).copy()
+    ascii_teks[:, 10] = ord(' ')
+
+    return ascii_teks.view('S19').ravel().astype('U19')
+
+def get_peluang_zipf(n: int, eksponen: float = 1.1) -> np.ndarray:
+
+    """
+    Fungsi ini mengembalikan peluang berdistribusi Zipf untuk n elemen (elemen pertama paling sering muncul)
+    """
+
+    bobot = 1.0 / np.arange(1, n + 1) ** eksponen
+
+    return bobot / bobot.sum()
+
+def write_csv(df: pd.DataFrame, path: str, potongan_pertama: bool):
+
+    """
+    Fungsi ini menulis df ke path, dengan header untuk potongan pertama dan ditambahkan (append) untuk potongan berikutnya
+    """
+
+    df.to_csv(path, index=False, header=potongan_pertama, mode='w' if potongan_pertama else 'a')
+
+## Membuat tabel sintetis
+def create_df_sellers_sintetis(rng: np.random.Generator, n_seller: int) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat tabel seller sintetis dengan kolom seperti df_sellers_clean.csv
+    """
+
+    kota = rng.choice(len(KOTA), size=n_seller, p=get_peluang(KOTA))
+
+    return pd.DataFrame({'seller_id': create_id_hex(rng, n_seller),
+                         'seller_zip_code_prefix': rng.integers(1000, 99999, n_seller),
+                         'seller_city': [KOTA[i][0] for i in kota],
+                         'seller_state': [KOTA[i][1] for i in kota]})
+
+def create_df_product_sintetis(rng: np.random.Generator, n_produk: int) -> pd.DataFrame:
+
+    """
+    Fungsi ini bertujuan untuk membuat tabel produk sintetis dengan kolom seperti df_product_clean.csv
+    """
+
+    kategori = rng.choice(len(KATEGORI), size=n_produk, p=get_peluang(KATEGORI))
+
+    return pd.DataFrame({'product_id': create_id_hex(rng, n_produk),
+                         'product_category_name': [KATEGORI[i][0] for i in kategori]})
+
+def create_potongan_order(rng: np.random.Generator,
+                          n_barang: int,
+                          df_product: pd.DataFrame,
+                          df_sellers: pd.DataFrame,
+                          peluang_produk: np.ndarray,
+                          peluang_seller: np.ndarray) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat satu potongan tabel customer, order, order_items dan order_payments
+    yang berisi tepat n_barang baris order_items
+
+    Parameters:
+        rng (numpy Generator): Pembangkit bilangan acak
+        n_barang (int): Jumlah baris order_items pada potongan ini
+        df_product (pandas DataFrame): Tabel produk sintetis
+        df_sellers (pandas DataFrame): Tabel seller sintetis
+        peluang_produk (numpy array): Peluang setiap produk dibeli
+        peluang_seller (numpy array): Peluang setiap seller menjual
+
+    Returns:
+        potongan (dict): Dictionary berisi nama tabel dan Data Frame potongannya
+    """
+
+    # Jumlah barang per order (rata-rata sekitar 1,15 seperti data asli), dipotong agar totalnya tepat n_barang
+    jumlah_barang = rng.geometric(0.87, size=n_barang)
+    kumulatif = np.cumsum(jumlah_barang)
+    n_order = int(np.searchsorted(kumulatif, n_barang)) + 1
+    jumlah_barang = jumlah_barang[:n_order]
+    jumlah_barang[-1] -= kumulatif[n_order - 1] - n_barang
+
+    ## Customer (satu customer_id untuk setiap order, seperti data asli)
+    kota = rng.choice(len(KOTA), size=n_order, p=get_peluang(KOTA))
+    customer_id = create_id_hex(rng, n_order)
+    df_customer = pd.DataFrame({'customer_id': customer_id,
+                                'customer_unique_id': create_id_hex(rng, n_order),
+                                'customer_zip_code_prefix': rng.integers(1000, 99999, n_order),
+                                'customer_city': np.array([k[0] for k in KOTA])[kota],
+                                'customer_state': np.array([k[1] for k in KOTA])[kota]})
+
+    ## Order (jumlah order meningkat seiring waktu)
+    detik_awal = WAKTU_AWAL.value // 10**9
+    detik_akhir = WAKTU_AKHIR.value // 10**9
+    waktu_order = detik_awal + (np.sqrt(rng.random(n_order)) * (detik_akhir - detik_awal)).astype('int64')
+    order_id = create_id_hex(rng, n_order)
+    status = rng.choice(len(STATUS_ORDER), size=n_order, p=get_peluang(STATUS_ORDER))
+    df_order = pd.DataFrame({'order_id': order_id,
+                             'customer_id': customer_id,
+                             'order_status': np.array([s[0] for s in STATUS_ORDER])[status],
+                             'order_purchase_timestamp': format_waktu(waktu_order)})
+
+    ## Order items (batas pengiriman 2-10 hari setelah order)
+    indeks_order = np.repeat(np.arange(n_order), jumlah_barang)
+    awal_order = np.cumsum(jumlah_barang) - jumlah_barang
+    price = np.round(rng.gamma(1.5, 80.0, n_barang) + 1.0, 2)
+    freight_value = np.round(rng.gamma(3.0, 7.0, n_barang), 2)
+    waktu_kirim = waktu_order[indeks_order] + rng.integers(2 * 86400, 10 * 86400, n_barang)
+    df_order_items = pd.DataFrame({'order_id': order_id[indeks_order],
+                                   'order_item_id': np.arange(n_barang) - awal_order[indeks_order] + 1,
+                                   'product_id': df_product['product_id'].values[
+                                       rng.choice(len(df_product), size=n_barang, p=peluang_produk)],
+                                   'seller_id': df_sellers['seller_id'].values[
+                                       rng.choice(len(df_sellers), size=n_barang, p=peluang_seller)],
+                                   'shipping_limit_date': format_waktu(waktu_kirim),
+                                   'price': price,
+                                   'freight_value': freight_value})
+
+    ## Order payments (sekitar 3% order dibayar sebagian dengan voucher)
+    total_bayar = np.bincount(indeks_order, weights=price + freight_value, minlength=n_order)
+    jenis = rng.choice(len(JENIS_PEMBAYARAN), size=n_order, p=get_peluang(JENIS_PEMBAYARAN))
+    jenis_pembayaran = np.array([j[0] for j in JENIS_PEMBAYARAN])[jenis]
+    cicilan = np.where(jenis_pembayaran == 'credit_card', rng.integers(1, 11, n_order), 1)
+    voucher = rng.random(n_order) < 0.03
+    nilai_voucher = np.round(total_bayar * rng.uniform(0.1, 0.5, n_order), 2) * voucher
+
+    df_bayar_utama = pd.DataFrame({'order_id': order_id,
+                                   'payment_sequential': 1,
+                                   'payment_type': jenis_pembayaran,
+                                   'payment_installments': cicilan,
+                                   'payment_value': np.round(total_bayar - nilai_voucher, 2)})
+    df_bayar_voucher = pd.DataFrame({'order_id': order_id[voucher],
+                                     'payment_sequential': 2,
+                                     'payment_type': 'voucher',
+                                     'payment_installments': 1,
+                                     'payment_value': nilai_voucher[voucher]})
+
+    return {'df_customer': df_customer,
+            'df_order': df_order,
+            'df_order_items': df_order_items,
+            'df_order_payments': pd.concat([df_bayar_utama, df_bayar_voucher], ignore_index=True)}
+
+def create_data_sintetis(n_barang: int,
+                         data_dir: str,
+                         seed: int = 0,
+                         ukuran_potongan: int = 1_000_000) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat keenam tabel *_clean.csv sintetis di data_dir dengan total n_barang
+    baris order_items. Jumlah produk dan seller ikut diskalakan dengan n_barang.
+
+    Parameters:
+        n_barang (int): Jumlah baris order_items (misalnya 10 ribu sampai 50 juta)
+        data_dir (str): Folder tujuan file CSV
+        seed (int): Seed pembangkit bilangan acak, seed yang sama menghasilkan data yang sama
+        ukuran_potongan (int): Jumlah baris order_items yang dibuat dan ditulis sekaligus
+
+    Returns:
+        jumlah_baris (dict): Dictionary berisi nama tabel dan jumlah barisnya
+    """
+
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    n_produk = int(np.clip(n_barang // 4, 100, 300_000))
+    n_seller = int(np.clip(n_barang // 35, 20, 30_000))
+
+    df_product = create_df_product_sintetis(rng, n_produk)
+    df_sellers = create_df_sellers_sintetis(rng, n_seller)
+    write_csv(df_product, get_path_csv('df_product', data_dir), True)
+    write_csv(df_sellers, get_path_csv('df_sellers', data_dir), True)
+
+    # Popularitas produk dan seller berdistribusi Zipf
+    peluang_produk = get_peluang_zipf(n_produk)
+    peluang_seller = get_peluang_zipf(n_seller)
+
+    jumlah_baris = {'df_product': n_produk, 'df_sellers': n_seller,
+                    'df_customer': 0, 'df_order': 0, 'df_order_items': 0, 'df_order_payments': 0}
+
+    sisa_barang = n_barang
+    potongan_pertama = True
+    while sisa_barang > 0:
+        n_potongan = min(ukuran_potongan, sisa_barang)
+        potongan = create_potongan_order(rng, n_potongan, df_product, df_sellers, peluang_produk, peluang_seller)
+        for nama, df in potongan.items():
+            write_csv(df, get_path_csv(nama, data_dir), potongan_pertama)
+            jumlah_baris[nama] += len(df)
+        sisa_barang -= n_potongan
+        potongan_pertama = False
+
+    return jumlah_baris
+
+def main():
+    parser = argparse.ArgumentParser(description='Membuat data sintetis berbentuk data Olist untuk benchmark')
+    parser.add_argument('--n-barang', type=int, default=100_000,
+                        help='Jumlah baris order_items, misalnya 10000 sampai 50000000 (default: %(default)s)')
+    parser.add_argument('--data-dir', default='data_benchmark', help='Folder tujuan (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed bilangan acak (default: %(default)s)')
+    args = parser.parse_args()
+
+    if args.n_barang < 1:
+        parser.error('--n-barang harus lebih besar dari 0')
+
+    waktu_mulai = time.perf_counter()
+    jumlah_baris = create_data_sintetis(args.n_barang, args.data_dir, args.seed)
+    for nama, n in jumlah_baris.items():
+        print(f'{nama}: {n} baris -> {get_path_csv(nama, args.data_dir)}')
+    print(f'Selesai dalam {time.perf_counter() - waktu_mulai:.2f} detik')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""
+Modul ini berisi mode top-K perkiraan untuk grafik Pertanyaan 1-4. Setiap dimensi (state, kota, id dan pasangan
+kota-kategori) diringkas per bulan menjadi sketsa heavy-hitter berukuran tetap (K_SKETSA key terbesar,
+seperti Space-Saving yang dapat digabung). Query rentang waktu cukup menggabungkan sketsa bulan-bulan yang
+seluruhnya masuk rentang, ditambah agregat tepat dari baris kubus di bulan-bulan tepi, sehingga biayanya
+tidak bergantung pada jumlah baris kubus.
+
+Batas error: setiap kali sketsa dipotong menjadi K_SKETSA key, nilai absolut terbesar yang dibuang dicatat.
+Jumlah seluruh nilai tersebut (batas_error) membatasi selisih nilai perkiraan setiap key dengan nilai tepatnya,
+dan key yang tidak ada di sketsa memiliki nilai absolut tidak lebih dari batas_error.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analisis.kubus import get_nomor_hari
+
+# Jumlah key yang disimpan setiap sketsa
+K_SKETSA = 1024
+
+# Dimensi sketsa: nama -> (nama kubus, kolom key, kolom nilai)
+DIMENSI_SKETSA = {'seller_state': ('seller', ['seller_state'], 'price_sum'),
+                  'seller_city': ('seller', ['seller_city'], 'price_sum'),
+                  'seller_id': ('seller', ['seller_id'], 'price_sum'),
+                  'customer_state': ('order', ['customer_state'], 'payment_value_sum'),
+                  'customer_city': ('order', ['customer_city'], 'payment_value_sum'),
+                  'customer_id': ('order', ['customer_id'], 'payment_value_sum'),
+                  'kategori_di_kota_jual': ('seller', ['seller_city', 'product_category_name'], 'jumlah_barang'),
+                  'kategori_di_kota_beli': ('kategori_customer', ['customer_city', 'product_category_name'],
+                                            'jumlah_barang')}
+
+class SketsaTopK:
+
+    """
+    Sketsa heavy-hitter berisi paling banyak k pasangan (key integer, nilai) dengan nilai absolut terbesar
+    beserta batas error-nya. Dua sketsa dapat digabung tanpa membaca ulang data asalnya.
+
+    Parameters:
+        kunci (numpy ndarray): Key integer (kode category)
+        nilai (numpy ndarray): Nilai untuk setiap key
+        error (float): Batas error sketsa
+        k (int): Jumlah maksimum key yang disimpan
+    """
+
+    def __init__(self, kunci: np.ndarray, nilai: np.ndarray, error: float = 0.0, k: int = K_SKETSA):
+        self.k = k
+        self.error = error
+        self.kunci, self.nilai = kunci, nilai
+        self.potong()
+
+    def potong(self):
+
+        """
+        Fungsi ini bertujuan untuk menyimpan k key dengan nilai absolut terbesar dan menambahkan nilai absolut
+        terbesar yang dibuang ke batas error
+        """
+
+        if len(self.kunci) <= self.k:
+            return
+
+        urutan = np.argpartition(-np.abs(self.nilai), self.k)
+        dibuang = urutan[self.k:]
+        self.error += float(np.abs(self.nilai[dibuang]).max())
+        self.kunci, self.nilai = self.kunci[urutan[:self.k]], self.nilai[urutan[:self.k]]
+
+    @classmethod
+    def dari_data(cls, kunci: np.ndarray, nilai: np.ndarray, error: float = 0.0, k: int = K_SKETSA) -> 'SketsaTopK':
+
+        """
+        Fungsi ini membuat sketsa dari pasangan key dan nilai (key boleh berulang, nilainya dijumlahkan)
+        """
+
+        kunci_unik, posisi = np.unique(kunci, return_inverse=True)
+        total = np.bincount(posisi, weights=nilai, minlength=len(kunci_unik))
+
+        return cls(kunci_unik, total, error, k)
+
+    @classmethod
+    def gabung(cls, daftar_sketsa: list, kunci: np.ndarray = None, nilai: np.ndarray = None,
+               k: int = K_SKETSA) -> 'SketsaTopK':
+
+        """
+        Fungsi ini bertujuan untuk menggabungkan beberapa sketsa, ditambah pasangan key dan nilai tepat (opsional)
+
+        Parameters:
+            daftar_sketsa (list): List SketsaTopK
+            kunci (numpy ndarray): Key tambahan yang dihitung tepat
+            nilai (numpy ndarray): Nilai untuk key tambahan
+            k (int): Jumlah maksimum key sketsa hasil
+
+        Returns:
+            sketsa (SketsaTopK): Sketsa gabungan dengan batas error = jumlah batas error seluruh sketsa
+        """
+
+        daftar_kunci = [sketsa.kunci for sketsa in daftar_sketsa]
+        daftar_nilai = [sketsa.nilai for sketsa in daftar_sketsa]
+        if kunci is not None:
+            daftar_kunci.append(kunci)
+            daftar_nilai.append(nilai)
+
+        error = sum(sketsa.error for sketsa in daftar_sketsa)
+        if not daftar_kunci:
+            return cls(np.array([], dtype=np.int64), np.array([], dtype=np.float64), error, k)
+
+        return cls.dari_data(np.concatenate(daftar_kunci), np.concatenate(daftar_nilai), error, k)
+
+## Key integer dari kolom category
+def get_kunci(df_kubus: pd.DataFrame, kolom_key: list) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk mengubah satu atau dua kolom category menjadi satu key integer.
+    Baris dengan nilai kosong di salah satu kolom dibuang (sama seperti groupby dengan dropna=True).
+
+    Returns:
+        tuple(kunci, mask): key int64 untuk baris yang dipakai dan boolean mask baris tersebut
+    """
+
+    kunci = np.zeros(len(df_kubus), dtype=np.int64)
+    mask = np.ones(len(df_kubus), dtype=bool)
+    for kolom in kolom_key:
+        kode = df_kubus[kolom].array.codes.astype(np.int64)
+        kunci = kunci * len(df_kubus[kolom].cat.categories) + kode
+        mask &= kode >= 0
+
+    return kunci[mask], mask
+
+def decode_kunci(kunci: np.ndarray, df_kubus: pd.DataFrame, kolom_key: list) -> pd.Index:
+
+    """
+    Fungsi ini mengubah key integer kembali menjadi Index (atau MultiIndex untuk dua kolom) berisi nilai asli
+    """
+
+    daftar_nilai = []
+    for kolom in reversed(kolom_key):
+        kategori = df_kubus[kolom].cat.categories
+        daftar_nilai.insert(0, kategori[kunci % len(kategori)])
+        kunci = kunci // len(kategori)
+
+    if len(daftar_nilai) == 1:
+        return pd.Index(daftar_nilai[0], name=kolom_key[0])
+
+    return pd.MultiIndex.from_arrays(daftar_nilai, names=kolom_key)
+
+def ubah_kunci(kunci: np.ndarray, ukuran_lama: list, ukuran_baru: list) -> np.ndarray:
+
+    """
+    Fungsi ini mengubah key integer yang dibuat dengan ukuran kamus ukuran_lama menjadi key untuk ukuran kamus
+    ukuran_baru (kamus hanya ditambah di akhir, sehingga kode setiap kolom tidak berubah)
+    """
+
+    daftar_kode = []
+    for ukuran in reversed(ukuran_lama):
+        daftar_kode.insert(0, kunci % ukuran)
+        kunci = kunci // ukuran
+
+    kunci_baru = np.zeros(len(daftar_kode[0]), dtype=np.int64)
+    for kode, ukuran in zip(daftar_kode, ukuran_baru):
+        kunci_baru = kunci_baru * ukuran + kode
+
+    return kunci_baru
+
+## Sketsa per bulan
+def get_nomor_bulan(hari: np.ndarray) -> np.ndarray:
+
+    """
+    Fungsi ini mengembalikan nomor hari awal bulan (lihat analisis.kubus.get_nomor_hari) untuk setiap nomor hari
+    """
+
+    return hari.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+def create_sketsa_bulan(df_bulan: pd.DataFrame, kolom_key: list, kolom_nilai: str, k: int = K_SKETSA) -> SketsaTopK:
+
+    """
+    Fungsi ini membuat sketsa satu dimensi dari baris kubus satu bulan
+    """
+
+    kunci, mask = get_kunci(df_bulan, kolom_key)
+
+    return SketsaTopK.dari_data(kunci, df_bulan[kolom_nilai].to_numpy(np.float64)[mask], k=k)
+
+def create_sketsa_kubus(kubus: dict, k: int = K_SKETSA) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk membuat sketsa setiap dimensi di DIMENSI_SKETSA untuk setiap bulan (berdasarkan
+    hari_awal kubus), beserta posisi baris dan hari_akhir maksimum setiap bulan di setiap kubus
+
+    Parameters:
+        kubus (dict): Hasil analisis.kubus.create_kubus
+        k (int): Jumlah key setiap sketsa
+
+    Returns:
+        sketsa_kubus (dict): Dictionary berisi 'bulan' (info bulan per kubus) dan 'sketsa' (list sketsa per dimensi)
+    """
+
+    info_bulan = {}
+    for nama, df_kubus in kubus.items():
+        daftar_bulan, posisi = np.unique(get_nomor_bulan(df_kubus['hari_awal'].to_numpy()), return_index=True)
+        batas_baris = np.append(posisi, len(df_kubus))
+        hari_akhir_maks = np.maximum.reduceat(df_kubus['hari_akhir'].to_numpy(), posisi) if len(posisi) else posisi
+        info_bulan[nama] = {'hari_mulai': daftar_bulan,
+                            'batas_baris': batas_baris,
+                            'hari_akhir_maks': hari_akhir_maks}
+
+    sketsa = {}
+    for dimensi, (nama, kolom_key, kolom_nilai) in DIMENSI_SKETSA.items():
+        df_kubus = kubus[nama]
+        batas_baris = info_bulan[nama]['batas_baris']
+        sketsa[dimensi] = []
+        for awal, akhir in zip(batas_baris[:-1], batas_baris[1:]):
+            sketsa[dimensi].append(create_sketsa_bulan(df_kubus.iloc[awal:akhir], kolom_key, kolom_nilai, k))
+
+    return {'bulan': info_bulan, 'sketsa': sketsa, 'k': k}
+
+def append_sketsa_kubus(sketsa_kubus: dict, kubus_lama: dict, kubus: dict, kubus_delta: dict) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk memperbarui hasil create_sketsa_kubus setelah kubus_delta ditambahkan ke kubus_lama
+    (lihat analisis.kubus.append_kubus). Hanya bulan yang memiliki baris delta yang dibuat ulang dari baris kubus
+    bulan tersebut; sketsa bulan lain dipakai ulang (key-nya disesuaikan jika kamus kolom key bertambah), sehingga
+    hasilnya sama dengan create_sketsa_kubus(kubus).
+
+    Parameters:
+        sketsa_kubus (dict): Hasil create_sketsa_kubus dari kubus_lama
+        kubus_lama (dict): Kubus sebelum delta ditambahkan
+        kubus (dict): Kubus gabungan hasil append_kubus
+        kubus_delta (dict): Kubus dari baris delta
+
+    Returns:
+        sketsa_kubus (dict): Sketsa untuk kubus gabungan
+    """
+
+    k = sketsa_kubus['k']
+
+    info_bulan, disentuh, indeks_lama = {}, {}, {}
+    for nama, df_kubus in kubus.items():
+        info = sketsa_kubus['bulan'][nama]
+        bulan_delta = np.unique(get_nomor_bulan(kubus_delta[nama]['hari_awal'].to_numpy()))
+        hari_mulai = np.union1d(info['hari_mulai'], bulan_delta)
+        batas_baris = np.append(np.searchsorted(df_kubus['hari_awal'].to_numpy(), hari_mulai, side='left'),
+                                len(df_kubus))
+        disentuh[nama] = np.isin(hari_mulai, bulan_delta)
+        indeks_lama[nama] = np.searchsorted(info['hari_mulai'], hari_mulai)
+
+        hari_akhir = df_kubus['hari_akhir'].to_numpy()
+        hari_akhir_maks = np.empty(len(hari_mulai), dtype=hari_akhir.dtype)
+        hari_akhir_maks[~disentuh[nama]] = info['hari_akhir_maks'][indeks_lama[nama][~disentuh[nama]]]
+        for i in np.flatnonzero(disentuh[nama]):
+            hari_akhir_maks[i] = hari_akhir[batas_baris[i]:batas_baris[i + 1]].max()
+
+        info_bulan[nama] = {'hari_mulai': hari_mulai,
+                            'batas_baris': batas_baris,
+                            'hari_akhir_maks': hari_akhir_maks}
+
+    sketsa = {}
+    for dimensi, (nama, kolom_key, kolom_nilai) in DIMENSI_SKETSA.items():
+        df_kubus = kubus[nama]
+        batas_baris = info_bulan[nama]['batas_baris']
+        ukuran_lama = [len(kubus_lama[nama][kolom].cat.categories) for kolom in kolom_key]
+        ukuran_baru = [len(df_kubus[kolom].cat.categories) for kolom in kolom_key]
+
+        sketsa[dimensi] = []
+        for i, (awal, akhir) in enumerate(zip(batas_baris[:-1], batas_baris[1:])):
+            if disentuh[nama][i]:
+                sketsa[dimensi].append(create_sketsa_bulan(df_kubus.iloc[awal:akhir], kolom_key, kolom_nilai, k))
+                continue
+
+            sketsa_lama = sketsa_kubus['sketsa'][dimensi][indeks_lama[nama][i]]
+            if ukuran_lama != ukuran_baru:
+                sketsa_lama = SketsaTopK(ubah_kunci(sketsa_lama.kunci, ukuran_lama, ukuran_baru), sketsa_lama.nilai,
+                                         sketsa_lama.error, sketsa_lama.k)
+            sketsa[dimensi].append(sketsa_lama)
+
+    return {'bulan': info_bulan, 'sketsa': sketsa, 'k': k}
+
+def query_ringkasan_sketsa(kubus: dict, sketsa_kubus: dict, start_date, end_date) -> dict:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan ringkasan seperti analisis.kubus.query_ringkasan_kubus dari sketsa.
+    Bulan yang seluruh barisnya masuk rentang waktu memakai sketsa, baris kubus di bulan tepi dihitung tepat.
+
+    Parameters:
+        kubus (dict): Hasil create_kubus
+        sketsa_kubus (dict): Hasil create_sketsa_kubus dari kubus yang sama
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+
+    Returns:
+        ringkasan (dict): Dictionary berisi Series perkiraan (hanya key di sketsa) dengan nama dimensi sebagai key,
+                          serta 'batas_error' berisi batas error setiap dimensi
+    """
+
+    hari_mulai = get_nomor_hari(start_date)
+    hari_selesai = get_nomor_hari(end_date)
+
+    # Baris tepi setiap kubus: bulan di dalam rentang yang sebagian barisnya berada di luar rentang
+    baris_tepi = {}
+    bulan_penuh = {}
+    for nama, info in sketsa_kubus['bulan'].items():
+        hari_bulan_berikutnya = np.append(info['hari_mulai'][1:], np.iinfo(np.int64).max)
+        masuk = (hari_bulan_berikutnya > hari_mulai) & (info['hari_mulai'] <= hari_selesai)
+        penuh = masuk & (info['hari_mulai'] >= hari_mulai) & (info['hari_akhir_maks'] <= hari_selesai)
+        bulan_penuh[nama] = np.flatnonzero(penuh)
+
+        daftar_df = [kubus[nama].iloc[info['batas_baris'][i]:info['batas_baris'][i + 1]]
+                     for i in np.flatnonzero(masuk & ~penuh)]
+        df_tepi = pd.concat(daftar_df) if daftar_df else kubus[nama].iloc[:0]
+        baris_tepi[nama] = df_tepi[(df_tepi['hari_awal'].to_numpy() >= hari_mulai) &
+                                   (df_tepi['hari_akhir'].to_numpy() <= hari_selesai)]
+
+    ringkasan = {'batas_error': {}}
+    for dimensi, (nama, kolom_key, kolom_nilai) in DIMENSI_SKETSA.items():
+        df_tepi = baris_tepi[nama]
+        kunci, mask = get_kunci(df_tepi, kolom_key)
+        sketsa = SketsaTopK.gabung([sketsa_kubus['sketsa'][dimensi][i] for i in bulan_penuh[nama]],
+                                   kunci, df_tepi[kolom_nilai].to_numpy(np.float64)[mask], sketsa_kubus['k'])
+
+        # Key dengan nilai 0 atau kurang (misalnya customer yang seluruh barisnya saling meniadakan) tidak dipakai
+        positif = sketsa.nilai > 0
+        nama_nilai = 'count' if kolom_nilai == 'jumlah_barang' else kolom_nilai
+        ringkasan[dimensi] = pd.Series(sketsa.nilai[positif],
+                                       index=decode_kunci(sketsa.kunci[positif], kubus[nama], kolom_key),
+                                       name=nama_nilai)
+        ringkasan['batas_error'][dimensi] = sketsa.error
+
+    return ringkasan
@@ -0,0 +1,281 @@
+"""
+Modul ini berisi mode streaming untuk membuat pivot_seller dan pivot_order pada data yang lebih besar dari memori.
+df_order_items dan df_order_payments dibaca per potongan (chunk), lalu setiap potongan langsung diringkas
+menjadi agregat berjalan (sum, jumlah baris, max, min) per seller dan per order. Hanya tabel per order
+(df_order), df_product dan agregat berjalan yang disimpan di memori, tanpa Data Frame hasil merge penuh.
+
+Hasilnya sama dengan analisis.pipeline.create_pivot_seller_and_order (kolom dan nilai). Keduanya mengurutkan
+baris berdasarkan key lalu secara stabil berdasarkan nilai, sehingga urutannya juga sama, kecuali baris dengan
+nilai yang hanya berbeda karena pembulatan float saat sum dijumlahkan per potongan (misalnya 469.95 dan
+469.9499999). seller_id berupa string dan order_id berupa category dengan kamus order di dalam rentang waktu, karena kamus ID seluruh tabel
+(lihat analisis.loader.encode_kolom_id) baru diketahui setelah seluruh file dibaca.
+
+Penggunaan:
+    python -m analisis.streaming --data-dir data_benchmark --start-date 2017-01-01 --end-date 2017-12-31
+                                 [--ukuran-chunk 1000000] [--output-dir hasil_streaming]
+"""
+
+import argparse
+import datetime
+import os
+
+import pandas as pd
+
+from analisis import profil
+from analisis.loader import DATA_DIR, read_tabel, read_tabel_chunk
+from analisis.pipeline import create_kelompok_order, create_mask_kelompok
+from analisis.profil import tahap
+
+# Jumlah baris setiap potongan yang dibaca dari df_order_items dan df_order_payments
+UKURAN_CHUNK = 1_000_000
+
+# Fungsi agregasi di pivot, dengan fungsi untuk menggabungkan agregat antar potongan
+AGREGAT = {'sum': 'sum', 'count': 'sum', 'max': 'max', 'min': 'min'}
+
+class AgregatBerjalan:
+
+    """
+    Agregat sum, count, max dan min per key yang diperbarui potongan demi potongan.
+    Agregat dari setiap potongan ditampung lalu dipadatkan kembali menjadi satu baris per key
+    setiap kali jumlah barisnya melebihi batas_baris, sehingga memori sebanding dengan jumlah key.
+
+    Parameters:
+        kolom_key (str): Nama kolom key, misalnya 'seller_id' atau 'order_id'
+        kolom_nilai (list): Kolom yang diagregasi, misalnya ['price', 'freight_value']
+        batas_baris (int): Jumlah baris tampungan sebelum dipadatkan
+    """
+
+    def __init__(self, kolom_key: str, kolom_nilai: list, batas_baris: int = UKURAN_CHUNK):
+        self.kolom_key = kolom_key
+        self.kolom_nilai = kolom_nilai
+        self.batas_baris = batas_baris
+        self.agregat = None
+        self._tampungan = []
+        self._baris_tampungan = 0
+
+    def tambah(self, df: pd.DataFrame):
+
+        """
+        Fungsi ini bertujuan untuk menambahkan satu potongan Data Frame (berisi kolom_key dan kolom_nilai)
+        ke agregat berjalan
+        """
+
+        if df.empty:
+            return
+
+        agregat = df.groupby(by=self.kolom_key, observed=True, sort=False)[self.kolom_nilai].agg(list(AGREGAT))
+        self._tampungan.append(agregat)
+        self._baris_tampungan += len(agregat)
+
+        if self._baris_tampungan > self.batas_baris:
+            self.padatkan()
+
+    def padatkan(self):
+
+        """
+        Fungsi ini bertujuan untuk menggabungkan agregat tampungan menjadi satu baris per key
+        """
+
+        if not self._tampungan:
+            return
+
+        daftar = self._tampungan if self.agregat is None else [self.agregat] + self._tampungan
+        agregat = pd.concat(daftar)
+        self.agregat = agregat.groupby(level=0, observed=True, sort=False).agg(
+                            {kolom: AGREGAT[kolom[1]] for kolom in agregat.columns})
+        self._tampungan = []
+        self._baris_tampungan = 0
+
+    def hasil(self, dengan_count: bool = False) -> pd.DataFrame:
+
+        """
+        Fungsi ini mengembalikan agregat akhir dengan kolom <nilai>_sum, <nilai>_mean, <nilai>_max dan <nilai>_min
+        untuk setiap kolom_nilai (urutan sama dengan pivot di analisis.pipeline)
+
+        Parameters:
+            dengan_count (bool): Ikut menambahkan kolom <nilai>_count (jumlah baris), seperti pivot_seller
+
+        Returns:
+            agregat (pandas DataFrame): Data Frame dengan index kolom_key
+        """
+
+        daftar_fungsi = ['sum', 'mean', 'max', 'min'] + (['count'] if dengan_count else [])
+
+        self.padatkan()
+        if self.agregat is None:
+            kolom = [f'{nilai}_{fungsi}' for nilai in self.kolom_nilai for fungsi in daftar_fungsi]
+            return pd.DataFrame(columns=kolom, index=pd.Index([], name=self.kolom_key), dtype=float)
+
+        agregat = pd.DataFrame(index=self.agregat.index)
+        for nilai in self.kolom_nilai:
+            agregat[f'{nilai}_sum'] = self.agregat[(nilai, 'sum')]
+            agregat[f'{nilai}_mean'] = self.agregat[(nilai, 'sum')] / self.agregat[(nilai, 'count')]
+            agregat[f'{nilai}_max'] = self.agregat[(nilai, 'max')]
+            agregat[f'{nilai}_min'] = self.agregat[(nilai, 'min')]
+            if dengan_count:
+                agregat[f'{nilai}_count'] = self.agregat[(nilai, 'count')]
+        agregat.index.name = self.kolom_key
+
+        return agregat
+
+## Pivot dengan streaming
+def encode_order_id(order_id: pd.Series, dtype_order: pd.CategoricalDtype) -> pd.Categorical:
+
+    """
+    Fungsi ini mengubah order_id satu potongan menjadi category dengan kamus dtype_order.
+    Order di luar kamus (di luar rentang waktu) bernilai NaN sehingga tidak masuk kelompok mana pun.
+    Agregat berjalan memakai kode integernya agar penggabungan antar potongan tidak membandingkan kamus.
+    """
+
+    kode = dtype_order.categories.get_indexer(order_id.astype(str))
+
+    return pd.Categorical.from_codes(kode, dtype=dtype_order)
+
+def create_kelompok_order_streaming(data_dir: str,
+                                    start_date,
+                                    end_date,
+                                    ukuran_chunk: int = UKURAN_CHUNK) -> pd.Series:
+
+    """
+    Fungsi ini bertujuan untuk membaca df_order per potongan, menyimpan hanya order di dalam rentang waktu
+    order_purchase_timestamp, lalu membuat kelompok order. order_id dikodekan sebagai category dengan kamus
+    order di dalam rentang waktu, sehingga potongan barang dan payment dapat memakai kamus yang sama.
+
+    Parameters:
+        data_dir (str): Folder data
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+        ukuran_chunk (int): Jumlah baris setiap potongan
+
+    Returns:
+        kelompok_order (pandas Series): hasil create_kelompok_order dengan index category order_id
+    """
+
+    awal, akhir = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+    daftar = []
+    for df in read_tabel_chunk('df_order', data_dir, ['order_id', 'order_status', 'order_purchase_timestamp'],
+                               ukuran_chunk):
+        waktu = df['order_purchase_timestamp']
+        df = df[(waktu >= awal) & (waktu <= akhir)]
+        daftar.append(df.assign(order_id=df['order_id'].astype(str),
+                                order_status=df['order_status'].astype(str)))
+
+    df_order = pd.concat(daftar, ignore_index=True)
+    dtype_order = pd.CategoricalDtype(categories=pd.Index(df_order['order_id'].unique()).sort_values())
+    df_order['order_id'] = df_order['order_id'].astype(dtype_order)
+
+    return create_kelompok_order(df_order)
+
+def create_pivot_seller_and_order_streaming(data_dir: str = DATA_DIR,
+                                            start_date=None,
+                                            end_date=None,
+                                            ukuran_chunk: int = UKURAN_CHUNK) -> tuple:
+
+    """
+    Fungsi ini bertujuan untuk menghasilkan pivot_seller dan pivot_order seperti
+    analisis.pipeline.create_pivot_seller_and_order dengan membaca df_order_items dan df_order_payments
+    per potongan, sehingga memori puncak tidak bergantung pada jumlah baris kedua tabel tersebut
+
+    Parameters:
+        data_dir (str): Folder data
+        start_date (datetime.date): Tanggal awal rentang waktu
+        end_date (datetime.date): Tanggal akhir rentang waktu
+        ukuran_chunk (int): Jumlah baris setiap potongan
+
+    Returns:
+        tuple(pivot_seller, pivot_order):
+        Data Frame pivot_seller dan Data Frame pivot_order
+    """
+
+    awal, akhir = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+    with tahap('streaming.create_kelompok_order') as catatan:
+        kelompok_order = create_kelompok_order_streaming(data_dir, start_date, end_date, ukuran_chunk)
+        dtype_order = kelompok_order.index.dtype
+        catatan['baris'] = len(kelompok_order)
+
+    # Pengganti inner merge dengan df_product: barang dengan product_id yang tidak ada di df_product dibuang
+    id_produk = pd.Index(read_tabel('df_product', data_dir, ['product_id'])['product_id'].astype(str).unique())
+
+    agregat_seller = AgregatBerjalan('seller_id', ['price', 'freight_value'], ukuran_chunk)
+    agregat_barang_order = AgregatBerjalan('order_id', ['price', 'freight_value'], ukuran_chunk)
+    agregat_payment = AgregatBerjalan('order_id', ['payment_value'], ukuran_chunk)
+
+    with tahap('streaming.df_order_items') as catatan:
+        catatan['baris'] = 0
+        for df in read_tabel_chunk('df_order_items', data_dir, ['order_id', 'product_id', 'seller_id',
+                                                                'shipping_limit_date', 'price', 'freight_value'],
+                                   ukuran_chunk):
+            waktu = df['shipping_limit_date']
+            df = df[(waktu >= awal) & (waktu <= akhir)]
+            df = df[df['product_id'].astype(str).isin(id_produk)]
+            df = df.assign(order_id=encode_order_id(df['order_id'], dtype_order),
+                           seller_id=df['seller_id'].astype(str))
+
+            catatan['baris'] += len(df)
+
+            agregat_seller.tambah(df[create_mask_kelompok(df, kelompok_order, 'seller')])
+            df = df[create_mask_kelompok(df, kelompok_order, 'customer')]
+            agregat_barang_order.tambah(df.assign(order_id=df['order_id'].cat.codes))
+
+    with tahap('streaming.df_order_payments') as catatan:
+        catatan['baris'] = 0
+        for df in read_tabel_chunk('df_order_payments', data_dir, ['order_id', 'payment_value'], ukuran_chunk):
+            df = df.assign(order_id=encode_order_id(df['order_id'], dtype_order))
+            df = df[create_mask_kelompok(df, kelompok_order, 'customer')]
+
+            agregat_payment.tambah(df.assign(order_id=df['order_id'].cat.codes))
+            catatan['baris'] += len(df)
+
+    # Seperti groupby di analisis.pipeline, baris diurutkan dulu berdasarkan key (kamus ID urut, sehingga urutan
+    # string seller_id dan kode order_id sama dengan urutan kode category), lalu diurutkan stabil berdasarkan nilai.
+    # Dengan begitu seller atau order dengan nilai sama memiliki urutan yang sama dengan pipeline.
+    pivot_seller = agregat_seller.hasil(dengan_count=True).sort_index().sort_values(by='price_sum', ascending=False,
+                                                                                    kind='stable')
+
+    # Urutan kolom payment_value sama dengan pivot_order di analisis.pipeline
+    pivot_payment = agregat_payment.hasil()[['payment_value_mean', 'payment_value_max',
+                                             'payment_value_min', 'payment_value_sum']]
+    pivot_order = pd.merge(pivot_payment.sort_index().sort_values(by='payment_value_sum', ascending=False,
+                                                                  kind='stable'),
+                           agregat_barang_order.hasil(), on='order_id', how='inner')
+    pivot_order.index = pd.CategoricalIndex(pd.Categorical.from_codes(pivot_order.index, dtype=dtype_order),
+                                            name='order_id')
+
+    return pivot_seller, pivot_order
+
+def main():
+    parser = argparse.ArgumentParser(description='Membuat pivot_seller dan pivot_order dengan streaming')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Folder data (default: %(default)s)')
+    parser.add_argument('--start-date', type=datetime.date.fromisoformat, required=True,
+                        help='Tanggal awal YYYY-MM-DD')
+    parser.add_argument('--end-date', type=datetime.date.fromisoformat, required=True,
+                        help='Tanggal akhir YYYY-MM-DD')
+    parser.add_argument('--ukuran-chunk', type=int, default=UKURAN_CHUNK,
+                        help='Jumlah baris setiap potongan (default: %(default)s)')
+    parser.add_argument('--output-dir', default=None, help='Folder untuk menyimpan pivot sebagai Parquet')
+    args = parser.parse_args()
+
+    if args.ukuran_chunk < 1:
+        parser.error('--ukuran-chunk harus lebih besar dari 0')
+
+    with profil.sesi('streaming', path_log=None) as sesi_profil:
+        with tahap('streaming.create_pivot_seller_and_order') as catatan:
+            pivot_seller, pivot_order = create_pivot_seller_and_order_streaming(args.data_dir, args.start_date,
+                                                                                args.end_date, args.ukuran_chunk)
+            catatan['baris'] = len(pivot_seller) + len(pivot_order)
+
+    for catatan in sesi_profil['tahap']:
+        print(f"{'  ' * catatan['level'] + catatan['nama']:<45} {catatan['detik']:>8.2f} s "
+              f"{catatan['puncak_memori_mb']:>10.1f} MB {catatan.get('baris', ''):>12}")
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for nama, df in [('pivot_seller', pivot_seller), ('pivot_order', pivot_order)]:
+            path = os.path.join(args.output_dir, f'{nama}.parquet')
+            df.to_parquet(path)
+            print(f'{nama}: {path}')
+
+if __name__ == '__main__':
+    main()
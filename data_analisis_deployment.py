@@ -1,748 +1,458 @@
-import numpy as np
+import uuid
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
 from babel.numbers import format_currency
 
-# Import File CSV
-df_customer = pd.read_csv('data/df_customer_clean.csv')
-df_order = pd.read_csv('data/df_order_clean.csv')
-df_order_items = pd.read_csv('data/df_order_items_clean.csv')
-df_order_payments = pd.read_csv('data/df_order_payments_clean.csv')
-df_product = pd.read_csv('data/df_product_clean.csv')
-df_sellers = pd.read_csv('data/df_sellers_clean.csv')
-
-# print(df_customer.info())
-# print(df_order.info()) 
-# print(df_order_items.info()) 
-# print(df_order_payments.info())
-# print(df_product.info())
-# print(df_sellers.info())
-
-## Convert datetime
-df_order['order_purchase_timestamp'] = pd.to_datetime(df_order['order_purchase_timestamp'])
-df_order_items['shipping_limit_date'] = pd.to_datetime(df_order_items['shipping_limit_date'])
-
-## Kumpulan Fungsi
-
-### Mendapatkan pivot_seller dan pivot_order
-def create_pivot_seller_and_order(df_order_items: pd.DataFrame,
-                                  df_product: pd.DataFrame,
-                                  df_order_payments: pd.DataFrame,
-                                  df_order: pd.DataFrame) -> tuple:
-
-    """
-    Fungsi ini bertujuan untuk menghasilkan Data Frame pivot_seller dan pivot_order
-
-    Parameters:
-        df_order_items (pandas DataFrame): Data Frame df_order_items
-        df_product (pandas DataFrame): Data Frame df_product
-        df_order_payments (pandas DataFrame): Data Frame df_order_payments
-        df_order (pandas DataFrame): Data Frame df_order
-
-    Returns:
-        tuple(pivot_seller, pivot_order):
-        Data Frame pivot_seller dan  Data Frame pivot_order        
-    """
-
-    kelompok_cancel_unav = pd.concat([df_order[df_order['order_status']=='canceled']['order_id'],
-                                    df_order[df_order['order_status']=='unavailable']['order_id']])
-
-    kelompok_seller = pd.concat([df_order[df_order['order_status']=='delivered']['order_id'],
-                            df_order[df_order['order_status']=='invoiced']['order_id'],
-                                df_order[df_order['order_status']=='shipped']['order_id'],
-                                df_order[df_order['order_status']=='processing']['order_id'],
-                                df_order[df_order['order_status']=='created']['order_id'],
-                                df_order[df_order['order_status']=='approved']['order_id']])
-
-    kelompok_customer = pd.concat([df_order[df_order['order_status']=='delivered']['order_id'],
-                             df_order[df_order['order_status']=='shipped']['order_id'],
-                             df_order[df_order['order_status']=='invoiced']['order_id'],
-                             df_order[df_order['order_status']=='processing']['order_id'],
-                             df_order[df_order['order_status']=='created']['order_id'],
-                             df_order[df_order['order_status']=='approved']['order_id']])
-    
-    def create_pivot_seller(df_order_items, df_product):
-
-        df_temp = pd.merge(df_order_items, df_product, on='product_id', how='inner')
-        pivot_seller = df_temp[df_temp['order_id'].isin(kelompok_seller)].groupby(by='seller_id').agg({
-                                                                    'price': ['sum','mean','max', 'min'],
-                                                                    'freight_value': ['sum','mean','max', 'min'],
-                                                                    'product_id' : lambda x: list(x),
-                                                                    'product_category_name' : lambda x: list(x),
-                                                                    'shipping_limit_date' : lambda x: list(x)
-                                                                    }).sort_values(by=('price','sum'), ascending=False)
-        pivot_seller.columns = ['_'.join(col).strip() for col in pivot_seller.columns.values]
-        
-        return pivot_seller
-    
-    def create_pivot_order(df_order_payments, df_order):
-
-        df_temp = df_order_items.drop(columns=['order_item_id','shipping_limit_date','seller_id'])
-        df_temp = pd.merge(df_temp, df_product, on='product_id', how='inner')
-        df_temp = df_temp[df_temp['order_id'].isin(kelompok_customer)].groupby(by='order_id').agg({
-                                                                    'price': ['sum','mean','max', 'min'],
-                                                                    'freight_value': ['sum','mean','max', 'min'],
-                                                                    'product_id' : lambda x: list(x),
-                                                                    'product_category_name' : lambda x: list(x)
-                                                                    }).sort_values(by=('price','sum'), ascending=False)
-        df_temp.columns = ['_'.join(col).strip() for col in df_temp.columns.values]
-        
-        pivot_order = df_order_payments[df_order_payments['order_id'].isin(kelompok_customer)].groupby(by='order_id').agg({
-                                                            'payment_value': ['mean','max', 'min','sum'],
-                                                            }).sort_values(by=('payment_value','sum'), ascending=False)
-        pivot_order.columns = ['_'.join(col).strip() for col in pivot_order.columns.values]
-        pivot_order = pd.merge(pivot_order, df_temp, on='order_id', how='inner')
-        
-        return pivot_order
-    
-    return create_pivot_seller(df_order_items, df_product), create_pivot_order(df_order_payments, df_order)
-
-### Mendapatkan df_sellers_merged dan df_customer_merged
-def create_df_sellers_and_customer_merged(pivot_seller: pd.DataFrame,
-                                          df_sellers: pd.DataFrame,
-                                          pivot_order: pd.DataFrame,
-                                          df_order: pd.DataFrame,
-                                          df_customer: pd.DataFrame) -> tuple:
-    
-    """
-    Fungsi ini bertujuan untuk menghasilkan Data Frame df_sellers_merged dan df_customer_merged
-
-    Parameters:
-        pivot_seller (pandas DataFrame): Data Frame pivot_seller
-        df_sellers (pandas DataFrame): Data Frame df_sellers
-        pivot_order (pandas DataFrame): Data Frame pivot_order
-        df_order (pandas DataFrame): Data Frame df_order
-        df_customer (pandas DataFrame): Data Frame df_customer
-
-    Returns:
-        tuple(df_sellers_merged, df_customer_merged):
-        Data Frame df_sellers_merged dan Data Frame df_customer_merged        
-    """
-
-    df_sellers_merged = pd.merge(pivot_seller, df_sellers, on='seller_id', how='inner')
-
-    df_order_merged = pd.merge(pivot_order, df_order, on='order_id', how='inner')
-    cols = df_order_merged.columns.tolist()
-    cols.insert(1, cols.pop(cols.index('customer_id')))
-    df_order_merged = df_order_merged[cols]
-
-    df_customer_merged = pd.merge(df_order_merged, df_customer, on='customer_id', how='inner')
-
-    return df_sellers_merged, df_customer_merged
-
-### Mendapatkan df_sellers_city_merged
-def create_df_sellers_city_merged(df_sellers_merged: pd.DataFrame) -> pd.DataFrame:
-
-    """
-    Fungsi ini bertujuan untuk menghasilkan 8 kota berpenghasilan terbesar beserta kategori barang yang terjual 
-    yang disajikan ke Data Frame create_df_sellers_city_merged
-
-    Parameters:
-        df_sellers_merged (pandas DataFrame): Data Frame df_sellers_merged
-
-    Returns:
-        df_sellers_city_merged: Data Frame df_sellers_city_merged
-    """    
-
-    df_sellers_city_merged = df_sellers_merged.groupby(by='seller_city').agg({
-                                                    'price_sum': 'sum',
-                                                    'product_category_name_<lambda>': 'sum'
-                                                    }).sort_values(by = ('price_sum'), ascending = False).head(8)
-    
-    return df_sellers_city_merged
-
-### Mendapatkan kategori barang yang banyak dijual di kota berpenghasilan tertinggi
-def return_kategori_di_kota_jual(df_sellers_city_merged: pd.DataFrame) -> list:
-    
-    """
-    Fungsi ini bertujuan untuk menghasilkan 10 kategori yang terjual terbanyak di 8 kota berpenghasilan terbesar
-    disajikan ke sebuah list yang berisi nama kota dan data frame yang berisi kategori-kategori barang beserta nominalnya:
-    
-    penjualan_kategoribarang_di_kota = [[kota_1, DataFrame],...,[kota_8, DataFrame]]
-    
-    Parameters:
-        df_sellers_city_merged (pandas Data Frame): Data Frame df_sellers_city_merged
-
-    Returns:
-        penjualan_kategoribarang_di_kota (list): 
-        list penjualan_kategoribarang_di_kota = [[kota_1, DataFrame],...,[kota_8, DataFrame]]
-    """
-
-    penjualan_kategoribarang_di_kota = []
-    for i in range(8):
-        df_temp = pd.DataFrame(df_sellers_city_merged['product_category_name_<lambda>'].iloc[i],
-                            columns=['product_category_name_<lambda>']
-                            ).value_counts().head(10)
-        penjualan_kategoribarang_di_kota.append([df_sellers_city_merged.index[i],df_temp])
-
-    return penjualan_kategoribarang_di_kota
-
-### Mendapatkan df_customer_city_merged
-def create_df_customer_city_merged(df_customer_merged: pd.DataFrame) -> pd.DataFrame:
-
-    """
-    Fungsi ini bertujuan untuk menghasilkan 8 kota berpengeluaran terbesar beserta kategori barang yang dibeli 
-    yang disajikan ke Data Frame create_df_customer_city_merged
-
-    Parameters:
-        df_customer_merged (pandas DataFrame): Data Frame df_customer_merged
-
-    Returns:
-        df_customer_city_merged (pandas DataFrame): Data Frame df_customer_city_merged
-    """    
-
-    df_customer_city_merged = df_customer_merged.groupby(by='customer_city').agg({
-                                                        'payment_value_sum': 'sum',
-                                                        'product_category_name_<lambda>': 'sum'
-                                                        }).sort_values(by = ('payment_value_sum'), ascending = False).head(8)
-    
-    return df_customer_city_merged
-
-### Mendapatkan kategori barang yang banyak dibeli di kota berpengeluaran tertinggi
-def return_kategori_di_kota_beli(df_customer_city_merged: pd.DataFrame) -> list:
-    
-    """
-    Fungsi ini bertujuan untuk menghasilkan 10 kategori yang dibeli terbanyak di 8 kota berpengeluaran terbesar
-    disajikan ke sebuah list yang berisi nama kota dan data frame yang berisi kategori-kategori barang beserta nominalnya:
-    
-    pemberlian_kategoribarang_di_kota = [[kota_1, DataFrame],...,[kota_8, DataFrame]]
-    
-    Parameters:
-        df_customer_city_merged (pandas Data Frame): Data Frame df_customer_city_merged
-
-    Returns:
-        pemberlian_kategoribarang_di_kota (list): 
-        list pemberlian_kategoribarang_di_kota = [[kota_1, DataFrame],...,[kota_8, DataFrame]]
-    """
-
-    pemberlian_kategoribarang_di_kota = []
-    for i in range(8):
-        df_temp = pd.DataFrame(df_customer_city_merged['product_category_name_<lambda>'].iloc[i],
-                            columns=['product_category_name_<lambda>']
-                            ).value_counts().head(10)
-        pemberlian_kategoribarang_di_kota.append([df_customer_city_merged.index[i],df_temp])
-
-    return pemberlian_kategoribarang_di_kota
-
-### Membuat Klaster customer
-kumpulan_klaster = ['Klaster I','Klaster II','Klaster III','Klaster IV','Klaster V','Klaster VI','Klaster VII']
-
-def create_klaster_customer(df_customer_merged: pd.DataFrame) -> pd.DataFrame:
-
-    """
-    Fungsi ini digunakan untuk menghasilkan klaster customer
-
-    Parameters:
-        df_customer_merged (pandas Data Frames): Data Frame df_customer_merged
-    
-    Returns:
-        df_customer_klaster (pandas DataFrame): Data Frame df_customer_klaster
-    """
-
-    batas_atas_klaster_I = 70
-    batas_atas_klaster_II = 130
-    batas_atas_klaster_III = 210
-    batas_atas_klaster_IV = 350
-    batas_atas_klaster_V = 1000
-    batas_atas_klaster_VI = 4000
-
-    batasan_klaster = [0,
-                       batas_atas_klaster_I,
-                       batas_atas_klaster_II,
-                       batas_atas_klaster_III,
-                       batas_atas_klaster_IV,
-                       batas_atas_klaster_V,
-                       batas_atas_klaster_VI,
-                       float('inf')
-                       ]
-
-    df_customer_merged['Klaster'] = pd.cut(df_customer_merged['payment_value_sum'],
-                                           bins=batasan_klaster,
-                                           labels=kumpulan_klaster,
-                                           include_lowest=True)
-    df_customer_klaster = df_customer_merged[['customer_id','payment_value_sum','Klaster']]
-
-    df_customer_klaster = df_customer_klaster.groupby(by='Klaster').agg({'Klaster': 'count'
-                                                                        ,'customer_id': lambda x: list(x)
-                                                                        ,'payment_value_sum': lambda x: list(x)})
-
-    df_customer_klaster.columns = ['customer_id_count','customer_id','payment_value_sum']
-
-    return df_customer_klaster
-
-### Membuat Klaster seller
-def create_klaster_sellers(df_sellers_merged: pd.DataFrame) -> pd.DataFrame:
-
-    """
-    Fungsi ini digunakan untuk menghasilkan klaster seller
-
-    Parameters:
-        df_sellers_merged (pandas Data Frames): Data Frame df_sellers_merged
-    
-    Returns:
-        df_sellers_klaster (pandas DataFrame): Data Frame df_sellers_klaster
-    """
-
-    batas_atas_klaster_I = 300
-    batas_atas_klaster_II = 1000
-    batas_atas_klaster_III = 2500
-    batas_atas_klaster_IV = 5000
-    batas_atas_klaster_V = 10000
-    batas_atas_klaster_VI = 50000
-
-    batasan_klaster = [0,
-                       batas_atas_klaster_I,
-                       batas_atas_klaster_II,
-                       batas_atas_klaster_III,
-                       batas_atas_klaster_IV,
-                       batas_atas_klaster_V,
-                       batas_atas_klaster_VI,
-                       float('inf')
-                       ]
-
-    df_sellers_merged['Klaster'] = pd.cut(df_sellers_merged['price_sum'],
-                                          bins=batasan_klaster,
-                                          labels=kumpulan_klaster,
-                                          include_lowest=True)
-    
-    df_sellers_klaster = df_sellers_merged[['seller_id','price_sum','Klaster']]
-
-    df_sellers_klaster = df_sellers_klaster.groupby(by='Klaster').agg({'Klaster': 'count'
-                                                                    ,'seller_id': lambda x: list(x)
-                                                                    ,'price_sum': lambda x: list(x)})
-
-    df_sellers_klaster.columns = ['seller_id_count','seller_id','price_sum']
-
-    return df_sellers_klaster
-
-## MEMBUAT FILTER
-min_date = df_order["order_purchase_timestamp"].min()
-max_date = df_order["order_purchase_timestamp"].max()
-
-with st.sidebar:
-    st.title('Proyek Data Analisis')
-    # Menambahkan logo perusahaan
-    st.image("https://learn.g2.com/hubfs/Imported%20sitepage%20images/1ZB5giUShe0gw9a6L69qAgsd7wKTQ60ZRoJC5Xq3BIXS517sL6i6mnkAN9khqnaIGzE6FASAusRr7w=w1439-h786.png")
-
-    # Mengambil start_date & end_date dari date_input
-    start_date, end_date = st.date_input(
-        label='Rentang Waktu',
-        min_value=min_date,
-        max_value=max_date,
-        value=[min_date, max_date]
-    )
+from analisis import get_engine, profil
+from analisis.cache import get_ukuran_objek
+from analisis.grafik import (cache_grafik, create_grafik_klaster_customer, create_grafik_klaster_seller,
+                             create_grafik_pertanyaan_1, create_grafik_pertanyaan_2, create_grafik_pertanyaan_3,
+                             create_grafik_pertanyaan_4, get_gambar)
+from analisis.latar import get_penghitung_latar
+from analisis.profil import tahap
+
+# Tabel engine dibagikan ke seluruh sesi; copy-on-write memastikan view dan Data Frame turunan tidak mengubahnya.
+# Opsi global ini hanya diatur di aplikasi, bukan di modul analisis.
+pd.set_option('mode.copy_on_write', True)
+
+# Seluruh pemuatan data dan perhitungan dilakukan oleh engine (analisis/engine.py) yang juga dapat
+# dipakai tanpa Streamlit. Engine dibagikan ke seluruh rerun dan sesi, serta memuat ulang data
+# (CSV atau Parquet hasil `python -m analisis.konversi`) ketika salah satu file berubah.
+engine = get_engine()
+penghitung_latar = get_penghitung_latar()
+
+# Profil per tahap (waktu, puncak memori, jumlah baris) aktif jika toggle di sidebar dinyalakan.
+# Nilai toggle dibaca dari session_state agar pemuatan data di awal script ikut terukur.
+profil_aktif = st.session_state.get('profil_aktif', False)
+# Sesi profil selalu diakhiri, juga saat rerun Streamlit menghentikan script di tengah jalan
+with profil.sesi('dashboard', aktif=profil_aktif) as sesi_profil:
+
+    ## MEMBUAT FILTER
+    with st.spinner('Memuat data...'):
+        min_date, max_date = engine.get_rentang_waktu()
+
+    with st.sidebar:
+        st.title('Proyek Data Analisis')
+        # Menambahkan logo perusahaan
+        st.image("https://learn.g2.com/hubfs/Imported%20sitepage%20images/1ZB5giUShe0gw9a6L69qAgsd7wKTQ60ZRoJC5Xq3BIXS517sL6i6mnkAN9khqnaIGzE6FASAusRr7w=w1439-h786.png")
+
+        # Mengambil start_date & end_date dari date_input
+        start_date, end_date = st.date_input(
+            label='Rentang Waktu',
+            min_value=min_date,
+            max_value=max_date,
+            value=[min_date, max_date]
+        )
+
+        # Mode perkiraan: grafik top-K Pertanyaan 1-4 dari sketsa per bulan (analisis/sketsa.py) dengan batas error
+        topk_perkiraan = st.toggle('Top-K perkiraan (sketsa)', key='topk_perkiraan',
+                                   help='Lebih cepat untuk data besar, nilai dapat berbeda sebesar batas error.')
+
+        # Hitung ulang di latar belakang: hasil rentang sebelumnya tetap tampil sampai rentang baru selesai dihitung
+        hitung_latar = st.toggle('Hitung ulang di latar belakang', value=True, key='hitung_latar',
+                                 help='Grafik rentang waktu sebelumnya tetap tampil (ditandai usang) selama rentang '
+                                      'baru dihitung.')
+
+    ## Hitung ulang di latar belakang (stale-while-revalidate)
+    def hitung_rentang(tugas, start_date, end_date, perkiraan: bool, bagian: str):
+
+        """
+        Fungsi ini mengisi cache engine untuk bagian yang sedang dibuka pada rentang waktu baru, dijalankan di worker
+        latar belakang. tugas.cek_batal diteruskan ke engine dan diperiksa di antara tahap pipeline (kelompok order,
+        cabang seller dan customer), kueri kubus per dimensi dan indeks gap, sehingga permintaan yang tergantikan
+        berhenti setelah tahap yang sedang berjalan selesai.
+
+        Parameters:
+            tugas (analisis.latar.Tugas): Tugas latar belakang pemanggil
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            perkiraan (bool): True berarti memakai mode top-K perkiraan
+            bagian (str): Nama tab yang sedang dibuka
+        """
+
+        if bagian in ('Klaster Customer', 'Klaster Seller'):
+            engine.run_klaster(start_date, end_date, cek_batal=tugas.cek_batal)
+            return
+
+        engine.run_ringkasan(start_date, end_date, perkiraan=perkiraan, cek_batal=tugas.cek_batal)
+        tugas.cek_batal()
+        if bagian == 'Pertanyaan 1-3':
+            engine.run_gap(start_date, end_date, cek_batal=tugas.cek_batal)
+
+    def get_rentang_tampil(start_date, end_date, perkiraan: bool, bagian: str) -> tuple:
+
+        """
+        Fungsi ini menentukan rentang waktu yang ditampilkan. Jika rentang yang diminta berbeda dari rentang terakhir
+        yang sudah tampil dan hasilnya belum siap, perhitungan dikirim ke penghitung latar dan rentang terakhir
+        ditampilkan sebagai hasil usang.
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu yang diminta
+            end_date (datetime.date): Tanggal akhir rentang waktu yang diminta
+            perkiraan (bool): True berarti memakai mode top-K perkiraan
+            bagian (str): Nama tab yang sedang dibuka
+
+        Returns:
+            tuple(start_date, end_date, tugas):
+            Rentang waktu yang ditampilkan dan tugas latar belakang yang masih berjalan (None jika hasil tidak usang)
+        """
+
+        id_sesi = st.session_state.setdefault('id_sesi', uuid.uuid4().hex)
+        rentang_terakhir = st.session_state.get('rentang_tampil')
+        rentang = (start_date, end_date)
+
+        # Tampilan pertama dan rentang yang sudah tampil dihitung langsung (biasanya dari cache)
+        if not hitung_latar or rentang_terakhir is None or rentang_terakhir == rentang:
+            penghitung_latar.lepas(id_sesi)
+            st.session_state['rentang_tampil'] = rentang
+            return start_date, end_date, None
+
+        tugas = penghitung_latar.minta(id_sesi, (start_date, end_date, perkiraan, bagian, engine.versi_data),
+                                       hitung_rentang, start_date, end_date, perkiraan, bagian)
+        if not tugas.selesai():
+            return rentang_terakhir[0], rentang_terakhir[1], tugas
+
+        # Tugas selesai (atau gagal, sehingga error ditampilkan oleh perhitungan langsung)
+        penghitung_latar.lepas(id_sesi)
+        st.session_state['rentang_tampil'] = rentang
+        return start_date, end_date, None
+
+    @st.fragment(run_every=0.5)
+    def tunggu_hitung_latar(tugas, rentang_tampil: tuple, rentang_diminta: tuple):
+
+        """
+        Fungsi ini menampilkan penanda hasil usang dan menjalankan ulang halaman setelah tugas latar belakang selesai
+
+        Parameters:
+            tugas (analisis.latar.Tugas): Tugas latar belakang rentang yang diminta
+            rentang_tampil (tuple): (start_date, end_date) hasil usang yang sedang ditampilkan
+            rentang_diminta (tuple): (start_date, end_date) yang sedang dihitung
+        """
 
+        if tugas.selesai():
+            st.rerun()
+
+        st.info(f'Menampilkan hasil {rentang_tampil[0]} - {rentang_tampil[1]} (usang) sementara rentang '
+                f'{rentang_diminta[0]} - {rentang_diminta[1]} dihitung...', icon='⏳')
+
+    ### Menampilkan grafik dari cache gambar
+    def tampilkan_grafik(nama: str, fungsi, *masukan):
+
+        """
+        Fungsi ini bertujuan untuk menampilkan grafik dari cache gambar (analisis/grafik.py). Grafik hanya digambar
+        ulang jika Data Frame masukan atau nilai widget-nya berubah.
+
+        Parameters:
+            nama (str): Nama grafik
+            fungsi (callable): Fungsi pembuat grafik di analisis.grafik
+            *masukan: Data Frame dan nilai widget yang menjadi masukan fungsi
+        """
+
+        with tahap(f'grafik.{nama}') as catatan:
+            st.image(get_gambar(nama, fungsi, *masukan), width='stretch')
+            catatan['baris'] = sum(len(nilai) for nilai in masukan if isinstance(nilai, (pd.DataFrame, pd.Series)))
+
+    def tampilkan_batas_error(hasil: dict, daftar_dimensi: list, satuan: str):
+
+        """
+        Fungsi ini menampilkan batas error terbesar dari dimensi-dimensi grafik jika hasil berasal dari mode perkiraan
+
+        Parameters:
+            hasil (dict): Hasil engine.run_ringkasan
+            daftar_dimensi (list): Nama dimensi pada hasil['batas_error'] yang ditampilkan grafik
+            satuan (str): Satuan nilai, misalnya 'BRL' atau 'barang'
+        """
+
+        if 'batas_error' not in hasil:
+            return
+
+        batas_error = max(hasil['batas_error'][dimensi] for dimensi in daftar_dimensi)
+        if batas_error == 0:
+            st.caption('Mode perkiraan: nilai tepat (seluruh key tersimpan di sketsa).')
+        else:
+            st.caption(f'Mode perkiraan: setiap nilai dapat berbeda paling banyak ± {batas_error:,.0f} {satuan} '
+                       'dari nilai tepatnya.')
+
+    ## DEPLOYMENT
+    st.title('Proyek Data Analisis :sparkles:')
+    # st.header('Proyek Data Analisis :sparkles:')
+    st.caption('Created by: Reksa Alamsyah')
 
-### Filter diterapkan
-df_order_update = df_order[(df_order["order_purchase_timestamp"] >= str(start_date)) &
-                           (df_order["order_purchase_timestamp"] <= str(end_date))]
-                           
-df_order_items_update = df_order_items[(df_order_items["shipping_limit_date"] >= str(start_date)) &
-                                       (df_order_items["shipping_limit_date"] <= str(end_date))]
-
-### Data yang telah difilter diterapkan untuk membuat beberapa data frame
-pivot_seller, pivot_order = create_pivot_seller_and_order(df_order_items_update,
-                                                          df_product,
-                                                          df_order_payments,
-                                                          df_order_update)
-
-df_sellers_merged, df_customer_merged = create_df_sellers_and_customer_merged(pivot_seller,
-                                                                              df_sellers,
-                                                                              pivot_order,
-                                                                              df_order_update,
-                                                                              df_customer)
-
-df_sellers_city_merged = create_df_sellers_city_merged(df_sellers_merged)
-
-penjualan_kategoribarang_di_kota = return_kategori_di_kota_jual(df_sellers_city_merged)
-
-df_customer_city_merged = create_df_customer_city_merged(df_customer_merged)
-
-pembelian_kategoribarang_di_kota = return_kategori_di_kota_jual(df_customer_city_merged)
-
-df_customer_klaster = create_klaster_customer(df_customer_merged)
-
-df_sellers_klaster = create_klaster_sellers(df_sellers_merged)
-
-## DEPLOYMENT
-st.title('Proyek Data Analisis :sparkles:')
-# st.header('Proyek Data Analisis :sparkles:')
-st.caption('Created by: Reksa Alamsyah')
-
-st.write(
-    """
-    Proyek ini merupakan proyek analisis terhadap data E-Commerce yang didapatkan dari:
-    
-    https://drive.google.com/file/d/1MsAjPM7oKtVfJL_wRp1qmCajtSG1mdcK/view
-    
-    Data yang disajikan disini telah melalui tahapan-tahapan data cleaning sehingga siap untuk dianalisis.
-    Data Cleaning dan Analisis dilakukan terlebih dahulu pada Google Colab dengan tujuan menjawab 8 pertanyaan utama.
-    Google Colab tersebut dapat diakses pada link sebagai berikut:
-
-    https://colab.research.google.com/drive/1nEoGv81s4V6xQXyWLrH9mi97WQuH8pmz?usp=sharing
-    
-    Analisis dimulai dengan mendapatkan performa seller dan customer di suatu kota dan state.
-    """
-)
-
-
-col1, col2 = st.columns(2)
-
-#### Pertanyaan 1
-with col1:
-
-    fig, ax = plt.subplots(nrows=3, ncols=1, figsize=(12,20))
-
-    df_0 = df_customer_merged.groupby(by='customer_state').agg({
-                                                        'payment_value_sum': 'sum'
-                                                        }).sort_values(by = ('payment_value_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('payment_value_sum'), ascending = False)
-    
-    colors = ["#8F4700", "#D3D3D3","#D3D3D3", "#D3D3D3", "#D3D3D3"]
-
-    sns.barplot(y=df_0.index,
-                x=df_0['payment_value_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[0]
-                )
-    ax[0].set_xlabel("Total Pengeluaran (Juta BRL)", fontsize=24)
-    ax[0].set_ylabel("Nama State", fontsize=24)
-    ax[0].set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap State", fontsize=28)
-    ax[0].tick_params(axis='y', labelsize=20)
-    ax[0].tick_params(axis='x', labelsize=20)
-
-    df_0 = df_customer_merged.groupby(by='customer_city').agg({
-                                                        'payment_value_sum': 'sum'
-                                                        }).sort_values(by = ('payment_value_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('payment_value_sum'), ascending = False)
-    
-    sns.barplot(y=df_0.index,
-                x=df_0['payment_value_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[1]
-                )    
-    
-    ax[1].set_xlabel("Total Pengeluaran (Juta BRL)", fontsize=24)
-    ax[1].set_ylabel("Nama City", fontsize=24)
-    ax[1].set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap Kota", fontsize=28)
-    ax[1].tick_params(axis='y', labelsize=20)
-    ax[1].tick_params(axis='x', labelsize=20)
-    
-    df_0 = df_customer_merged.groupby(by='customer_id').agg({
-                                                        'payment_value_sum': 'sum'
-                                                        }).sort_values(by = ('payment_value_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('payment_value_sum'), ascending = False)
-    
-    index_ = [i[:3]+'...' for i in df_0.index]
-
-    sns.barplot(y=index_,
-                x=df_0['payment_value_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[2]
-                )   
-
-    ax[2].set_xlabel("Total Pengeluaran (BRL)", fontsize=24)
-    ax[2].set_ylabel("ID Customer", fontsize=24)
-    ax[2].set_title("Top 5 Total Pengeluaran Customer", fontsize=28)
-    ax[2].tick_params(axis='y', labelsize=20)
-    ax[2].tick_params(axis='x', labelsize=20)
-
-    plt.tight_layout()
-
-    st.pyplot(fig)
-
-#### Pertanyaan 2
-with col2:
-
-    fig, ax = plt.subplots(nrows=3, ncols=1, figsize=(12,20))
-
-    df_0 = df_sellers_merged.groupby(by='seller_state').agg({
-                                                        'price_sum': 'sum'
-                                                        }).sort_values(by = ('price_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('price_sum'), ascending = False)
-    
-    colors = ["#8F4700", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
-
-    sns.barplot(y=df_0.index,
-                x=df_0['price_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[0]
-                )
-                
-    ax[0].set_xlabel("Total Penghasilan (Juta BRL)", fontsize=24)
-    ax[0].set_ylabel("Nama State", fontsize=24)
-    ax[0].set_title("Top 5 Total Penghasilan Seluruh Seller di Setiap State", fontsize=28)
-    ax[0].tick_params(axis='y', labelsize=20)
-    ax[0].tick_params(axis='x', labelsize=20)
-
-    df_0 = df_sellers_merged.groupby(by='seller_city').agg({
-                                                        'price_sum': 'sum'
-                                                        }).sort_values(by = ('price_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('price_sum'), ascending = False)
-    
-    sns.barplot(y=df_0.index,
-                x=df_0['price_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[1]
-                )    
-    
-    ax[1].set_xlabel("Total Penghasilan (Juta BRL)", fontsize=24)
-    ax[1].set_ylabel("Nama City", fontsize=24)
-    ax[1].set_title("Top 5 Total Penghasilan Seluruh Seller di Setiap Kota", fontsize=28)
-    ax[1].tick_params(axis='y', labelsize=20)
-    ax[1].tick_params(axis='x', labelsize=20)
-    
-    df_0 = df_sellers_merged.groupby(by='seller_id').agg({
-                                                        'price_sum': 'sum'
-                                                        }).sort_values(by = ('price_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('price_sum'), ascending = False)
-    
-    index_ = [i[:3]+'...' for i in df_0.index]
-
-    sns.barplot(y=index_,
-                x=df_0['price_sum'],
-                data=df_0,
-                palette=colors,
-                ax=ax[2]
-                )   
-
-    ax[2].set_xlabel("Total Penghasilan (BRL)", fontsize=24)
-    ax[2].set_ylabel("ID Seller", fontsize=24)
-    ax[2].set_title("Top 5 Total Penghasilan Seller", fontsize=28)
-    ax[2].tick_params(axis='y', labelsize=20)
-    ax[2].tick_params(axis='x', labelsize=20)
-
-    plt.tight_layout()
-
-    st.pyplot(fig)
-
-#### Pertanyaan 3
-if str(start_date)[:10]==str(min_date)[:10] and str(end_date)[:10]==str(max_date)[:10]:
     st.write(
         """
-        Jika dlihat dari pengeluaran dan penghasilan setiap kota, maka dapat diperoleh insight menarik sebagai berikut:
-        1. Kota dengan pengeluaran yang tinggi bukan berarti kota tersebut memiliki penghasilan yang relatif tinggi juga, begitupun sebaliknya. 
-        Artinya, banyak terjadi kasus dimana customer membeli barang ke seller di kota yang berbeda dari customer tersebut.
-        2. Contohnya diperingkat ke 2 pada kota dengan pengeluaran terbesar adalah 
-        Rio De Janeiro yang memiliki pengeluaran sebesar 1.133.999 namun memiliki penghasilan kurang dari setengahnya yaitu 340.725.
-        3. Menimbang hal tersebut (poin 2), di kota Rio De Janeiro masih memiliki peluang untuk seller karena 
-        kota tersebut memiliki daya konsumsi yang kuat namun daya konsumsi tersebut disalurkan pada kota lain. 
-        Dari sini muncul pertanyaan berikutnya yaitu, apa yang harus dijual? Untuk menjawab pertanyaan ini diperlukan
-        analisis performa kategori barang di setiap kota (khususnya Rio De Janeiro) 
-        untuk mengetahui apa saja kategori barang yang banyak dibeli oleh customer
-        namun hanya sedikit dijual oleh seller di kota tersebut.
+        Proyek ini merupakan proyek analisis terhadap data E-Commerce yang didapatkan dari:
+
+        https://drive.google.com/file/d/1MsAjPM7oKtVfJL_wRp1qmCajtSG1mdcK/view
+
+        Data yang disajikan disini telah melalui tahapan-tahapan data cleaning sehingga siap untuk dianalisis.
+        Data Cleaning dan Analisis dilakukan terlebih dahulu pada Google Colab dengan tujuan menjawab 8 pertanyaan utama.
+        Google Colab tersebut dapat diakses pada link sebagai berikut:
+
+        https://colab.research.google.com/drive/1nEoGv81s4V6xQXyWLrH9mi97WQuH8pmz?usp=sharing
+
+        Analisis dimulai dengan mendapatkan performa seller dan customer di suatu kota dan state.
         """
     )
-    # Membuat kanvas
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))  # 1 baris, 2 kolom
-    colors = ["#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#8F4700"]
-
-    # Grafik pertama
-    df_0 = df_customer_merged.groupby(by='customer_city').agg({
-                                                            'payment_value_sum': 'sum'
-                                                            }).sort_values(by = ('payment_value_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('payment_value_sum'), ascending = True)
-    ax1.barh(y=df_0.index,
-            width=df_0['payment_value_sum'],
-            align='center',
-            color=colors
-            )
-    ax1.set_xlabel("Total Pengeluaran (Juta BRL)")
-    ax1.set_title("Top 5 Total Pengeluaran Seluruh Customer di Setiap Kota")
-
-    # Grafik kedua
-    df_0 = df_sellers_merged.groupby(by='seller_city').agg({
-                                                            'price_sum': 'sum'
-                                                            }).sort_values(by = ('price_sum'), ascending = False).head(5)
-    df_0 = df_0.sort_values(by = ('price_sum'), ascending = True)
-    ax2.barh(y=df_0.index,
-            width=df_0['price_sum'],
-            align='center',
-            color=colors
+
+
+    ## Bagian halaman
+    # Setiap bagian adalah fragment, sehingga widget di dalamnya (misalnya selectbox Pertanyaan 4) hanya
+    # menjalankan ulang bagian tersebut. Data diambil dari cache engine di dalam bagian masing-masing.
+    @st.fragment
+    def tampilkan_pertanyaan_1_3(start_date, end_date, perkiraan: bool = False):
+
+        """
+        Fungsi ini menampilkan grafik Pertanyaan 1-3 (total per state, kota dan id) dari kubus agregat
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            perkiraan (bool): True berarti memakai mode top-K perkiraan
+        """
+
+        hasil = engine.run_ringkasan(start_date, end_date, perkiraan=perkiraan)
+
+        col1, col2 = st.columns(2)
+
+        #### Pertanyaan 1
+        with col1:
+            tampilkan_grafik('pertanyaan_1', create_grafik_pertanyaan_1,
+                             hasil['customer_state'].head(5), hasil['customer_city'].head(5), hasil['customer_id'].head(5))
+            tampilkan_batas_error(hasil, ['customer_state', 'customer_city', 'customer_id'], 'BRL')
+
+        #### Pertanyaan 2
+        with col2:
+            tampilkan_grafik('pertanyaan_2', create_grafik_pertanyaan_2,
+                             hasil['seller_state'].head(5), hasil['seller_city'].head(5), hasil['seller_id'].head(5))
+            tampilkan_batas_error(hasil, ['seller_state', 'seller_city', 'seller_id'], 'BRL')
+
+        #### Pertanyaan 3
+        if str(start_date)[:10]==str(min_date)[:10] and str(end_date)[:10]==str(max_date)[:10]:
+            st.write(
+                """
+                Jika dlihat dari pengeluaran dan penghasilan setiap kota, maka dapat diperoleh insight menarik sebagai berikut:
+                1. Kota dengan pengeluaran yang tinggi bukan berarti kota tersebut memiliki penghasilan yang relatif tinggi juga, begitupun sebaliknya. 
+                Artinya, banyak terjadi kasus dimana customer membeli barang ke seller di kota yang berbeda dari customer tersebut.
+                2. Contohnya diperingkat ke 2 pada kota dengan pengeluaran terbesar adalah 
+                Rio De Janeiro yang memiliki pengeluaran sebesar 1.133.999 namun memiliki penghasilan kurang dari setengahnya yaitu 340.725.
+                3. Menimbang hal tersebut (poin 2), di kota Rio De Janeiro masih memiliki peluang untuk seller karena 
+                kota tersebut memiliki daya konsumsi yang kuat namun daya konsumsi tersebut disalurkan pada kota lain. 
+                Dari sini muncul pertanyaan berikutnya yaitu, apa yang harus dijual? Untuk menjawab pertanyaan ini diperlukan
+                analisis performa kategori barang di setiap kota (khususnya Rio De Janeiro) 
+                untuk mengetahui apa saja kategori barang yang banyak dibeli oleh customer
+                namun hanya sedikit dijual oleh seller di kota tersebut.
+                """
             )
-    ax2.set_xlabel("Total Pendapatan (Juta BRL)")
-    ax2.set_title("Top 5 Total Pendapatan Seluruh Seller di Setiap Kota")
-
-    # Tampilkan grafik
-    plt.tight_layout()  # Agar layout lebih rapi
-    st.pyplot(plt)
-
-else:
-    pass
-
-### Pertanyaan 4
-
-st.write(
-    """
-    Analisis berikutnya merupakan analisis perfroma kategori barang di setiap kota.
-    Tabel-tabel berikut disusun berdasarkan kota dengan pengeluaran atau penghasilan terbanyak.
-    
-    """
-)
-
-input_kota = st.selectbox(
-    label="Berapa kota yang ditampilkan?",
-    options=(2, 3, 4, 5, 6, 7, 8),
-    index=2
-)
-
-input_barang = st.selectbox(
-    label="Berapa kategori barang yang ditampilkan?",
-    options=(2, 3, 4, 5, 6, 7, 8, 9, 10),
-    index=8
-)
-
-figsize_y = 100/(8*10)
-
-fig, ax = plt.subplots(nrows=input_kota, ncols=2, figsize=(25,figsize_y*(input_kota*input_barang)))    
-
-colors = ["#8F4700", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3",
-          "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
-
-for i in range (input_kota):
-        
-    penjualan_kategoribarang_di_kota[i][1] = penjualan_kategoribarang_di_kota[i][1].reset_index().sort_values(by = ('count'), ascending = False)
-    penjualan_kategoribarang_di_kota[i][1] = penjualan_kategoribarang_di_kota[i][1].head(input_barang)
-    
-    penjualan_kategoribarang_di_kota[i][1]['product_category_name_<lambda>'] = [i[:12]+'...' for i in penjualan_kategoribarang_di_kota[i][1]['product_category_name_<lambda>']]
-    
-    sns.barplot(y=penjualan_kategoribarang_di_kota[i][1]['product_category_name_<lambda>'],
-                x=penjualan_kategoribarang_di_kota[i][1]['count'],
-                data=penjualan_kategoribarang_di_kota[i][1],
-                palette=colors,
-                ax=ax[i][0]
-                )
-                                      
-    ax[i][0].set_xlabel("Total Penjualan Barang (Satuan)", fontsize=24)
-    ax[i][0].set_ylabel("Kategori Barang", fontsize=24)
-    ax[i][0].set_title("Top 10 Penjualan Kategori Barang di"+ " " + penjualan_kategoribarang_di_kota[i][0], fontsize=28)
-    ax[i][0].tick_params(axis='y', labelsize=20)
-    ax[i][0].tick_params(axis='x', labelsize=20)
-        
-    pembelian_kategoribarang_di_kota[i][1] = pembelian_kategoribarang_di_kota[i][1].reset_index().sort_values(by = ('count'), ascending = False)
-    pembelian_kategoribarang_di_kota[i][1] = pembelian_kategoribarang_di_kota[i][1].head(input_barang)
-    
-    pembelian_kategoribarang_di_kota[i][1]['product_category_name_<lambda>'] = [i[:12]+'...' for i in pembelian_kategoribarang_di_kota[i][1]['product_category_name_<lambda>']]
-        
-    sns.barplot(y=pembelian_kategoribarang_di_kota[i][1]['product_category_name_<lambda>'],
-                x=pembelian_kategoribarang_di_kota[i][1]['count'],
-                data=pembelian_kategoribarang_di_kota[i][1],
-                palette=colors,
-                ax=ax[i][1]
-                )
-                                      
-    ax[i][1].set_xlabel("Total Pembelian Barang (Satuan)", fontsize=24)
-    ax[i][1].set_ylabel("Kategori Barang", fontsize=24)
-    ax[i][1].set_title("Top 10 Pembelian Kategori Barang di"+ " " + pembelian_kategoribarang_di_kota[i][0], fontsize=28)
-    ax[i][1].tick_params(axis='y', labelsize=20)
-    ax[i][1].tick_params(axis='x', labelsize=20)
-
-plt.tight_layout()                                                                                                                                 
-st.pyplot(fig)
-
-## Klaster Customer
-
-st.write(
-    """
-    Berikutnya pembuatan klaster secara manual untuk customer berdasarkan  pengeluaran yang dilakukan.
-    Klasterisasi ini dibuat sedemikian sehingga semakin tinggi tingkatan klaster maka semakin sedikit anggotanya.
-    Berikut besaran dari masing-masing klaster:
-
-    * Penghasilan Seller Klaster I < 300 BRL (Brazilian Real)
-
-    * 300 BRL <= Penghasilan Seller Klaster II < 1000 BRL 
-
-    * 1000 BRL <= Penghasilan Seller Klaster III < 2500 BRL 
-
-    * 2500 BRL <= Penghasilan Seller Klaster IV < 5000 BRL 
-
-    * 5000 BRL <= Penghasilan Seller Klaster V < 10000 BRL 
-
-    * 10000 BRL <= Penghasilan Seller Klaster VI < 50000 BRL 
-
-    * 50000 BRL <= Penghasilan Seller Klaster VII.
-    """
-)
-
-fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(12,20))
-
-colors = ('#C46100', '#EF9234', '#F4B678', '#F9E0A2', '#F4B678', '#EF9234')
-explode = (0.02, 0.03, 0.05, 0.07, 0.09, 0.11)
-
-klaster = kumpulan_klaster[:5]
-klaster.append("Klaster VI dan VII")
-count = (df_customer_klaster['customer_id_count'][0],
-         df_customer_klaster['customer_id_count'][1],
-         df_customer_klaster['customer_id_count'][2],
-         df_customer_klaster['customer_id_count'][3],
-         df_customer_klaster['customer_id_count'][4],
-         df_customer_klaster['customer_id_count'][5]+df_customer_klaster['customer_id_count'][6]
-         )
-
-ax.pie(
-    x=count,
-    labels=klaster,
-    autopct='%1.1f%%',
-    colors=colors,
-    explode=explode,
-    wedgeprops = {'width': 0.5}
-    )
-ax.set_title('Klaster Customer', fontsize=26)
+            tampilkan_grafik('pertanyaan_3', create_grafik_pertanyaan_3,
+                             hasil['customer_city'].head(5), hasil['seller_city'].head(5))
 
-st.pyplot(fig)
+    @st.fragment
+    def tampilkan_indeks_gap(start_date, end_date):
 
-## Klaster Seller
+        """
+        Fungsi ini menampilkan indeks gap permintaan (pengeluaran customer dikurangi pendapatan seller) per kategori
+        barang untuk kota yang dipilih, dari seluruh kota pada rentang waktu
 
-st.write(
-    """
-    Sedangkan pembuatan klaster  untuk seller dibuat berdasarkan  penghasilan yang dilakukan.
-    Klasterisasi ini dibuat sedemikian sehingga semakin tinggi tingkatan klaster maka semakin sedikit anggotanya.
-    Berikut besaran dari masing-masing klaster:
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+        """
 
-    * Pengeluaran Customer Klaster I < 70 BRL (Brazilian Real)
+        st.subheader('Indeks gap permintaan per kota')
+        st.write(
+            """
+            Kategori dengan gap terbesar adalah kategori yang banyak dibeli customer di kota tersebut namun sedikit
+            dijual oleh seller di kota yang sama. Kota diurutkan berdasarkan total gap positif.
+            """
+        )
 
-    * 70 BRL <= Pengeluaran Customer Klaster II < 130 BRL 
+        gap_per_kota = engine.run_gap(start_date, end_date)['gap_per_kota']
+        if gap_per_kota.empty:
+            st.caption('Tidak ada data pada rentang waktu ini.')
+            return
 
-    * 130 BRL <= Pengeluaran Customer Klaster III < 210 BRL 
+        input_kota = st.selectbox(label='Kota', options=gap_per_kota.index.tolist(), format_func=str.title)
+        input_kategori = st.slider(label='Jumlah kategori', min_value=5, max_value=30, value=10)
 
-    * 210 BRL <= Pengeluaran Customer Klaster IV < 350 BRL 
+        gap_kategori = engine.run_gap(start_date, end_date, input_kota, input_kategori)['gap_kategori']
+        st.dataframe(gap_kategori.rename(columns={'pengeluaran_customer': 'Pengeluaran customer (BRL)',
+                                                  'pendapatan_seller': 'Pendapatan seller (BRL)',
+                                                  'gap': 'Gap (BRL)'}).rename_axis('Kategori barang'),
+                     column_config={kolom: st.column_config.NumberColumn(format='%.0f')
+                                    for kolom in ['Pengeluaran customer (BRL)', 'Pendapatan seller (BRL)', 'Gap (BRL)']})
 
-    * 350 BRL <= Pengeluaran Customer Klaster V < 1000 BRL 
+    @st.fragment
+    def tampilkan_pertanyaan_4(start_date, end_date, perkiraan: bool = False):
 
-    * 1000 BRL <= Pengeluaran Customer Klaster VI < 4000 BRL 
+        """
+        Fungsi ini menampilkan grid kategori barang per kota (Pertanyaan 4) beserta pilihan jumlah kota dan kategori
 
-    * 4000 BRL <= Pengeluaran Customer Klaster VII.
-    """
-)
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+            perkiraan (bool): True berarti memakai mode top-K perkiraan
+        """
 
-fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(12,20))
+        st.write(
+            """
+            Analisis berikutnya merupakan analisis perfroma kategori barang di setiap kota.
+            Tabel-tabel berikut disusun berdasarkan kota dengan pengeluaran atau penghasilan terbanyak.
 
-klaster = kumpulan_klaster
-count = (df_sellers_klaster['seller_id_count'][0],
-         df_sellers_klaster['seller_id_count'][1],
-         df_sellers_klaster['seller_id_count'][2],
-         df_sellers_klaster['seller_id_count'][3],
-         df_sellers_klaster['seller_id_count'][4],
-         df_sellers_klaster['seller_id_count'][5],
-         df_sellers_klaster['seller_id_count'][6]
-         )
-colors = ('#8F4700', '#C46100', '#EF9234', '#F4B678', '#F9E0A2', '#F4B678', '#C46100')
-explode = (0.02, 0.03, 0.05, 0.07, 0.09, 0.11, 0.13)
-ax.pie(
-    x=count,
-    labels=klaster,
-    autopct='%1.1f%%',
-    colors=colors,
-    explode=explode,
-    wedgeprops = {'width': 0.5}
-    )
-ax.set_title("Klaster Seller", fontsize=26)
+            """
+        )
+
+        input_kota = st.selectbox(
+            label="Berapa kota yang ditampilkan?",
+            options=(2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 20),
+            index=2
+        )
+
+        input_barang = st.selectbox(
+            label="Berapa kategori barang yang ditampilkan?",
+            options=(2, 3, 4, 5, 6, 7, 8, 9, 10),
+            index=8
+        )
+
+        # Hingga 8 kota memakai hasil default (termasuk snapshot), lebih dari itu dihitung dengan top_cities yang diminta
+        hasil = engine.run_ringkasan(start_date, end_date, top_cities=max(input_kota, 8), perkiraan=perkiraan)
+
+        tampilkan_grafik('pertanyaan_4', create_grafik_pertanyaan_4,
+                         hasil['kategori_kota_jual'], hasil['kategori_kota_beli'], input_kota, input_barang)
+        tampilkan_batas_error(hasil, ['kategori_di_kota_jual', 'kategori_di_kota_beli'], 'barang')
+
+    @st.fragment
+    def tampilkan_klaster_customer(start_date, end_date):
+
+        """
+        Fungsi ini menampilkan klaster customer, dihitung dari pipeline penuh hanya ketika tab-nya dibuka
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+        """
+
+        st.write(
+            """
+            Berikutnya pembuatan klaster secara manual untuk customer berdasarkan  pengeluaran yang dilakukan.
+            Klasterisasi ini dibuat sedemikian sehingga semakin tinggi tingkatan klaster maka semakin sedikit anggotanya.
+            Berikut besaran dari masing-masing klaster:
+
+            * Penghasilan Seller Klaster I < 300 BRL (Brazilian Real)
+
+            * 300 BRL <= Penghasilan Seller Klaster II < 1000 BRL 
+
+            * 1000 BRL <= Penghasilan Seller Klaster III < 2500 BRL 
+
+            * 2500 BRL <= Penghasilan Seller Klaster IV < 5000 BRL 
+
+            * 5000 BRL <= Penghasilan Seller Klaster V < 10000 BRL 
+
+            * 10000 BRL <= Penghasilan Seller Klaster VI < 50000 BRL 
+
+            * 50000 BRL <= Penghasilan Seller Klaster VII.
+            """
+        )
+
+        df_customer_klaster = engine.run_klaster(start_date, end_date)['klaster_customer']
+
+        tampilkan_grafik('klaster_customer', create_grafik_klaster_customer, df_customer_klaster['customer_id_count'])
+
+    @st.fragment
+    def tampilkan_klaster_seller(start_date, end_date):
+
+        """
+        Fungsi ini menampilkan klaster seller, dihitung dari pipeline penuh hanya ketika tab-nya dibuka
+
+        Parameters:
+            start_date (datetime.date): Tanggal awal rentang waktu
+            end_date (datetime.date): Tanggal akhir rentang waktu
+        """
 
-st.pyplot(fig)
\ No newline at end of file
+        st.write(
+            """
+            Sedangkan pembuatan klaster  untuk seller dibuat berdasarkan  penghasilan yang dilakukan.
+            Klasterisasi ini dibuat sedemikian sehingga semakin tinggi tingkatan klaster maka semakin sedikit anggotanya.
+            Berikut besaran dari masing-masing klaster:
+
+            * Pengeluaran Customer Klaster I < 70 BRL (Brazilian Real)
+
+            * 70 BRL <= Pengeluaran Customer Klaster II < 130 BRL 
+
+            * 130 BRL <= Pengeluaran Customer Klaster III < 210 BRL 
+
+            * 210 BRL <= Pengeluaran Customer Klaster IV < 350 BRL 
+
+            * 350 BRL <= Pengeluaran Customer Klaster V < 1000 BRL 
+
+            * 1000 BRL <= Pengeluaran Customer Klaster VI < 4000 BRL 
+
+            * 4000 BRL <= Pengeluaran Customer Klaster VII.
+            """
+        )
+
+        df_sellers_klaster = engine.run_klaster(start_date, end_date)['klaster_seller']
+
+        tampilkan_grafik('klaster_seller', create_grafik_klaster_seller, df_sellers_klaster['seller_id_count'])
+
+    # Rentang waktu baru dihitung di latar belakang, grafik rentang sebelumnya tetap tampil sampai selesai
+    start_date_tampil, end_date_tampil, tugas_latar = get_rentang_tampil(
+                                            start_date, end_date, topk_perkiraan,
+                                            st.session_state.get('tab_bagian', 'Pertanyaan 1-3'))
+    if tugas_latar is not None:
+        tunggu_hitung_latar(tugas_latar, (start_date_tampil, end_date_tampil), (start_date, end_date))
+
+    # Dengan on_change="rerun" hanya isi tab yang sedang dibuka yang dihitung dan digambar
+    tab_pertanyaan_1_3, tab_pertanyaan_4, tab_klaster_customer, tab_klaster_seller = st.tabs(
+        ['Pertanyaan 1-3', 'Pertanyaan 4', 'Klaster Customer', 'Klaster Seller'], key='tab_bagian', on_change='rerun')
+
+    with tab_pertanyaan_1_3:
+        if tab_pertanyaan_1_3.open:
+            tampilkan_pertanyaan_1_3(start_date_tampil, end_date_tampil, topk_perkiraan)
+            tampilkan_indeks_gap(start_date_tampil, end_date_tampil)
+
+    with tab_pertanyaan_4:
+        if tab_pertanyaan_4.open:
+            tampilkan_pertanyaan_4(start_date_tampil, end_date_tampil, topk_perkiraan)
+
+    with tab_klaster_customer:
+        if tab_klaster_customer.open:
+            tampilkan_klaster_customer(start_date_tampil, end_date_tampil)
+
+    with tab_klaster_seller:
+        if tab_klaster_seller.open:
+            tampilkan_klaster_seller(start_date_tampil, end_date_tampil)
+
+    with st.sidebar:
+        statistik_cache = engine.cache.stats()
+        st.caption('Cache pipeline: {hits} hit, {misses} miss, {entries}/{maxsize} entri'.format(**statistik_cache))
+        statistik_grafik = cache_grafik.stats()
+        st.caption('Cache grafik: {hits} hit, {misses} miss, {entries} gambar, {mb:.1f}/{maks_mb:.0f} MB'.format(
+                   mb=statistik_grafik['nbytes'] / 2**20, maks_mb=statistik_grafik['maxbytes'] / 2**20, **statistik_grafik))
+        # Data bersama dimuat sekali per proses, setiap sesi hanya menyimpan nilai widget-nya sendiri
+        ukuran_memori = engine.get_ukuran_memori()
+        st.caption('Memori bersama: tabel {tabel:.0f} MB, kubus {kubus:.0f} MB, snapshot {snapshot:.0f} MB, '
+                   'cache {cache:.0f} MB, agregat {agregat:.0f} MB'.format(
+                   **{nama: ukuran / 2**20 for nama, ukuran in ukuran_memori.items()}))
+        st.caption('Hitung latar: {dikirim} dikirim, {berhasil} selesai, {dibatalkan} dibatalkan, '
+                   '{berjalan} berjalan'.format(**penghitung_latar.stats()))
+        st.caption('Registri agregat: {dihitung} dihitung, {dihemat} dihemat dari {diminta} permintaan'.format(
+                   **engine.agregat.stats()))
+        # Rentang waktu default dilayani dari snapshot `python -m analisis.materialisasi` jika tersedia
+        if engine.snapshot is not None:
+            st.caption('Snapshot {kode_versi} ({waktu}) untuk rentang waktu default'.format(**engine.snapshot['manifest']))
+        st.caption(f'Memori sesi ini: {get_ukuran_objek(st.session_state.to_dict()) / 2**10:.1f} KB')
+        st.toggle('Profil per tahap', key='profil_aktif')
+
+
+## Panel profil
+if sesi_profil is not None:
+    catatan_profil = sesi_profil['tahap']
+    with st.sidebar.expander('Profil per tahap', expanded=True):
+        st.dataframe([{'tahap': '  ' * catatan.get('level', 0) + catatan['nama'],
+                       'detik': round(catatan.get('detik', 0), 3),
+                       'puncak memori (MB)': round(catatan.get('puncak_memori_mb', 0), 1),
+                       'baris': catatan.get('baris')}
+                      for catatan in catatan_profil],
+                     hide_index=True)
+        st.caption(f'Tahap tanpa catatan dilayani dari cache. Log: {profil.PATH_LOG}')
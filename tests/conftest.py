@@ -0,0 +1,41 @@
+"""
+Fixture bersama untuk pengujian kesetaraan hasil pada file CSV di folder data
+"""
+
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from analisis.engine import AnalisisEngine
+from analisis.loader import DATA_FILES
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Rentang waktu yang diuji: seluruh data, beberapa bulan, dan rentang pendek yang memotong bulan
+RENTANG = [(None, None),
+           (datetime.date(2017, 3, 1), datetime.date(2017, 9, 30)),
+           (datetime.date(2018, 1, 15), datetime.date(2018, 2, 10))]
+
+@pytest.fixture(scope='session')
+def data_dir() -> str:
+    if not all(os.path.exists(os.path.join(DATA_DIR, nama_file)) for nama_file, _ in DATA_FILES.values()):
+        pytest.skip('File CSV di folder data tidak tersedia')
+    return DATA_DIR
+
+@pytest.fixture(scope='session')
+def engine(data_dir) -> AnalisisEngine:
+    return AnalisisEngine(data_dir, snapshot=False).load()
+
+def samakan_total(total: pd.Series) -> pd.Series:
+
+    """
+    Fungsi ini menyamakan bentuk Series total (index string, tanpa nilai 0, urut index) agar hasil dari sumber
+    yang berbeda (kubus, pipeline, sketsa) dapat dibandingkan
+    """
+
+    total = total[total.abs() > 1e-6].astype(float)
+    total.index = total.index.to_flat_index().map(str)
+
+    return total.sort_index()
@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PATH_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize('perintah', ['import analisis.engine', 'from analisis import run'])
+def test_import_engine_tanpa_pandas(perintah):
+    # Dijalankan di proses baru karena proses pytest sudah memuat pandas
+    kode = f"import sys; {perintah}; print(sorted({{'pandas', 'numpy'}} & set(sys.modules)))"
+    hasil = subprocess.run([sys.executable, '-c', kode], cwd=PATH_REPO, capture_output=True, text=True, check=True)
+
+    assert hasil.stdout.strip() == '[]'
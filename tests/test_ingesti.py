@@ -0,0 +1,192 @@
+import datetime
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis.engine import AnalisisEngine
+from analisis.ingesti import TABEL_DELTA
+from analisis.loader import DATA_FILES, read_csv_skema
+from analisis.sketsa import create_sketsa_kubus
+from conftest import RENTANG
+
+def samakan_frame(df) -> pd.DataFrame:
+
+    """
+    Fungsi ini menyamakan bentuk Data Frame (index sebagai kolom, category sebagai string, urut seluruh kolom)
+    agar hasil yang urutan barisnya boleh berbeda untuk nilai yang sama dapat dibandingkan
+    """
+
+    df = df.to_frame() if isinstance(df, pd.Series) else df
+    df = df.reset_index() if not isinstance(df.index, pd.RangeIndex) else df.copy()
+    for kolom in df.columns:
+        if isinstance(df[kolom].dtype, pd.CategoricalDtype) or df[kolom].dtype == object:
+            df[kolom] = df[kolom].astype(str)
+    df.columns = [str(kolom) for kolom in df.columns]
+
+    return df.sort_values(list(df.columns), kind='stable').reset_index(drop=True)
+
+def create_engine_dasar(data_dasar: tuple, data_dir: str, kelas: type = AnalisisEngine) -> AnalisisEngine:
+
+    """
+    Fungsi ini membuat engine dari salinan file CSV data_dasar (tanpa delta) di data_dir
+    """
+
+    os.makedirs(data_dir, exist_ok=True)
+    for nama_file, _ in DATA_FILES.values():
+        shutil.copy(os.path.join(data_dasar[0], nama_file), data_dir)
+
+    return kelas(str(data_dir), snapshot=False).load()
+
+@pytest.fixture(scope='module')
+def data_dasar(data_dir, tmp_path_factory) -> tuple:
+
+    """
+    Folder data tanpa 10% order terakhir dan 20 order acak, beserta Data Frame order tersebut sebagai delta
+    """
+
+    dir_dasar = tmp_path_factory.mktemp('data_dasar')
+    dir_csv_delta = tmp_path_factory.mktemp('csv_delta')
+
+    tabel = {nama: pd.read_csv(os.path.join(data_dir, nama_file), dtype=str)
+             for nama, (nama_file, _) in DATA_FILES.items()}
+    df_order = tabel['df_order'].sort_values('order_purchase_timestamp')
+    order_delta = set(df_order['order_id'].iloc[-len(df_order) // 10:]) | set(df_order['order_id'].sample(20,
+                                                                                                      random_state=1))
+
+    delta = {}
+    for nama in TABEL_DELTA:
+        baris_delta = tabel[nama]['order_id'].isin(order_delta)
+        delta[nama], tabel[nama] = tabel[nama][baris_delta], tabel[nama][~baris_delta]
+    customer_delta = tabel['df_customer']['customer_id'].isin(delta['df_order']['customer_id'])
+    delta['df_customer'] = tabel['df_customer'][customer_delta]
+    tabel['df_customer'] = tabel['df_customer'][~customer_delta]
+
+    for nama, df in tabel.items():
+        df.to_csv(os.path.join(dir_dasar, DATA_FILES[nama][0]), index=False)
+    for nama, df in delta.items():
+        df.to_csv(os.path.join(dir_csv_delta, DATA_FILES[nama][0]), index=False)
+    delta = {nama: read_csv_skema(os.path.join(dir_csv_delta, DATA_FILES[nama][0]), DATA_FILES[nama][1])
+             for nama in delta}
+
+    return str(dir_dasar), delta
+
+@pytest.fixture(scope='module')
+def engine_delta(data_dasar, tmp_path_factory):
+
+    """
+    Engine yang memuat data_dasar lalu menerima order delta setelah hasil pipeline, ringkasan perkiraan dan
+    registri agregat terisi
+    """
+
+    engine = create_engine_dasar(data_dasar, tmp_path_factory.mktemp('data_engine_delta'))
+    for start_date, end_date in RENTANG:
+        engine.run(start_date, end_date)
+        engine.run_ringkasan(start_date, end_date, perkiraan=True)
+
+    return engine.append_data(data_dasar[1])
+
+def test_append_data_memperbarui_cache(engine_delta):
+    # Hasil pipeline setiap rentang dipindahkan ke versi data baru, bukan dibuang
+    versi_pipeline = [key[-1] for key, _ in engine_delta.cache.items() if key[0] == 'pipeline']
+    assert len(versi_pipeline) == len(RENTANG)
+    assert all(versi == engine_delta.versi_data for versi in versi_pipeline)
+
+    # Total berurut dari kubus ikut dipindahkan, sehingga tidak ada total yang dihitung ulang
+    dihitung = engine_delta.agregat.stats()['dihitung']
+    engine_delta.run_ringkasan(*RENTANG[1])
+    assert engine_delta.agregat.stats()['dihitung'] == dihitung
+
+@pytest.mark.parametrize('start_date, end_date', RENTANG)
+def test_append_data_sama_dengan_load_baru(engine_delta, engine, start_date, end_date):
+    hasil_delta = engine_delta.get_hasil_pipeline(*engine_delta.get_rentang(start_date, end_date))
+    hasil_baru = engine.get_hasil_pipeline(*engine.get_rentang(start_date, end_date))
+
+    for nama in hasil_baru:
+        pd.testing.assert_frame_equal(samakan_frame(hasil_delta[nama]), samakan_frame(hasil_baru[nama]),
+                                      check_dtype=False, check_categorical=False, rtol=1e-9)
+
+    # Baris delta disisipkan tanpa merusak urutan menurun
+    for nama, kolom in [('pivot_seller', 'price_sum'), ('df_sellers_merged', 'price_sum'),
+                        ('pivot_order', 'payment_value_sum'), ('df_customer_merged', 'payment_value_sum')]:
+        nilai = hasil_delta[nama][kolom].to_numpy()
+        assert (np.diff(nilai[~np.isnan(nilai)]) <= 0).all(), nama
+
+    for perkiraan in [False, True]:
+        ringkasan_delta = engine_delta.run_ringkasan(start_date, end_date, perkiraan=perkiraan)
+        ringkasan_baru = engine.run_ringkasan(start_date, end_date, perkiraan=perkiraan)
+        for nama in ringkasan_baru:
+            if nama != 'batas_error':
+                pd.testing.assert_frame_equal(samakan_frame(ringkasan_delta[nama]),
+                                              samakan_frame(ringkasan_baru[nama]),
+                                              check_dtype=False, check_categorical=False, rtol=1e-9)
+
+def test_append_data_memperbarui_sketsa_dan_ukuran(engine_delta, engine):
+    sketsa_delta, sketsa_baru = engine_delta.sketsa_kubus, create_sketsa_kubus(engine_delta.kubus)
+
+    for nama, info in sketsa_baru['bulan'].items():
+        for kunci, nilai in info.items():
+            np.testing.assert_array_equal(sketsa_delta['bulan'][nama][kunci], nilai)
+    for dimensi, daftar_sketsa in sketsa_baru['sketsa'].items():
+        assert len(sketsa_delta['sketsa'][dimensi]) == len(daftar_sketsa)
+        for sketsa_a, sketsa_b in zip(sketsa_delta['sketsa'][dimensi], daftar_sketsa):
+            urutan_a, urutan_b = np.argsort(sketsa_a.kunci), np.argsort(sketsa_b.kunci)
+            np.testing.assert_array_equal(sketsa_a.kunci[urutan_a], sketsa_b.kunci[urutan_b])
+            np.testing.assert_allclose(sketsa_a.nilai[urutan_a], sketsa_b.nilai[urutan_b])
+            assert sketsa_a.error == sketsa_b.error
+
+    for nama in ['tabel', 'kubus']:
+        assert engine_delta.ukuran_data[nama] == pytest.approx(engine.ukuran_data[nama], rel=0.01)
+    for nama in engine.tabel:
+        assert len(engine_delta.tabel[nama]) == len(engine.tabel[nama])
+
+def baca_lalu_tambah_delta(nama: str, delta_dulu: bool) -> property:
+
+    """
+    Fungsi ini membuat atribut yang menerapkan delta tertunda ketika dibaca di luar lock engine, seperti delta dari
+    thread lain di antara dua pembacaan. delta_dulu menentukan apakah nilai dibaca setelah atau sebelum delta.
+    """
+
+    def get(self):
+        if self.delta_tertunda is None or self._lock.locked():
+            return self.__dict__[nama]
+        nilai = self.__dict__[nama]
+        self.append_data(self.delta_tertunda)
+        self.delta_tertunda = None
+        return self.__dict__[nama] if delta_dulu else nilai
+
+    def set(self, nilai):
+        self.__dict__[nama] = nilai
+
+    return property(get, set)
+
+class EngineDeltaTertunda(AnalisisEngine):
+    delta_tertunda = None
+    tabel = baca_lalu_tambah_delta('tabel', False)
+    kubus = baca_lalu_tambah_delta('kubus', False)
+    versi_data = baca_lalu_tambah_delta('versi_data', True)
+
+@pytest.mark.parametrize('nama_fungsi', ['get_hasil_pipeline', 'get_ringkasan_kubus', 'get_ringkasan_sketsa',
+                                         'get_indeks_gap'])
+def test_delta_saat_menghitung_tidak_tersimpan_di_versi_baru(data_dasar, tmp_path, nama_fungsi):
+    engine_acuan = create_engine_dasar(data_dasar, tmp_path / 'acuan').append_data(data_dasar[1])
+    rentang = (datetime.date(2016, 1, 1), datetime.date(2019, 1, 1))
+
+    engine_race = create_engine_dasar(data_dasar, tmp_path / 'race', EngineDeltaTertunda)
+    engine_race.delta_tertunda = data_dasar[1]
+    getattr(engine_race, nama_fungsi)(*rentang)
+    if engine_race.delta_tertunda is not None:
+        engine_race.append_data(engine_race.delta_tertunda)
+        engine_race.delta_tertunda = None
+
+    # Hasil dari data lama tidak boleh tersimpan dengan versi data baru
+    hasil_race = getattr(engine_race, nama_fungsi)(*rentang)
+    hasil_acuan = getattr(engine_acuan, nama_fungsi)(*rentang)
+    if not isinstance(hasil_acuan, dict):
+        hasil_race, hasil_acuan = {nama_fungsi: hasil_race}, {nama_fungsi: hasil_acuan}
+    for nama in hasil_acuan:
+        if nama != 'batas_error':
+            pd.testing.assert_frame_equal(samakan_frame(hasil_race[nama]), samakan_frame(hasil_acuan[nama]),
+                                          check_dtype=False, check_categorical=False, rtol=1e-9)
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from analisis.agregat import DAFTAR_AGREGAT, get_total_frame
+from analisis.kubus import query_ringkasan_kubus
+from conftest import RENTANG, samakan_total
+
+@pytest.mark.parametrize('start_date, end_date', RENTANG)
+def test_ringkasan_kubus_sama_dengan_pipeline(engine, start_date, end_date):
+    start_date, end_date = engine.get_rentang(start_date, end_date)
+    hasil = engine.get_hasil_pipeline(start_date, end_date)
+    ringkasan = query_ringkasan_kubus(engine.kubus, start_date, end_date)
+
+    for kolom, kolom_ukuran in DAFTAR_AGREGAT.items():
+        frame = 'df_customer_merged' if kolom_ukuran == 'payment_value_sum' else 'df_sellers_merged'
+        pd.testing.assert_series_equal(samakan_total(ringkasan[kolom]),
+                                       samakan_total(get_total_frame(hasil[frame], kolom, kolom_ukuran)),
+                                       check_names=False, rtol=1e-9)
+
+    for nama in ['kategori_di_kota_jual', 'kategori_di_kota_beli']:
+        pd.testing.assert_series_equal(samakan_total(ringkasan[nama]), samakan_total(hasil[nama]),
+                                       check_names=False, rtol=1e-9)
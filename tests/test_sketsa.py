@@ -0,0 +1,37 @@
+import pytest
+
+from analisis.kubus import query_ringkasan_kubus
+from analisis.sketsa import DIMENSI_SKETSA, K_SKETSA, create_sketsa_kubus, query_ringkasan_sketsa
+from conftest import RENTANG, samakan_total
+
+@pytest.fixture(scope='module', params=[64, K_SKETSA])
+def sketsa_kubus(request, engine) -> dict:
+    return create_sketsa_kubus(engine.kubus, k=request.param)
+
+@pytest.mark.parametrize('start_date, end_date', RENTANG)
+def test_error_sketsa_dalam_batas(engine, sketsa_kubus, start_date, end_date):
+    start_date, end_date = engine.get_rentang(start_date, end_date)
+    tepat = query_ringkasan_kubus(engine.kubus, start_date, end_date)
+    perkiraan = query_ringkasan_sketsa(engine.kubus, sketsa_kubus, start_date, end_date)
+
+    for dimensi in DIMENSI_SKETSA:
+        total_tepat = samakan_total(tepat[dimensi])
+        total_perkiraan = samakan_total(perkiraan[dimensi])
+        batas = perkiraan['batas_error'][dimensi] + 1e-6
+
+        # Key di sketsa: selisih dengan nilai tepat tidak lebih dari batas error
+        selisih = (total_perkiraan - total_tepat.reindex(total_perkiraan.index, fill_value=0.0)).abs()
+        assert (selisih <= batas).all(), dimensi
+
+        # Key yang tidak ada di sketsa: nilai tepat tidak lebih dari batas error
+        hilang = total_tepat[~total_tepat.index.isin(total_perkiraan.index)]
+        assert (hilang.abs() <= batas).all(), dimensi
+
+def test_sketsa_kecil_memotong_key(engine):
+    sketsa_kubus = create_sketsa_kubus(engine.kubus, k=64)
+    start_date, end_date = engine.get_rentang(None, None)
+    perkiraan = query_ringkasan_sketsa(engine.kubus, sketsa_kubus, start_date, end_date)
+
+    # Dengan k kecil sebagian dimensi harus terpotong, sehingga pengujian batas error di atas tidak trivial
+    assert any(batas > 0 for batas in perkiraan['batas_error'].values())
+    assert all(len(perkiraan[dimensi]) <= 64 for dimensi in DIMENSI_SKETSA)
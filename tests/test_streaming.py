@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from analisis.streaming import create_pivot_seller_and_order_streaming
+from conftest import RENTANG
+
+def samakan_index(df: pd.DataFrame) -> pd.DataFrame:
+    return df.set_axis(df.index.astype(str).rename(df.index.name))
+
+@pytest.mark.parametrize('ukuran_chunk', [997, 1_000_000])
+@pytest.mark.parametrize('start_date, end_date', RENTANG)
+def test_streaming_sama_dengan_pipeline(engine, data_dir, start_date, end_date, ukuran_chunk):
+    start_date, end_date = engine.get_rentang(start_date, end_date)
+    hasil = engine.get_hasil_pipeline(start_date, end_date)
+    pivot_seller, pivot_order = create_pivot_seller_and_order_streaming(data_dir, start_date, end_date, ukuran_chunk)
+
+    for pivot_pipeline, pivot_streaming in [(hasil['pivot_seller'], pivot_seller),
+                                            (hasil['pivot_order'], pivot_order)]:
+        pivot_pipeline, pivot_streaming = samakan_index(pivot_pipeline), samakan_index(pivot_streaming)
+        assert list(pivot_streaming.columns) == list(pivot_pipeline.columns)
+        pd.testing.assert_frame_equal(pivot_streaming.sort_index(), pivot_pipeline.sort_index(), check_dtype=False,
+                                      rtol=1e-9)
+
+        # Satu potongan menghasilkan sum yang identik sehingga urutan baris juga identik
+        if ukuran_chunk == 1_000_000:
+            assert list(pivot_streaming.index) == list(pivot_pipeline.index)